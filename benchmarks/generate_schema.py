@@ -0,0 +1,164 @@
+import argparse
+import os
+import random
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+METRIC_TYPES = ("sum", "count", "count_distinct", "average", "min", "max")
+DIMENSION_TYPES = ("string", "number", "date", "timestamp", "boolean")
+GROUP_LABELS = ("Finance", "Customers", "Marketing", "Operations", "Dates")
+
+
+def generate_file(
+    rng: random.Random,
+    file_index: int,
+    models: int,
+    columns: int,
+    metrics: int,
+    additional_dimensions: int,
+    error_rate: float,
+) -> str:
+    """
+    Generate the YAML text of one dbt schema file.
+
+    Args:
+        rng (random.Random): Source of randomness, seeded by the caller.
+        file_index (int): Index of the file, used to keep names unique.
+        models (int): Number of models in the file.
+        columns (int): Number of columns per model.
+        metrics (int): Number of metrics per column.
+        additional_dimensions (int): Number of additional dimensions per column.
+        error_rate (float): Fraction of nodes missing their group_label.
+
+    Returns:
+        str: The schema file.
+    """
+
+    def group_label(indent: str) -> str:
+        if rng.random() < error_rate:
+            return ""
+        return f'{indent}group_label: "{rng.choice(GROUP_LABELS)}"\n'
+
+    lines = ["version: 2\n", "\n", "models:\n"]
+    for m in range(models):
+        model_name = f"model_{file_index}_{m}"
+        lines.append(f"  - name: {model_name}\n")
+        lines.append(f'    description: "Generated model {model_name}."\n')
+        lines.append("    meta:\n")
+        lines.append(group_label("      "))
+        lines.append("      metrics:\n")
+        lines.append(f"        {model_name}_row_count:\n")
+        lines.append("          type: count\n")
+        lines.append(group_label("          "))
+        lines.append("    columns:\n")
+        for c in range(columns):
+            column_name = f"{model_name}_col_{c}"
+            lines.append(f"      - name: {column_name}\n")
+            lines.append(f'        description: "Column {c} of {model_name}."\n')
+            lines.append("        tests:\n")
+            lines.append("          - not_null\n")
+            lines.append("        meta:\n")
+            lines.append("          dimension:\n")
+            lines.append(f"            type: {rng.choice(DIMENSION_TYPES)}\n")
+            if rng.random() < 0.2:
+                lines.append("            hidden: true\n")
+            else:
+                lines.append(group_label("            "))
+            if additional_dimensions:
+                lines.append("          additional_dimensions:\n")
+                for a in range(additional_dimensions):
+                    lines.append(f"            {column_name}_ad_{a}:\n")
+                    lines.append("              type: string\n")
+                    lines.append(f'              sql: "${{{column_name}}}"\n')
+                    lines.append(group_label("              "))
+            if metrics:
+                lines.append("          metrics:\n")
+                for k in range(metrics):
+                    metric_type = rng.choice(METRIC_TYPES)
+                    lines.append(f"            {column_name}_{metric_type}_{k}:\n")
+                    lines.append(f"              type: {metric_type}\n")
+                    lines.append(group_label("              "))
+        lines.append("\n")
+    return "".join(lines)
+
+
+def generate_project(
+    directory: str,
+    files: int = 10,
+    models: int = 5,
+    columns: int = 20,
+    metrics: int = 2,
+    additional_dimensions: int = 1,
+    error_rate: float = 0.05,
+    seed: int = 0,
+) -> List[str]:
+    """
+    Write a synthetic dbt project's schema files. The same arguments always
+    produce the same files.
+
+    Args:
+        directory (str): Where to write the project.
+        files (int): Number of schema files.
+        models (int): Number of models per file.
+        columns (int): Number of columns per model.
+        metrics (int): Number of metrics per column.
+        additional_dimensions (int): Number of additional dimensions per column.
+        error_rate (float): Fraction of nodes missing their group_label.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        List[str]: The paths of the generated files.
+    """
+    rng = random.Random(seed)
+    models_dir = os.path.join(directory, "models")
+    os.makedirs(models_dir, exist_ok=True)
+    paths = []
+    for file_index in range(files):
+        path = os.path.join(models_dir, f"schema_{file_index}.yml")
+        with open(path, "w") as file:
+            file.write(
+                generate_file(
+                    rng,
+                    file_index,
+                    models,
+                    columns,
+                    metrics,
+                    additional_dimensions,
+                    error_rate,
+                )
+            )
+        paths.append(path)
+    return paths
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic dbt project for benchmarking"
+    )
+    parser.add_argument("directory", help="Where to write the project")
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--models", type=int, default=5)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--metrics", type=int, default=2)
+    parser.add_argument("--additional-dimensions", type=int, default=1)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    paths = generate_project(
+        args.directory,
+        files=args.files,
+        models=args.models,
+        columns=args.columns,
+        metrics=args.metrics,
+        additional_dimensions=args.additional_dimensions,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    print(f"Wrote {len(paths)} schema files to '{args.directory}'")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main(None))
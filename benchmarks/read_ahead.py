@@ -0,0 +1,86 @@
+import argparse
+import builtins
+import contextlib
+import io
+import tempfile
+import time
+from typing import Optional
+from typing import Sequence
+from unittest import mock
+
+from benchmarks.generate_schema import generate_project
+from benchmarks.run import best_time
+from benchmarks.run import SCALES
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.lightdash_check import build_checks
+
+
+@contextlib.contextmanager
+def simulated_latency(directory: str, latency: float):
+    """
+    Delay every open of a file in a directory, as on a network filesystem.
+
+    The delay sleeps, so other threads keep running meanwhile, as they would
+    while waiting on the network.
+
+    Args:
+        directory (str): Files under this directory are delayed.
+        latency (float): Seconds added to each open.
+    """
+    real_open = builtins.open
+
+    def slow_open(file, *args, **kwargs):
+        if isinstance(file, str) and file.startswith(directory):
+            time.sleep(latency)
+        return real_open(file, *args, **kwargs)
+
+    with mock.patch.object(builtins, "open", slow_open):
+        yield
+
+
+def run(paths: Sequence[str], read_ahead: int, streaming: bool) -> None:
+    core = Core(build_checks(()), jobs=1, streaming=streaming, read_ahead=read_ahead)
+    with contextlib.redirect_stdout(io.StringIO()):
+        core.run(paths)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark --read-ahead against serial reads with simulated "
+        "I/O latency"
+    )
+    parser.add_argument("--scale", default="medium", choices=list(SCALES))
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.005,
+        help="Seconds added to every file open",
+    )
+    parser.add_argument(
+        "--read-ahead",
+        default="0,2,4,8",
+        help="Comma-separated --read-ahead values to compare, 0 being serial",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = generate_project(directory, **SCALES[args.scale])
+        with simulated_latency(directory, args.latency):
+            for streaming in (False, True):
+                mode = "streaming" if streaming else "load"
+                serial = None
+                for read_ahead in map(int, args.read_ahead.split(",")):
+                    seconds = best_time(
+                        lambda: run(paths, read_ahead, streaming), args.repeat
+                    )
+                    serial = serial or seconds
+                    print(
+                        f"{mode:<10} read-ahead {read_ahead:<3} "
+                        f"{seconds * 1000:10.2f} ms  {serial / seconds:5.2f}x"
+                    )
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main(None))
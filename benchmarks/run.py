@@ -0,0 +1,205 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Sequence
+
+from benchmarks.generate_schema import generate_project
+from lightdash_pre_commit import check_duplicate_metric_dimension_names
+from lightdash_pre_commit import check_naming_conventions
+from lightdash_pre_commit import find_incorrect_indentation_of_dims_and_metrics
+from lightdash_pre_commit import find_missing_dimension_group_labels
+from lightdash_pre_commit import find_missing_metric_group_labels
+from lightdash_pre_commit import find_missing_model_group_labels
+from lightdash_pre_commit import lightdash_check
+from lightdash_pre_commit.parsers import get_parser
+
+# Bump when the layout of the results file changes.
+RESULTS_FORMAT = 1
+
+SCALES = {
+    "small": dict(files=5, models=2, columns=10, metrics=1, additional_dimensions=1),
+    "medium": dict(files=50, models=5, columns=20, metrics=2, additional_dimensions=1),
+    "large": dict(files=200, models=10, columns=40, metrics=2, additional_dimensions=2),
+}
+
+HOOKS: Dict[str, Callable] = {
+    "check-duplicate-dims-and-metrics": check_duplicate_metric_dimension_names.main,
+    "find_missing_metric_group_labels": find_missing_metric_group_labels.main,
+    "find_missing_dimension_group_labels": find_missing_dimension_group_labels.main,
+    "find_incorrect_indentation_of_dims_and_metrics": find_incorrect_indentation_of_dims_and_metrics.main,
+    "find_missing_model_group_labels": find_missing_model_group_labels.main,
+    "check-naming-conventions": check_naming_conventions.main,
+    "lightdash-check": lightdash_check.main,
+}
+
+CORE_FUNCTIONS: Dict[str, Callable] = {
+    "find_duplicates": check_duplicate_metric_dimension_names.find_duplicates,
+    "find_missing_group_labels (metrics)": find_missing_metric_group_labels.find_missing_group_labels,
+    "find_missing_group_labels (dimensions)": find_missing_dimension_group_labels.find_missing_group_labels,
+    "find_indentation_issues": find_incorrect_indentation_of_dims_and_metrics.find_indentation_issues,
+    "find_missing_model_group_labels": find_missing_model_group_labels.find_missing_model_group_labels,
+    "find_naming_issues": check_naming_conventions.find_naming_issues,
+}
+
+
+def best_time(func: Callable, repeat: int) -> float:
+    """
+    Time a function, keeping the fastest of several runs.
+
+    Args:
+        func (Callable): The function to time.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: The fastest run in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_hook(main: Callable, argv: Sequence[str]) -> None:
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        main(argv)
+
+
+def run_scale(scale: str, repeat: int, hook_args: Sequence[str]) -> dict:
+    """
+    Benchmark every hook and core function on a generated project.
+
+    Args:
+        scale (str): Name of the project size in SCALES.
+        repeat (int): Number of runs per measurement.
+        hook_args (Sequence[str]): Extra arguments passed to every hook.
+
+    Returns:
+        dict: The project size and the timings in seconds.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = generate_project(directory, **SCALES[scale])
+
+        for name, main in HOOKS.items():
+            argv = [*paths, "--no-cache", *hook_args]
+            results[f"main:{name}"] = best_time(lambda: run_hook(main, argv), repeat)
+
+        parser = get_parser()
+        documents = []
+        for path in paths:
+            with open(path, "rb") as file:
+                documents.append(parser.load(file))
+        for name, func in CORE_FUNCTIONS.items():
+            results[f"core:{name}"] = best_time(
+                lambda: [func(data) for data in documents], repeat
+            )
+
+    return {"files": len(paths), **SCALES[scale], "results": results}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> int:
+    """
+    Print how the current timings compare with a baseline.
+
+    Args:
+        baseline (dict): Results of an earlier run.
+        current (dict): Results of this run.
+        threshold (float): Allowed slowdown as a fraction, e.g. 0.1 for 10%.
+
+    Returns:
+        int: The number of measurements slower than the threshold allows.
+    """
+    regressions = 0
+    for scale, scale_results in current["scales"].items():
+        baseline_results = baseline.get("scales", {}).get(scale, {}).get("results")
+        if not baseline_results:
+            continue
+        for name, seconds in scale_results["results"].items():
+            if name not in baseline_results:
+                continue
+            ratio = seconds / baseline_results[name]
+            status = "ok"
+            if ratio > 1 + threshold:
+                status = "REGRESSION"
+                regressions += 1
+            print(f"{scale:<8} {name:<56} {ratio:6.2f}x  {status}")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the hooks on synthetic dbt projects"
+    )
+    parser.add_argument(
+        "--scales",
+        default="small,medium",
+        help=f"Comma-separated project sizes to run, from {', '.join(SCALES)}",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument(
+        "--output", default="benchmark_results.json", help="Where to write results"
+    )
+    parser.add_argument("--compare", help="Results file of an earlier run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Slowdown against --compare that counts as a regression (0.1 = 10%%)",
+    )
+    parser.add_argument(
+        "--hook-args",
+        default="--jobs 1",
+        help="Extra arguments passed to every hook, as one string",
+    )
+    args = parser.parse_args(argv)
+
+    scales = args.scales.split(",")
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"Unknown scales: {', '.join(unknown)}")
+
+    current = {
+        "format": RESULTS_FORMAT,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scales": {},
+    }
+    for scale in scales:
+        print(f"Running '{scale}'...", file=sys.stderr)
+        current["scales"][scale] = run_scale(scale, args.repeat, args.hook_args.split())
+        for name, seconds in current["scales"][scale]["results"].items():
+            print(f"{scale:<8} {name:<56} {seconds * 1000:10.2f} ms")
+
+    with open(args.output, "w") as file:
+        json.dump(current, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline = json.load(file)
+        if baseline.get("format") != RESULTS_FORMAT:
+            print(f"Cannot compare with '{args.compare}': unknown format")
+            return 1
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(
+                f"{regressions} measurement(s) regressed by more than {args.threshold:.0%}"
+            )
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main(None))
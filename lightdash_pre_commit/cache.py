@@ -0,0 +1,188 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Hashable
+from typing import List
+from typing import Optional
+
+from lightdash_pre_commit.diagnostics import Diagnostic
+
+DEFAULT_CACHE_DIR = ".lightdash_precommit_cache"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_PARSED_FILES = 2048
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Bump when the layout of a cache entry changes.
+CACHE_FORMAT = "4"
+
+
+def package_version() -> str:
+    """
+    Get the installed version of this package.
+
+    Returns:
+        str: The version, or "unknown" when running from a source checkout.
+    """
+    try:
+        from importlib.metadata import version
+
+        return version("pre_commit_hooks")
+    except Exception:
+        return "unknown"
+
+
+class ResultCache:
+    """
+    On-disk cache of per-file check results.
+
+    Entries are keyed by the hash of the file's content, the configuration of
+    the enabled checks and the package version, so a hit can skip both the
+    parse and the checks. The cache is bounded in size and evicts the least
+    recently used entries first. Failing to read or write the cache never
+    fails a hook.
+    """
+
+    def __init__(
+        self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.results_dir = os.path.join(directory, "results")
+        self.version = package_version()
+        self.dirty = False
+
+    def key(self, content: bytes, signature: str) -> str:
+        """
+        Compute the cache key of a file.
+
+        Args:
+            content (bytes): The raw file content.
+            signature (str): Describes the enabled checks and their arguments.
+
+        Returns:
+            str: The hex digest identifying the file's results.
+        """
+        digest = self._digest(signature)
+        digest.update(content)
+        return digest.hexdigest()
+
+    def file_key(self, file_path: str, signature: str) -> str:
+        """
+        Compute the cache key of a file without holding it in memory.
+
+        Args:
+            file_path (str): The file.
+            signature (str): Describes the enabled checks and their arguments.
+
+        Returns:
+            str: The same key :meth:`key` gives for the file's content.
+        """
+        digest = self._digest(signature)
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(READ_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _digest(self, signature: str):
+        import hashlib
+
+        digest = hashlib.sha256()
+        for part in (CACHE_FORMAT, self.version, signature):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.results_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[List[Diagnostic]]:
+        path = self._path(key)
+        try:
+            with open(path, "r") as file:
+                errors = [Diagnostic.from_dict(error) for error in json.load(file)]
+            # Refresh the access time used for LRU eviction
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return errors
+
+    def put(self, key: str, errors: List[Diagnostic]) -> None:
+        import tempfile
+
+        try:
+            self._ensure_directory()
+            fd, tmp_path = tempfile.mkstemp(dir=self.results_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as file:
+                json.dump([error.to_dict() for error in errors], file)
+            os.replace(tmp_path, self._path(key))
+            self.dirty = True
+        except OSError:
+            pass
+
+    def _ensure_directory(self) -> None:
+        if os.path.isdir(self.results_dir):
+            return
+        os.makedirs(self.results_dir, exist_ok=True)
+        # Keep the cache out of version control
+        with open(os.path.join(self.directory, ".gitignore"), "w") as file:
+            file.write("*\n")
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache fits in
+        ``max_bytes``.
+        """
+        try:
+            entries = []
+            total = 0
+            with os.scandir(self.results_dir) as it:
+                for entry in it:
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            for _, size, path in entries:
+                os.remove(path)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        except OSError:
+            pass
+
+
+class ParseCache:
+    """
+    In-memory cache of normalized schema files, shared by every hook run in a
+    long-lived process such as the daemon.
+
+    The result cache only helps when a file is checked again with the same
+    checks, but each hook runs different checks over the same files. Keeping
+    the parsed files lets every hook after the first skip parsing. Entries
+    are keyed by the parser and the hash of the file's content, and the least
+    recently used entries are dropped beyond ``max_entries`` files.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_PARSED_FILES):
+        self.max_entries = max_entries
+        self.entries: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def key(content: bytes, parser_name: str) -> Hashable:
+        import hashlib
+
+        return parser_name, hashlib.sha256(content).digest()
+
+    def get(self, key: Hashable):
+        data = self.entries.get(key)
+        if data is not None:
+            self.entries.move_to_end(key)
+        return data
+
+    def put(self, key: Hashable, data) -> None:
+        self.entries[key] = data
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
@@ -1,74 +1,109 @@
 import argparse
+from typing import FrozenSet
 from typing import Optional
 from typing import Sequence
 
-import yaml
+from lightdash_pre_commit.core import add_core_arguments
+from lightdash_pre_commit.core import Check
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.core import forward_or_skip
+from lightdash_pre_commit.nodes import AdditionalDimension
+from lightdash_pre_commit.nodes import Column
+from lightdash_pre_commit.nodes import Dimension
+from lightdash_pre_commit.nodes import Metric
+from lightdash_pre_commit.nodes import Model
+from lightdash_pre_commit.nodes import Schema
+from lightdash_pre_commit.positions import Position
+from lightdash_pre_commit.positions import position_of
+from lightdash_pre_commit.project_index import add_project_arguments
+
+
+class DuplicateNamesCheck(Check):
+    name = "check-duplicate-dims-and-metrics"
+    # A changed column can clash with any other name in its model
+    diff_scope = "model"
+    # Collects every name of a model before reporting
+    cost = 2
+
+    def applies_to(self, schema: Schema) -> bool:
+        # A clash needs at least two names
+        return schema.summary.fields > 1
+
+    def may_report(self, keys: FrozenSet[str]) -> bool:
+        # Only metrics and dimensions have names that can clash
+        return bool(keys)
+
+    def start(self) -> None:
+        super().start()
+        # Track where each metric and dimension name is defined
+        self.all_names = {}
+
+    def add(self, name: str, node) -> None:
+        self.all_names.setdefault(name, []).append(position_of(node))
+
+    # Process model-level metrics
+    def visit_model_metric(self, model: Model, metric: Metric) -> None:
+        self.add(metric.name, metric)
+
+    # Process column-level dimensions
+    def visit_dimension(
+        self, model: Model, column: Column, dimension: Dimension
+    ) -> None:
+        self.add(column.name, column)
+
+    # Process column-level additional dimensions
+    def visit_additional_dimension(
+        self, model: Model, column: Column, dimension: AdditionalDimension
+    ) -> None:
+        self.add(dimension.name, dimension)
+
+    # Process column-level metrics
+    def visit_column_metric(self, model: Model, column: Column, metric: Metric) -> None:
+        self.add(metric.name, metric)
+
+    def finish(self) -> list:
+        # Check for duplicates and gather error messages, in file order so the
+        # result does not depend on the order nodes were visited in
+        duplicates = [
+            (name, sorted(positions, key=_file_order))
+            for name, positions in self.all_names.items()
+            if len(positions) > 1
+        ]
+        duplicates.sort(key=lambda duplicate: _file_order(duplicate[1][0]))
+        for name, positions in duplicates:
+            self.report(
+                f"Duplicate name '{name}' used {len(positions)} times (as metrics or dimensions).",
+                occurrences=positions,
+                name=name,
+            )
+        return self.errors
 
 
-def find_duplicates(data: dict) -> list:
-    all_names = {}  # Dictionary to track both metrics and dimensions
-    errors = []
-
-    # Check for metrics and dimensions defined at the model 'meta' level
-    for model in data.get("models", []):
-        # Process model-level metrics
-        if "meta" in model and "metrics" in model["meta"]:
-            for metric, details in model["meta"]["metrics"].items():
-                all_names[metric] = all_names.get(metric, 0) + 1
-
-        # Check for metrics and dimensions defined at the column level
-        for column in model.get("columns", []):
-            # Process column-level dimensions
-            if "meta" in column and "dimension" in column["meta"]:
-                column_name = column["name"]
-                all_names[column_name] = all_names.get(column_name, 0) + 1
-
-            # Process column-level additional dimensions
-            if "meta" in column and "additional_dimensions" in column["meta"]:
-                for ad_dim, ad_details in column["meta"][
-                    "additional_dimensions"
-                ].items():
-                    all_names[ad_dim] = all_names.get(ad_dim, 0) + 1
-
-            # Process column-level metrics
-            if "meta" in column and "metrics" in column["meta"]:
-                for metric_name, details in column["meta"]["metrics"].items():
-                    all_names[metric_name] = all_names.get(metric_name, 0) + 1
-
-    # Check for duplicates and gather error messages
-    for name, count in all_names.items():
-        if count > 1:
-            errors.append(
-                f"Duplicate name '{name}' used {count} times (as metrics or dimensions)."
-            )
+def _file_order(position: Position) -> tuple:
+    # Nodes without a position keep their relative order, after the others
+    line, column = position
+    return line is None, line or 0, column or 0
 
-    return errors
+
+def find_duplicates(data: dict) -> list:
+    return Core([DuplicateNamesCheck()]).check_data(data)
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("filenames", nargs="*", help="Filenames to check")
+    add_core_arguments(parser)
+    add_project_arguments(parser)
     args = parser.parse_args(argv)
 
-    error_flag = False
-    for file_path in args.filenames:
-        try:
-            with open(file_path, "r") as file:
-                data = yaml.safe_load(file)
-                errors = find_duplicates(data)
-                if errors:
-                    print(f"Errors found in '{file_path}':")
-                    for error in errors:
-                        print(error)
-                    error_flag = True
-        except Exception as e:
-            print(f"Failed to process '{file_path}': {e}")
-            error_flag = True
-
-    if error_flag:
-        return 1
-
-    return 0
+    exit_code = forward_or_skip(
+        "lightdash_pre_commit.check_duplicate_metric_dimension_names", argv, args
+    )
+    if exit_code is not None:
+        return exit_code
+
+    checks = [DuplicateNamesCheck()]
+    return Core.from_args(checks, args).run(args.filenames)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,227 @@
+import argparse
+import functools
+import re
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+from typing import Optional
+from typing import Pattern
+from typing import Sequence
+
+from lightdash_pre_commit.core import add_core_arguments
+from lightdash_pre_commit.core import Check
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.core import forward_or_skip
+from lightdash_pre_commit.nodes import AdditionalDimension
+from lightdash_pre_commit.nodes import Column
+from lightdash_pre_commit.nodes import Dimension
+from lightdash_pre_commit.nodes import Metric
+from lightdash_pre_commit.nodes import Model
+from lightdash_pre_commit.nodes import Schema
+
+SNAKE_CASE = r"^[a-z][a-z0-9]*(_[a-z0-9]+)*$"
+
+# The pattern names of each node kind must match. A metric's name must also
+# match the pattern of its type, keyed "metric.<type>". Patterns are searched
+# for, so they are anchored as needed.
+DEFAULT_RULES = {
+    "dimension": SNAKE_CASE,
+    "additional_dimension": SNAKE_CASE,
+    "metric": SNAKE_CASE,
+    "metric.sum": r"_sum$",
+    "metric.count": r"_count$",
+    "metric.average": r"_avg$",
+}
+
+KIND_NAMES = {
+    "dimension": "Dimension",
+    "additional_dimension": "Additional dimension",
+    "metric": "Metric",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def compile_pattern(pattern: str) -> Pattern:
+    # Compiled once per process, whichever check or file uses the pattern
+    return re.compile(pattern)
+
+
+def parse_rule(rule: str) -> tuple:
+    """
+    Parse a ``KIND=PATTERN`` naming rule from the command line.
+
+    Args:
+        rule (str): The rule. An empty pattern turns the kind's rule off.
+
+    Returns:
+        tuple: The kind and the pattern.
+
+    Raises:
+        argparse.ArgumentTypeError: If the kind is unknown or the pattern
+            is not a valid regular expression.
+    """
+    kind, separator, pattern = rule.partition("=")
+    base_kind = kind.split(".", 1)[0]
+    if not separator or base_kind not in KIND_NAMES:
+        raise argparse.ArgumentTypeError(
+            f"expected KIND=PATTERN with KIND one of {', '.join(KIND_NAMES)} or "
+            f"metric.<type>, got '{rule}'"
+        )
+    if "." in kind and base_kind != "metric":
+        raise argparse.ArgumentTypeError(f"only metrics have types, got '{kind}'")
+    try:
+        compile_pattern(pattern)
+    except re.error as e:
+        raise argparse.ArgumentTypeError(f"invalid pattern for '{kind}': {e}")
+    return kind, pattern
+
+
+def build_rules(overrides: Sequence[tuple] = ()) -> Dict[str, str]:
+    """
+    Combine the default naming rules with the ones given.
+
+    Args:
+        overrides (Sequence[tuple]): ``(kind, pattern)`` pairs, see
+            :func:`parse_rule`.
+
+    Returns:
+        Dict[str, str]: The pattern of each kind that has one.
+    """
+    rules = {**DEFAULT_RULES, **dict(overrides)}
+    return {kind: pattern for kind, pattern in rules.items() if pattern}
+
+
+class NamingConventionCheck(Check):
+    name = "check-naming-conventions"
+
+    def __init__(self, rules: Optional[Dict[str, str]] = None):
+        super().__init__()
+        self.rules = build_rules() if rules is None else dict(rules)
+        self.compile()
+
+    def compile(self) -> None:
+        self.patterns = {
+            kind: compile_pattern(pattern) for kind, pattern in self.rules.items()
+        }
+        self.dimension_pattern = self.patterns.get("dimension")
+        self.additional_dimension_pattern = self.patterns.get("additional_dimension")
+        self.metric_pattern = self.patterns.get("metric")
+
+    def __getstate__(self) -> dict:
+        # Patterns are compiled again, once, in each worker process
+        return {
+            key: value
+            for key, value in self.__dict__.items()
+            if key != "patterns" and not key.endswith("_pattern")
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.compile()
+
+    def signature(self) -> str:
+        return f"{self.name}:{sorted(self.rules.items())}"
+
+    def applies_to(self, schema: Schema) -> bool:
+        return schema.summary.fields > 0
+
+    def may_report(self, keys: FrozenSet[str]) -> bool:
+        return bool(keys)
+
+    def check_name(
+        self, name, pattern: Pattern, kind: str, node, model: Model, why: str = ""
+    ) -> None:
+        if not isinstance(name, str) or pattern.search(name) is None:
+            self.report(
+                f"{KIND_NAMES[kind]} name '{name}' does not match "
+                f"'{pattern.pattern}'{why}.",
+                node,
+                model=model,
+                name=name,
+            )
+
+    def visit_dimension(
+        self, model: Model, column: Column, dimension: Dimension
+    ) -> None:
+        if self.dimension_pattern is not None:
+            self.check_name(
+                column.name, self.dimension_pattern, "dimension", column, model
+            )
+
+    def visit_additional_dimension(
+        self, model: Model, column: Column, dimension: AdditionalDimension
+    ) -> None:
+        if self.additional_dimension_pattern is not None:
+            self.check_name(
+                dimension.name,
+                self.additional_dimension_pattern,
+                "additional_dimension",
+                dimension,
+                model,
+            )
+
+    def visit_model_metric(self, model: Model, metric: Metric) -> None:
+        self.check_metric(model, metric)
+
+    def visit_column_metric(self, model: Model, column: Column, metric: Metric) -> None:
+        self.check_metric(model, metric)
+
+    def check_metric(self, model: Model, metric: Metric) -> None:
+        if self.metric_pattern is not None:
+            self.check_name(metric.name, self.metric_pattern, "metric", metric, model)
+        pattern = self.patterns.get(f"metric.{metric.type}")
+        if pattern is not None:
+            self.check_name(
+                metric.name,
+                pattern,
+                "metric",
+                metric,
+                model,
+                f" required for metrics of type '{metric.type}'",
+            )
+
+
+def find_naming_issues(data: dict, rules: Optional[Dict[str, str]] = None) -> list:
+    return Core([NamingConventionCheck(rules)]).check_data(data)
+
+
+def add_naming_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the option overriding the default naming rules.
+
+    Args:
+        parser (argparse.ArgumentParser): The hook's argument parser.
+    """
+    defaults = ", ".join(f"{kind}={pattern}" for kind, pattern in DEFAULT_RULES.items())
+    parser.add_argument(
+        "--naming-rule",
+        action="append",
+        default=[],
+        type=parse_rule,
+        metavar="KIND=PATTERN",
+        help="Regular expression the names of a node kind must match: "
+        "dimension, additional_dimension, metric, or metric.<type> for metrics "
+        "of a type. May be given more than once, and an empty pattern turns a "
+        f"rule off. Defaults to {defaults}.",
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filenames", nargs="*", help="Filenames to check")
+    add_naming_arguments(parser)
+    add_core_arguments(parser)
+    args = parser.parse_args(argv)
+
+    exit_code = forward_or_skip(
+        "lightdash_pre_commit.check_naming_conventions", argv, args
+    )
+    if exit_code is not None:
+        return exit_code
+
+    checks: List[Check] = [NamingConventionCheck(build_rules(args.naming_rule))]
+    return Core.from_args(checks, args).run(args.filenames)
+
+
+if __name__ == "__main__":
+    exit(main(None))
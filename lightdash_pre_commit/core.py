@@ -1,6 +1,1300 @@
-class Core:
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import sys
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from lightdash_pre_commit.cache import DEFAULT_CACHE_DIR
+from lightdash_pre_commit.cache import ParseCache
+from lightdash_pre_commit.cache import ResultCache
+from lightdash_pre_commit.diagnostics import Diagnostic
+from lightdash_pre_commit.diagnostics import to_diagnostics
+from lightdash_pre_commit.nodes import AdditionalDimension
+from lightdash_pre_commit.nodes import Column
+from lightdash_pre_commit.nodes import Dimension
+from lightdash_pre_commit.nodes import Metric
+from lightdash_pre_commit.nodes import Model
+from lightdash_pre_commit.nodes import normalize
+from lightdash_pre_commit.nodes import Schema
+from lightdash_pre_commit.nodes import Summary
+from lightdash_pre_commit.parsers import get_parser
+from lightdash_pre_commit.parsers import Parser
+from lightdash_pre_commit.parsers import PARSERS
+from lightdash_pre_commit.positions import Position
+from lightdash_pre_commit.positions import position_of
+from lightdash_pre_commit.profiling import DEFAULT_TRACE_FILE
+from lightdash_pre_commit.profiling import Profiler
+from lightdash_pre_commit.profiling import profiling_requested
+from lightdash_pre_commit.reporters import FAILURE_RULE
+from lightdash_pre_commit.reporters import FORMATS
+from lightdash_pre_commit.reporters import get_reporter
+from lightdash_pre_commit.reporters import Reporter
+from lightdash_pre_commit.shards import add_shard_arguments
+from lightdash_pre_commit.shards import select_shard
+
+# Below this many files per worker a process pool costs more than it saves.
+MIN_FILES_PER_JOB = 16
+
+# Node kinds visited while walking a dbt schema file, in walk order.
+NODE_KINDS = (
+    "model",
+    "model_metric",
+    "column",
+    "dimension",
+    "additional_dimension",
+    "column_metric",
+)
+
+
+class Check:
+    """
+    Base class for a check run by :class:`Core`.
+
+    Subclasses override the ``visit_*`` methods for the node kinds they care
+    about. Only overridden methods are dispatched to, so a check pays nothing
+    for the nodes it ignores. Visitors receive the compact nodes of
+    :mod:`lightdash_pre_commit.nodes` rather than the parsed mappings.
+    """
+
+    name = ""
+
+    # Set from the rule config, see :mod:`lightdash_pre_commit.rules`.
+    severity = "error"
+
+    # With --diff-scope, "column" checks see only the changed columns of a
+    # changed model, while "model" checks see all of its columns.
+    diff_scope = "column"
+
+    # Relative cost of running the check. With an error limit, cheaper checks
+    # run first so a file can stop before the expensive ones.
+    cost = 1
+
     def __init__(self):
+        self.errors = []
+
+    def applies_to(self, schema: Schema) -> bool:
+        """
+        Decide whether the check should run on a parsed file at all.
+
+        Args:
+            schema (Schema): The normalized dbt schema file.
+
+        Returns:
+            bool: True if the file should be checked, False to skip it.
+        """
+        return True
+
+    def may_report(self, keys: FrozenSet[str]) -> bool:
+        """
+        Decide from the raw bytes of a file whether the check could report
+        anything, before the file is parsed.
+
+        Args:
+            keys (FrozenSet[str]): The words of
+                :data:`~lightdash_pre_commit.prefilter.KEYS` the file
+                mentions.
+
+        Returns:
+            bool: False only if the check cannot report anything on a file
+                mentioning none but these words, so the file need not be
+                parsed for it.
+        """
+        return True
+
+    def signature(self) -> str:
+        """
+        Describe the check and any arguments that change its results. Used
+        to key cached results.
+
+        Returns:
+            str: The check's signature.
+        """
+        return self.name
+
+    def start(self) -> None:
+        self.errors = []
+
+    def report(
+        self,
+        message: str,
+        node=None,
+        occurrences: Sequence[Position] = (),
+        model: Optional[Model] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        """
+        Record an error at the position of a node.
+
+        Args:
+            message (str): The error message.
+            node: The parsed node the error is about, if it has a position.
+            occurrences (Sequence[Position]): Every position involved when the
+                error concerns several nodes.
+            model (Optional[Model]): The model the node belongs to.
+            name (Optional[str]): The name of the node the error is about.
+                Defaults to the name of ``node``, unless it is the model.
+        """
+        line, column = position_of(node)
+        if line is None and occurrences:
+            line, column = occurrences[0]
+        if name is None and node is not model:
+            name = getattr(node, "name", None)
+        self.errors.append(
+            Diagnostic(
+                message,
+                line,
+                column,
+                occurrences,
+                self.severity,
+                self.name,
+                None if model is None else model.name,
+                name,
+            )
+        )
+
+    def finish(self) -> list:
+        return self.errors
+
+    def visit_model(self, model: Model) -> None:
+        pass
+
+    def visit_model_metric(self, model: Model, metric: Metric) -> None:
+        pass
+
+    def visit_column(self, model: Model, column: Column) -> None:
+        pass
+
+    def visit_dimension(
+        self, model: Model, column: Column, dimension: Dimension
+    ) -> None:
         pass
 
-    def run(self):
+    def visit_additional_dimension(
+        self, model: Model, column: Column, dimension: AdditionalDimension
+    ) -> None:
         pass
+
+    def visit_column_metric(self, model: Model, column: Column, metric: Metric) -> None:
+        pass
+
+
+def compile_dispatch(checks: Sequence[Check]) -> Dict[str, List[Callable]]:
+    """
+    Build a table of the visitor methods to call for each node kind.
+
+    Args:
+        checks (Sequence[Check]): The enabled checks.
+
+    Returns:
+        Dict[str, List[Callable]]: Bound visitor methods keyed by node kind.
+    """
+    dispatch = {}
+    for kind in NODE_KINDS:
+        method = f"visit_{kind}"
+        dispatch[kind] = [
+            getattr(check, method)
+            for check in checks
+            if getattr(type(check), method) is not getattr(Check, method)
+        ]
+    return dispatch
+
+
+def visit_model_nodes(model: Model, dispatch: Dict[str, List[Callable]]) -> None:
+    """
+    Dispatch a model and its model-level metrics, but not its columns.
+
+    Args:
+        model (Model): The model.
+        dispatch (Dict[str, List[Callable]]): Visitor methods by node kind.
+    """
+    for visit in dispatch["model"]:
+        visit(model)
+
+    visit_model_metric = dispatch["model_metric"]
+    if visit_model_metric:
+        for metric in model.metrics:
+            for visit in visit_model_metric:
+                visit(model, metric)
+
+
+def visit_column_nodes(
+    model: Model, column: Column, dispatch: Dict[str, List[Callable]]
+) -> None:
+    """
+    Dispatch a column and the dimensions and metrics defined in its meta.
+
+    Args:
+        model (Model): The model the column belongs to.
+        column (Column): The column.
+        dispatch (Dict[str, List[Callable]]): Visitor methods by node kind.
+    """
+    for visit in dispatch["column"]:
+        visit(model, column)
+
+    visit_dimension = dispatch["dimension"]
+    if visit_dimension and column.dimension is not None:
+        for visit in visit_dimension:
+            visit(model, column, column.dimension)
+
+    visit_additional_dimension = dispatch["additional_dimension"]
+    if visit_additional_dimension:
+        for dimension in column.additional_dimensions:
+            for visit in visit_additional_dimension:
+                visit(model, column, dimension)
+
+    visit_column_metric = dispatch["column_metric"]
+    if visit_column_metric:
+        for metric in column.metrics:
+            for visit in visit_column_metric:
+                visit(model, column, metric)
+
+
+def count_errors(errors: Iterable) -> int:
+    """
+    Count the diagnostics that fail a hook, leaving out warnings.
+
+    Args:
+        errors (Iterable): The diagnostics.
+
+    Returns:
+        int: How many have the error severity.
+    """
+    return sum(1 for error in errors if error.severity == "error")
+
+
+def within_limit(errors: list, limit: int) -> list:
+    """
+    Cut a file's diagnostics after its ``limit``-th error.
+
+    Args:
+        errors (list): The diagnostics.
+        limit (int): The number of errors still allowed.
+
+    Returns:
+        list: The diagnostics up to and including that error.
+    """
+    for index, error in enumerate(errors):
+        if error.severity == "error":
+            limit -= 1
+            if limit <= 0:
+                return errors[: index + 1]
+    return errors
+
+
+def read_file(file_path: str) -> bytes:
+    with open(file_path, "rb") as file:
+        return file.read()
+
+
+def _parser_type(name: str) -> Parser:
+    try:
+        return get_parser(name)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def add_core_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the engine options shared by every hook.
+
+    Args:
+        parser (argparse.ArgumentParser): The hook's argument parser.
+    """
+    parser.add_argument(
+        "--parser",
+        type=_parser_type,
+        help=f"YAML parser backend, one of {', '.join(sorted(PARSERS))}. "
+        f"'auto' uses libyaml when available.",
+    )
+    parser.add_argument(
+        "--config",
+        metavar="PATH",
+        help="Rule config file enabling, disabling and setting the severity of "
+        "checks. Defaults to .lightdash-precommit.yml when it exists.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Check every file even if its results are cached.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="Output format of the diagnostics. Defaults to text.",
+    )
+    add_shard_arguments(parser)
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Repair what the checks report before checking each file, by "
+        "patching its bytes so comments and formatting are kept: blocks "
+        "indented under a dimension are moved up, and with --fix-group-label a "
+        "group_label is inserted where one is missing. Exits with 1 when any "
+        "file was changed.",
+    )
+    parser.add_argument(
+        "--fix-group-label",
+        metavar="LABEL",
+        help="With --fix, the group_label inserted into models, dimensions and "
+        "metrics missing one.",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first error. Same as --max-errors 1.",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=_positive_int,
+        metavar="N",
+        help="Stop once N errors are reported, without parsing the remaining "
+        "files. Files are then checked in-process and in order, running the "
+        "cheapest checks first.",
+    )
+    parser.add_argument(
+        "--read-ahead",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Read up to N files ahead on background threads while earlier "
+        "files are checked, for slow or network filesystems. Only used when "
+        "files are checked in-process. Defaults to 0, reading each file when "
+        "it is checked.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print how many dimensions and metrics each model defines. Every "
+        "file is parsed, bypassing the cache and the prefilter.",
+    )
+    parser.add_argument(
+        "--no-prefilter",
+        action="store_true",
+        help="Parse every file, even those whose bytes show the checks have "
+        "nothing to report.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory of the result cache. Defaults to {DEFAULT_CACHE_DIR}.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes used to check files. Defaults to the CPU count.",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Validate from YAML parse events without loading whole files into "
+        "memory. Useful for very large generated schema files.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each file and phase, write a Chrome trace and print a summary. "
+        "Also enabled by setting LIGHTDASH_PRECOMMIT_PROFILE=1.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default=DEFAULT_TRACE_FILE,
+        help=f"Where --profile writes the trace. Defaults to {DEFAULT_TRACE_FILE}.",
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        metavar="PATH",
+        help="With --profile, also write a cProfile dump of the run to PATH.",
+    )
+    parser.add_argument(
+        "--diff-scope",
+        action="store_true",
+        help="Only check the models and columns that enclose lines changed in "
+        "the staged diff. Whole files are checked outside a git repository.",
+    )
+    parser.add_argument(
+        "--manifest",
+        metavar="PATH",
+        help="Check the models of a compiled dbt manifest.json instead of parsing "
+        "schema files. Errors are reported against each model's schema file, and "
+        "only the given filenames are checked when any are given.",
+    )
+    parser.add_argument(
+        "--manifest-project-root",
+        metavar="PATH",
+        help="With --manifest, the dbt project directory the manifest's paths are "
+        "relative to. Defaults to the parent of the manifest's directory, as dbt "
+        "writes it to <project>/target/manifest.json.",
+    )
+    parser.add_argument(
+        "--manifest-streaming",
+        action="store_true",
+        help="With --manifest, read the manifest incrementally. Requires ijson.",
+    )
+
+
+def forward_or_skip(
+    module: str, argv: Optional[Sequence[str]], args: argparse.Namespace
+) -> Optional[int]:
+    """
+    Decide whether a hook needs to run in this process once its arguments
+    are parsed.
+
+    Checking nothing, the common case when pre-commit matches no files,
+    exits before the YAML parser, the process pool or the daemon client are
+    imported. A shard still writes its partial results, so the merge can
+    tell a shard without files from a missing one.
+
+    Args:
+        module (str): The hook's module.
+        argv (Optional[Sequence[str]]): The hook's arguments.
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        Optional[int]: 0 when there is nothing to check, the exit code of the
+            daemon when it ran the hook, or None to run the hook here.
+    """
+    if (
+        not args.filenames
+        and getattr(args, "manifest", None) is None
+        and getattr(args, "shard_output", None) is None
+    ):
+        return 0
+
+    from lightdash_pre_commit.daemon import forward
+
+    return forward(module, argv)
+
+
+class Core:
+    """
+    Run a set of checks over dbt schema files.
+
+    Each file is parsed once and every model, column, dimension and metric is
+    handed to every enabled check in a single walk.
+    """
+
+    # Shared by every engine in the process. Set by the daemon so files
+    # parsed for one hook are reused by the next.
+    parse_cache: Optional[ParseCache] = None
+
+    def __init__(
+        self,
+        checks: Sequence[Check],
+        parser: Optional[Parser] = None,
+        cache: Optional[ResultCache] = None,
+        jobs: int = 1,
+        streaming: bool = False,
+        project_index=None,
+        profiler: Optional[Profiler] = None,
+        manifest: Optional[str] = None,
+        manifest_streaming: bool = False,
+        manifest_project_root: Optional[str] = None,
+        changes: Optional[Dict[str, List[Tuple[int, int]]]] = None,
+        prefilter: bool = True,
+        stats: bool = False,
+        read_ahead: int = 0,
+        output_format: str = "text",
+        max_errors: Optional[int] = None,
+        fixer=None,
+        shard: Optional[Tuple[int, int]] = None,
+        shard_output: Optional[str] = None,
+    ):
+        # A shard writing partial results also collects the names each file
+        # defines, see lightdash_pre_commit.shards
+        self.collector = None
+        self.definitions = None
+        if shard_output is not None:
+            from lightdash_pre_commit.project_index import DefinitionsCollector
+
+            self.collector = DefinitionsCollector()
+            self.definitions = {}
+            checks = [*checks, self.collector]
+        # With an error limit, checks are scheduled cheapest first
+        if max_errors is not None:
+            checks = sorted(checks, key=lambda check: check.cost)
+        self.checks = list(checks)
+        self.profiler = profiler
+        self.dispatch = self.compile_dispatch(self.checks)
+        self.parser = parser or get_parser()
+        self.cache = cache
+        self.jobs = jobs
+        self.streaming = streaming
+        self.project_index = project_index
+        self.manifest = manifest
+        self.manifest_streaming = manifest_streaming
+        self.manifest_project_root = manifest_project_root
+        self.changes = changes
+        self.prefilter = prefilter
+        # The feature summary of each file, and of the last file checked
+        self.summaries = {} if stats else None
+        self.summary = None
+        self.read_ahead = read_ahead
+        self.output_format = output_format
+        self.max_errors = max_errors
+        # The number of issues fixed in each file, see lightdash_pre_commit.fix
+        self.fixer = fixer
+        self.fixed = {}
+        # The errors the run may still report before stopping
+        self.remaining = max_errors
+        self.shard = shard
+        self.shard_output = shard_output
+        # Parsers and the streaming walk differ in the positions and order of
+        # the errors they report, so results are not shared between them
+        mode = "streaming" if streaming else "load"
+        self.signature = "|".join(
+            [
+                self.parser.name,
+                mode,
+                *(f"{check.signature()}:{check.severity}" for check in self.checks),
+            ]
+        )
+
+    def __getstate__(self) -> dict:
+        # Bound methods are rebuilt in worker processes rather than pickled
+        state = self.__dict__.copy()
+        del state["dispatch"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.dispatch = self.compile_dispatch(self.checks)
+
+    @classmethod
+    def from_args(cls, checks: Sequence[Check], args: argparse.Namespace) -> "Core":
+        """
+        Create an engine configured from the options added by
+        :func:`add_core_arguments`.
+
+        Args:
+            checks (Sequence[Check]): The enabled checks.
+            args (argparse.Namespace): The parsed command line.
+
+        Returns:
+            Core: The configured engine.
+
+        Raises:
+            SystemExit: With exit code 2 if the rule config is invalid.
+        """
+        from lightdash_pre_commit.rules import configure_checks
+        from lightdash_pre_commit.rules import load_rule_config
+
+        try:
+            config = load_rule_config(getattr(args, "config", None))
+        except ValueError as e:
+            print(f"Invalid rule config: {e}", file=sys.stderr)
+            raise SystemExit(2)
+        checks = configure_checks(checks, config)
+        fixer = None
+        if getattr(args, "fix", False):
+            if getattr(args, "manifest", None) is not None:
+                print("--fix cannot be used with --manifest", file=sys.stderr)
+                raise SystemExit(2)
+            from lightdash_pre_commit.fix import Fixer
+
+            fixer = Fixer.for_checks(checks, args.fix_group_label)
+        shard_output = getattr(args, "shard_output", None)
+        if shard_output is not None or getattr(args, "shard", None) is not None:
+            if getattr(args, "manifest", None) is not None:
+                print("--shard cannot be used with --manifest", file=sys.stderr)
+                raise SystemExit(2)
+        if shard_output is not None:
+            # Partial results must hold every error and definition of a file
+            for option in ("fix", "diff_scope", "fail_fast", "max_errors"):
+                if getattr(args, option, None):
+                    print(
+                        f"--shard-output cannot be used with "
+                        f"--{option.replace('_', '-')}",
+                        file=sys.stderr,
+                    )
+                    raise SystemExit(2)
+        parser = args.parser or get_parser()
+        print(
+            f"Using YAML parser '{parser.name}' ({parser.description})",
+            file=sys.stderr,
+        )
+        # Every file must be parsed to be summarized, or to collect its names
+        stats = getattr(args, "stats", False)
+        if args.no_cache or stats or shard_output is not None:
+            cache = None
+        else:
+            cache = ResultCache(args.cache_dir)
+        project_index = None
+        if getattr(args, "project_duplicates", False):
+            from lightdash_pre_commit.project_index import ProjectIndex
+
+            project_index = ProjectIndex(args.project_root, args.cache_dir)
+        changes = None
+        if (
+            getattr(args, "diff_scope", False)
+            and getattr(args, "manifest", None) is None
+        ):
+            from lightdash_pre_commit.diff_scope import staged_changes
+
+            changes = staged_changes(args.filenames)
+            if changes is None:
+                print(
+                    "Could not read the staged diff, checking whole files",
+                    file=sys.stderr,
+                )
+        profiler = None
+        if profiling_requested(args.profile):
+            profiler = Profiler(args.profile_output, args.profile_cprofile)
+        return cls(
+            checks,
+            parser=parser,
+            cache=cache,
+            jobs=args.jobs,
+            streaming=args.streaming,
+            project_index=project_index,
+            profiler=profiler,
+            manifest=getattr(args, "manifest", None),
+            manifest_streaming=getattr(args, "manifest_streaming", False),
+            manifest_project_root=getattr(args, "manifest_project_root", None),
+            changes=changes,
+            prefilter=not (getattr(args, "no_prefilter", False) or stats),
+            stats=stats,
+            read_ahead=getattr(args, "read_ahead", 0),
+            output_format=getattr(args, "format", "text"),
+            max_errors=(
+                1
+                if getattr(args, "fail_fast", False)
+                else getattr(args, "max_errors", None)
+            ),
+            fixer=fixer,
+            shard=getattr(args, "shard", None),
+            shard_output=shard_output,
+        )
+
+    def compile_dispatch(self, checks: Sequence[Check]) -> Dict[str, List[Callable]]:
+        dispatch = compile_dispatch(checks)
+        if self.profiler is not None:
+            for methods in dispatch.values():
+                methods[:] = [
+                    self.profiler.timed(method.__self__.name, method)
+                    for method in methods
+                ]
+        return dispatch
+
+    def walk_span(self):
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.walk_span()
+
+    def span(self, name: str, category: str = "phase", **args):
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.span(name, category, **args)
+
+    @staticmethod
+    def walk(schema: Schema, dispatch: Dict[str, List[Callable]]) -> None:
+        visits_columns = any(dispatch[kind] for kind in NODE_KINDS[2:])
+        for model in schema.models:
+            visit_model_nodes(model, dispatch)
+            if visits_columns:
+                for column in model.columns:
+                    visit_column_nodes(model, column, dispatch)
+
+    def check_data(self, data: dict) -> list:
+        """
+        Run every enabled check over an already parsed schema file.
+
+        Args:
+            data (dict): The parsed dbt schema file.
+
+        Returns:
+            list: The error messages, grouped by check in the order the
+                checks were given.
+        """
+        return self.check_schema(normalize(data))
+
+    def check_schema(
+        self,
+        schema: Schema,
+        changed_lines: Optional[Sequence[Tuple[int, int]]] = None,
+    ) -> list:
+        """
+        Run every enabled check over a normalized schema file.
+
+        Args:
+            schema (Schema): The normalized dbt schema file.
+            changed_lines (Optional[Sequence[Tuple[int, int]]]): Only check the
+                nodes enclosing these inclusive line ranges, see
+                :func:`~lightdash_pre_commit.diff_scope.walk_changed`.
+
+        Returns:
+            list: The error messages, grouped by check in the order the
+                checks were given. With an error limit, checks of the same
+                cost walk the file together, cheapest first, and the
+                remaining checks are skipped once the limit is reached.
+        """
+        self.summary = schema.summary
+        checks = [check for check in self.checks if check.applies_to(schema)]
+        if self.max_errors is None:
+            return self.run_checks(schema, checks, changed_lines)
+
+        errors = []
+        for _, phase in itertools.groupby(checks, key=lambda check: check.cost):
+            errors.extend(self.run_checks(schema, list(phase), changed_lines))
+            if count_errors(errors) >= self.remaining:
+                break
+        return errors
+
+    def run_checks(
+        self,
+        schema: Schema,
+        checks: List[Check],
+        changed_lines: Optional[Sequence[Tuple[int, int]]],
+    ) -> list:
+        # Walk a schema once, dispatching to the given checks
+        if len(checks) == len(self.checks):
+            dispatch = self.dispatch
+        else:
+            dispatch = self.compile_dispatch(checks)
+        for check in checks:
+            check.start()
+        with self.walk_span():
+            if changed_lines is None:
+                self.walk(schema, dispatch)
+            else:
+                from lightdash_pre_commit.diff_scope import walk_changed
+
+                model_scope_dispatch = self.compile_dispatch(
+                    [check for check in checks if check.diff_scope == "model"]
+                )
+                walk_changed(schema, changed_lines, dispatch, model_scope_dispatch)
+            errors = []
+            for check in checks:
+                errors.extend(check.finish())
+        return to_diagnostics(errors)
+
+    def check_events(self, events: Iterable) -> list:
+        """
+        Run every enabled check over the parse events of a schema file.
+
+        Only one column is held in memory at a time. Checks are asked whether
+        they apply once the whole file has been seen, based on which kinds of
+        node it contains.
+
+        Args:
+            events (Iterable): The ``yaml.Event`` objects of the file.
+
+        Returns:
+            list: The error messages, grouped by check in the order the
+                checks were given.
+        """
+        from lightdash_pre_commit.streaming import EventWalker
+
+        for check in self.checks:
+            check.start()
+        walker = EventWalker(self.dispatch)
+        with self.walk_span():
+            walker.walk(events)
+            if not walker.walked_whole:
+                presence = walker.presence()
+                self.summary = presence.summary
+                errors = []
+                for check in self.checks:
+                    if check.applies_to(presence):
+                        errors.extend(check.finish())
+                return to_diagnostics(errors)
+        return self.check_data(walker.document)
+
+    def skippable(self, content) -> bool:
+        """
+        Decide from the raw bytes of a file whether it needs to be parsed.
+
+        Args:
+            content: The file's bytes, or its path to search it without
+                reading it whole.
+
+        Returns:
+            bool: True if no enabled check can report anything on the file
+                and it loads without errors.
+        """
+        from lightdash_pre_commit.prefilter import scan
+        from lightdash_pre_commit.prefilter import scan_file
+        from lightdash_pre_commit.prefilter import validate
+
+        with self.span("prefilter"):
+            keys = scan_file(content) if isinstance(content, str) else scan(content)
+            if keys is None or any(check.may_report(keys) for check in self.checks):
+                return False
+            # Parse errors are still reported, so only files that load cleanly
+            # are skipped. Walking the events is much cheaper than loading.
+            try:
+                if isinstance(content, str):
+                    with open(content, "rb") as file:
+                        return validate(self.parser.parse(file))
+                return validate(self.parser.parse(content))
+            except ValueError:
+                # The parser cannot produce events
+                return False
+
+    def check_file(self, file_path: str, content: Optional[bytes] = None) -> list:
+        """
+        Check a single file, using the result cache when enabled.
+
+        Args:
+            file_path (str): The file to check.
+            content (Optional[bytes]): The file's content if it was already
+                read, see :meth:`pipelined_results`.
+
+        Returns:
+            list: The error messages.
+        """
+        signature = self.signature
+        changed_lines = None
+        if self.changes is not None:
+            from lightdash_pre_commit.diff_scope import changed_lines_of
+
+            changed_lines = changed_lines_of(self.changes, file_path)
+            if not changed_lines:
+                return []
+            signature = f"{signature}|lines:{changed_lines}"
+
+        # Checking changed lines needs the whole file for positions
+        if self.streaming and changed_lines is None:
+            # A file that need not be parsed is checked as a file without
+            # models, so checks still start and finish
+            if self.prefilter and self.skippable(
+                file_path if content is None else content
+            ):
+                return self.check_schema(Schema(has_models=True))
+            key = None
+            if self.cache is not None:
+                with self.span("cache"):
+                    if content is None:
+                        key = self.cache.file_key(file_path, signature)
+                    else:
+                        key = self.cache.key(content, signature)
+                    errors = self.cache.get(key)
+                if errors is not None:
+                    return errors
+            # Reading, parsing and walking are interleaved when streaming
+            with self.span("stream"):
+                if content is None:
+                    with open(file_path, "rb") as file:
+                        errors = self.check_events(self.parser.parse(file))
+                else:
+                    # Named after the file, so parse errors read the same
+                    stream = io.BytesIO(content)
+                    stream.name = file_path
+                    errors = self.check_events(self.parser.parse(stream))
+        else:
+            if content is None:
+                with self.span("read"), open(file_path, "rb") as file:
+                    content = file.read()
+            if self.prefilter and self.skippable(content):
+                return self.check_schema(Schema(has_models=True))
+            key = None
+            if self.cache is not None:
+                with self.span("cache"):
+                    key = self.cache.key(content, signature)
+                    errors = self.cache.get(key)
+                if errors is not None:
+                    return errors
+            schema = None
+            if self.parse_cache is not None:
+                parse_key = self.parse_cache.key(content, self.parser.name)
+                schema = self.parse_cache.get(parse_key)
+            if schema is None:
+                # The parsed mappings are dropped as soon as they are normalized
+                with self.span("parse"):
+                    # Named after the file, so parse errors name it
+                    stream = io.BytesIO(content)
+                    stream.name = file_path
+                    schema = normalize(self.parser.load(stream))
+                if self.parse_cache is not None:
+                    self.parse_cache.put(parse_key, schema)
+            errors = self.check_schema(schema, changed_lines)
+
+        # Results cut short by the error limit are not complete
+        if key is not None and not (
+            self.max_errors is not None and count_errors(errors) >= self.remaining
+        ):
+            self.cache.put(key, errors)
+        return errors
+
+    def process_file(
+        self, file_path: str, content: Optional[bytes] = None
+    ) -> Tuple[list, Optional[str]]:
+        """
+        Check a single file without letting failures escape.
+
+        Args:
+            file_path (str): The file to check.
+            content (Optional[bytes]): The file's content if it was already
+                read.
+
+        Returns:
+            Tuple[list, Optional[str]]: The error messages and, if the file
+                could not be processed, the reason why.
+        """
+        self.summary = None
+        if self.collector is not None:
+            self.collector.definitions = []
+        try:
+            with self.span(file_path, "file"):
+                if self.fixer is not None:
+                    errors = self.fix_file(file_path, content)
+                else:
+                    errors = self.check_file(file_path, content)
+                failure = None
+        except Exception as e:
+            errors, failure = [], str(e)
+        if self.summaries is not None and self.summary is not None:
+            self.summaries[file_path] = self.summary
+        if self.definitions is not None:
+            self.definitions[file_path] = (
+                self.collector.definitions if failure is None else []
+            )
+        return errors, failure
+
+    def fix_file(self, file_path: str, content: Optional[bytes] = None) -> list:
+        """
+        Repair a file, then check it.
+
+        The repaired content is written once, and only after it was checked,
+        so a repair that leaves a file that cannot be parsed is dropped and
+        the original content is checked instead.
+
+        Args:
+            file_path (str): The file to repair and check.
+            content (Optional[bytes]): The file's content if it was already
+                read.
+
+        Returns:
+            list: The error messages left after the repairs.
+        """
+        if content is None:
+            with self.span("read"):
+                content = read_file(file_path)
+        with self.span("fix"):
+            fixed, count = self.fixer.fix(content)
+        if not count:
+            return self.check_file(file_path, content)
+        try:
+            errors = self.check_file(file_path, fixed)
+        except Exception:
+            return self.check_file(file_path, content)
+        with open(file_path, "wb") as file:
+            file.write(fixed)
+        self.fixed[file_path] = count
+        return errors
+
+    def pipelined_results(
+        self, filenames: Sequence[str]
+    ) -> Iterator[Tuple[str, list, Optional[str]]]:
+        """
+        Check files in-process while the next ones are read on threads.
+
+        At most ``read_ahead`` files are being read or waiting to be checked
+        at any time, which bounds the memory held in buffers. Parsing and
+        checking stay on the calling thread, so the output is the same as
+        a serial run.
+
+        Args:
+            filenames (Sequence[str]): The files to check.
+
+        Yields:
+            Tuple[str, list, Optional[str]]: See :meth:`results`.
+        """
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
+
+        files = iter(filenames)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.read_ahead) as executor:
+
+            def read_next() -> None:
+                for file_path in files:
+                    pending.append((file_path, executor.submit(read_file, file_path)))
+                    return
+
+            for _ in range(self.read_ahead):
+                read_next()
+            while pending:
+                file_path, future = pending.popleft()
+                read_next()
+                try:
+                    with self.span("read", file=file_path):
+                        content = future.result()
+                except Exception as e:
+                    yield file_path, [], str(e)
+                    continue
+                yield (file_path, *self.process_file(file_path, content))
+
+    def _process_in_worker(
+        self, file_path: str
+    ) -> Tuple[list, Optional[str], list, Optional[Summary], int, Optional[list]]:
+        errors, failure = self.process_file(file_path)
+        events = self.profiler.drain() if self.profiler is not None else []
+        summary = None
+        if self.summaries is not None:
+            summary = self.summaries.pop(file_path, None)
+        definitions = None
+        if self.definitions is not None:
+            definitions = self.definitions.pop(file_path)
+        fixed = self.fixed.pop(file_path, 0)
+        return errors, failure, events, summary, fixed, definitions
+
+    def results(
+        self, filenames: Sequence[str]
+    ) -> Iterator[Tuple[str, list, Optional[str]]]:
+        """
+        Check files, in parallel when there are enough of them.
+
+        Args:
+            filenames (Sequence[str]): The files to check.
+
+        Yields:
+            Tuple[str, list, Optional[str]]: The file, its error messages and
+                its failure reason, in the order the files were given.
+        """
+        workers = min(self.jobs, len(filenames) // MIN_FILES_PER_JOB)
+        # Files are checked in order so the run can stop at the error limit
+        # without workers parsing the files after it
+        if self.max_errors is not None:
+            workers = 1
+        if workers < 2 and self.read_ahead > 0 and len(filenames) > 1:
+            yield from self.pipelined_results(filenames)
+            return
+        if workers < 2:
+            for file_path in filenames:
+                yield (file_path, *self.process_file(file_path))
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, len(filenames) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                self._process_in_worker, filenames, chunksize=chunksize
+            )
+            for file_path, (
+                errors,
+                failure,
+                events,
+                summary,
+                fixed,
+                definitions,
+            ) in zip(filenames, results):
+                if self.profiler is not None:
+                    self.profiler.events.extend(events)
+                if summary is not None:
+                    self.summaries[file_path] = summary
+                if fixed:
+                    self.fixed[file_path] = fixed
+                if definitions is not None:
+                    self.definitions[file_path] = definitions
+                yield file_path, errors, failure
+        # Workers write to the cache without telling this process
+        if self.cache is not None:
+            self.cache.dirty = True
+
+    def manifest_results(
+        self, filenames: Sequence[str]
+    ) -> Iterator[Tuple[str, list, Optional[str]]]:
+        """
+        Check the models of a dbt manifest, grouped by their schema file.
+
+        Args:
+            filenames (Sequence[str]): Only check models from these files, or
+                every model when empty.
+
+        Yields:
+            Tuple[str, list, Optional[str]]: The schema file, relative to the
+                current directory, its error messages and its failure reason.
+                A manifest that cannot be read is reported as a failure of the
+                manifest itself.
+        """
+        from lightdash_pre_commit.manifest import default_project_root
+        from lightdash_pre_commit.manifest import load_manifest_models
+
+        try:
+            with self.span("manifest", file=self.manifest):
+                files = load_manifest_models(self.manifest, self.manifest_streaming)
+        except Exception as e:
+            yield self.manifest, [], str(e)
+            return
+
+        # Manifest paths are relative to the dbt project, which need not be
+        # the current directory
+        root = self.manifest_project_root or default_project_root(self.manifest)
+        files = {
+            os.path.relpath(os.path.join(root, file_path)): data
+            for file_path, data in files.items()
+        }
+        if filenames:
+            wanted = {os.path.realpath(file_path) for file_path in filenames}
+            files = {
+                file_path: data
+                for file_path, data in files.items()
+                if os.path.realpath(file_path) in wanted
+            }
+            if not files:
+                print(
+                    f"None of the given files define models in '{self.manifest}' "
+                    f"with the dbt project at '{root}'. Use --manifest-project-root "
+                    f"if the project is elsewhere.",
+                    file=sys.stderr,
+                )
+        for file_path, data in files.items():
+            self.summary = None
+            try:
+                with self.span(file_path, "file"):
+                    errors, failure = self.check_data(data), None
+            except Exception as e:
+                errors, failure = [], str(e)
+            if self.summaries is not None and self.summary is not None:
+                self.summaries[file_path] = self.summary
+            yield file_path, errors, failure
+
+    def reporter(self, filenames: Sequence[str] = ()) -> Reporter:
+        """
+        Create the reporter of the output format, writing to stdout, or the
+        writer of a shard's partial results.
+
+        Args:
+            filenames (Sequence[str]): Every file given to the run, in order.
+
+        Returns:
+            Reporter: The reporter, not started yet.
+        """
+        from lightdash_pre_commit.project_index import PROJECT_DUPLICATES_RULE
+
+        rules = [check.name for check in self.checks if check is not self.collector]
+        if self.project_index is not None and PROJECT_DUPLICATES_RULE not in rules:
+            rules.append(PROJECT_DUPLICATES_RULE)
+        rules.append(FAILURE_RULE)
+        if self.shard_output is not None:
+            from lightdash_pre_commit.shards import PartialResults
+
+            return PartialResults(
+                self.shard_output,
+                self.shard or (1, 1),
+                rules,
+                self.signature,
+                filenames,
+                self.definitions,
+                self.project_index,
+            )
+        return get_reporter(self.output_format, sys.stdout, rules)
+
+    def run(self, filenames: Sequence[str]) -> int:
+        """
+        Check each file, print its errors and return the hook exit code.
+
+        Args:
+            filenames (Sequence[str]): The files to check.
+
+        Returns:
+            int: 1 if any file had errors, failed to process or was changed
+                by --fix, 0 otherwise. Warnings alone do not fail the hook.
+
+        With an error limit, the remaining files are not checked once that
+        many errors are reported, counting failures to process a file.
+
+        With a shard, only the shard's files are checked. A shard writing
+        partial results exits with 0 once they are written, or 2 if they
+        cannot be, and ``lightdash-check merge`` gives the exit code.
+        """
+        if self.profiler is not None:
+            self.profiler.start()
+
+        reporter = self.reporter(filenames)
+        given = filenames
+        if self.shard is not None:
+            filenames = select_shard(filenames, self.shard)
+
+        if self.manifest is not None:
+            results = self.manifest_results(filenames)
+        else:
+            results = self.results(filenames)
+
+        reporter.start()
+        error_flag = False
+        self.remaining = self.max_errors
+        stopped = False
+        for file_path, errors, failure in results:
+            if self.max_errors is not None:
+                errors = within_limit(errors, self.remaining)
+                self.remaining -= count_errors(errors) + (failure is not None)
+            with self.span("report", file=file_path):
+                reporter.file(file_path, errors, failure)
+            if any(error.severity == "error" for error in errors):
+                error_flag = True
+            if failure is not None:
+                error_flag = True
+            fixed = self.fixed.pop(file_path, 0)
+            if fixed:
+                print(f"Fixed {fixed} issue(s) in '{file_path}'", file=sys.stderr)
+                error_flag = True
+            if self.max_errors is not None and self.remaining <= 0:
+                # Closing the generator stops reading further files
+                results.close()
+                stopped = True
+                break
+
+        # A shard writes the names its files and its share of the project's
+        # other files define instead, and the merge looks for names defined in
+        # several files
+        if self.project_index is not None and self.collector is not None:
+            from lightdash_pre_commit.shards import project_definitions
+
+            with self.span("project-index"):
+                reporter.project_files = project_definitions(
+                    self.project_index, self.parser, given, self.shard or (1, 1)
+                )
+        elif self.project_index is not None and not stopped:
+            with self.span("project-index"):
+                project_errors = list(self.project_index.check(self.parser, filenames))
+            for file_path, errors in project_errors:
+                reporter.file(file_path, errors, None)
+                error_flag = True
+        reporter.finish()
+        if stopped:
+            print(
+                f"Stopped after {self.max_errors} error(s), the remaining files "
+                f"were not checked.",
+                file=sys.stderr,
+            )
+
+        if self.cache is not None and self.cache.dirty:
+            self.cache.evict()
+
+        if self.summaries is not None:
+            from lightdash_pre_commit.stats import format_summaries
+
+            print(format_summaries(self.summaries), file=sys.stderr)
+
+        if self.profiler is not None:
+            print(self.profiler.stop(), file=sys.stderr)
+
+        if self.shard_output is not None:
+            return 2 if reporter.failed else 0
+
+        if error_flag:
+            return 1
+
+        return 0
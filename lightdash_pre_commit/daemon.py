@@ -0,0 +1,405 @@
+import contextlib
+import hashlib
+import importlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Sequence
+
+DISABLE_ENV_VAR = "LIGHTDASH_PRECOMMIT_NO_DAEMON"
+
+# Environment variables that change a hook's behaviour and are forwarded
+# with each request.
+FORWARDED_ENV_VARS = ("LIGHTDASH_PRECOMMIT_PROFILE",)
+
+# Every variable starting with this is forwarded too, so git commands run by
+# a hook, such as ``git diff --cached`` for --diff-scope, see the client's
+# index, repository and configuration rather than the daemon's.
+FORWARDED_ENV_PREFIX = "GIT_"
+
+# Shut down after this many seconds without a request.
+DEFAULT_IDLE_TIMEOUT = 15 * 60
+
+# How long a client waits for the daemon to accept before running in-process.
+CONNECT_TIMEOUT = 0.5
+
+# How long a client waits for any data from the daemon before giving up on it
+# and running in-process. The daemon sends a keepalive more often than this
+# while a hook runs or waits for another to finish, so only a wedged daemon
+# hits the timeout.
+REPLY_TIMEOUT = 10.0
+KEEPALIVE_INTERVAL = 2.0
+
+# How often the daemon wakes up to see if it should stop.
+STOP_POLL_INTERVAL = 0.5
+
+# Modules whose main() the daemon runs on behalf of a client.
+HOOK_MODULES = (
+    "lightdash_pre_commit.check_duplicate_metric_dimension_names",
+    "lightdash_pre_commit.check_naming_conventions",
+    "lightdash_pre_commit.find_incorrect_indentation_of_dims_and_metrics",
+    "lightdash_pre_commit.find_missing_dimension_group_labels",
+    "lightdash_pre_commit.find_missing_metric_group_labels",
+    "lightdash_pre_commit.find_missing_model_group_labels",
+    "lightdash_pre_commit.lightdash_check",
+)
+
+# True while the daemon runs a hook, so the hook does not forward back to the
+# daemon that is running it.
+_serving = False
+
+
+def socket_directory() -> str:
+    """
+    Get the directory holding the daemon sockets of the current user.
+
+    Returns:
+        str: ``$XDG_RUNTIME_DIR`` when set, otherwise a per-user directory in
+            the temporary directory.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "lightdash-precommit")
+    return os.path.join(tempfile.gettempdir(), f"lightdash-precommit-{os.getuid()}")
+
+
+def socket_path(root: Optional[str] = None) -> str:
+    """
+    Get the socket of the daemon serving a repository.
+
+    Args:
+        root (Optional[str]): The repository root. Defaults to the current
+            directory, where pre-commit runs hooks.
+
+    Returns:
+        str: A path unique to the user and the repository. Kept short because
+            of the length limit on Unix socket paths.
+    """
+    root = os.path.realpath(root or os.getcwd())
+    digest = hashlib.sha256(root.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(socket_directory(), f"{digest}.sock")
+
+
+def _is_private(path: str, mode_type: int) -> bool:
+    # Owned by the current user and not writable by anyone else, so another
+    # user cannot stand in for the daemon
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return (
+        stat.S_IFMT(info.st_mode) == mode_type
+        and info.st_uid == os.getuid()
+        and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    )
+
+
+def code_fingerprint() -> str:
+    """
+    Identify the installed code, so a daemon started before an upgrade or an
+    edit of the package is not used.
+
+    Returns:
+        str: A digest of the package's source file names, sizes and
+            modification times.
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for entry in sorted(os.scandir(package_dir), key=lambda entry: entry.name):
+        if entry.name.endswith(".py"):
+            info = entry.stat()
+            digest.update(f"{entry.name}:{info.st_size}:{info.st_mtime_ns};".encode())
+    return digest.hexdigest()
+
+
+def _exchange(path: str, request: dict) -> Optional[dict]:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(CONNECT_TIMEOUT)
+            client.connect(path)
+            # Each chunk, keepalives included, restarts the timeout
+            client.settimeout(REPLY_TIMEOUT)
+            client.sendall(json.dumps(request).encode("utf-8"))
+            client.shutdown(socket.SHUT_WR)
+            chunks = []
+            for chunk in iter(lambda: client.recv(65536), b""):
+                chunks.append(chunk)
+        return json.loads(b"".join(chunks))
+    except (OSError, ValueError):
+        # socket.timeout is an OSError
+        return None
+
+
+def forwarded_env() -> Dict[str, Optional[str]]:
+    """
+    Get the environment variables a client sends with its request.
+
+    Returns:
+        Dict[str, Optional[str]]: Each of ``FORWARDED_ENV_VARS``, None when
+            unset, and every variable starting with ``FORWARDED_ENV_PREFIX``.
+    """
+    env = {name: os.environ.get(name) for name in FORWARDED_ENV_VARS}
+    for name, value in os.environ.items():
+        if name.startswith(FORWARDED_ENV_PREFIX):
+            env[name] = value
+    return env
+
+
+def forward(module: str, argv: Optional[Sequence[str]] = None) -> Optional[int]:
+    """
+    Run a hook in the daemon serving the current repository, if there is one.
+
+    Args:
+        module (str): The hook's module, one of ``HOOK_MODULES``.
+        argv (Optional[Sequence[str]]): The hook's arguments. Defaults to
+            ``sys.argv[1:]``.
+
+    Returns:
+        Optional[int]: The hook's exit code after printing its output, or
+            None if the hook should run in-process because no daemon is
+            running, the daemon is stale, slow to answer or failed.
+    """
+    if _serving or not hasattr(socket, "AF_UNIX"):
+        return None
+    if os.environ.get(DISABLE_ENV_VAR, "") not in ("", "0"):
+        return None
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if "--daemon" in argv:
+        return None
+
+    path = socket_path()
+    if not _is_private(os.path.dirname(path), stat.S_IFDIR) or not _is_private(
+        path, stat.S_IFSOCK
+    ):
+        return None
+    response = _exchange(
+        path,
+        {
+            "fingerprint": code_fingerprint(),
+            "cwd": os.path.realpath(os.getcwd()),
+            "module": module,
+            "argv": argv,
+            "env": forwarded_env(),
+        },
+    )
+    if response is None or "exit_code" not in response:
+        return None
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit_code"]
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.read())
+        except ValueError:
+            return
+
+        # Whitespace before the JSON reply keeps the client waiting while a
+        # long hook runs, or while it waits for the hooks of other clients
+        done = threading.Event()
+
+        def keepalive():
+            while not done.wait(KEEPALIVE_INTERVAL):
+                with contextlib.suppress(OSError):
+                    self.wfile.write(b" ")
+
+        thread = threading.Thread(target=keepalive, daemon=True)
+        thread.start()
+        try:
+            response = self.server.run_request(request)
+        finally:
+            done.set()
+            thread.join()
+        self.wfile.write(json.dumps(response).encode("utf-8"))
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serve hook runs over a Unix socket from a warm interpreter.
+
+    Each connection is handled in its own thread, so clients started at once,
+    such as the hook batches of a parallel pre-commit run, all get keepalives.
+    The hooks themselves run one at a time, so each run can own the process's
+    stdout, stderr and environment. Parsed files are kept in a
+    :class:`ParseCache` shared by every run. The server stops after
+    ``idle_timeout`` seconds without a request, and as soon as a client with
+    different code or a different repository connects.
+    """
+
+    def __init__(self, path: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        from lightdash_pre_commit.cache import ParseCache
+        from lightdash_pre_commit.core import Core
+
+        self.fingerprint = code_fingerprint()
+        self.cwd = os.path.realpath(os.getcwd())
+        self.idle_timeout = idle_timeout
+        self.timeout = min(idle_timeout, STOP_POLL_INTERVAL)
+        self.stopped = False
+        self.last_request = time.monotonic()
+        # Restored after each hook run
+        self.environ = dict(os.environ)
+        # Held while a hook runs
+        self.lock = threading.Lock()
+        # Connections being handled
+        self.active = 0
+        self.active_lock = threading.Lock()
+        Core.parse_cache = ParseCache()
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def process_request(self, request, client_address) -> None:
+        # Counted before the thread starts, so a request that is just being
+        # picked up does not look idle
+        with self.active_lock:
+            self.active += 1
+        super().process_request(request, client_address)
+
+    def process_request_thread(self, request, client_address) -> None:
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            with self.active_lock:
+                self.active -= 1
+                self.last_request = time.monotonic()
+
+    def handle_timeout(self) -> None:
+        # Requests in progress keep the daemon up however long they take
+        if not self.active and (
+            time.monotonic() - self.last_request >= self.idle_timeout
+        ):
+            self.stopped = True
+
+    def client_environ(self, env: Dict[str, Optional[str]]) -> Dict[str, str]:
+        # The daemon's own environment with the variables a client forwarded,
+        # its git variables in place of the daemon's
+        environ = {
+            name: value
+            for name, value in self.environ.items()
+            if not name.startswith(FORWARDED_ENV_PREFIX)
+        }
+        for name, value in env.items():
+            if name not in FORWARDED_ENV_VARS and not name.startswith(
+                FORWARDED_ENV_PREFIX
+            ):
+                continue
+            if value is None:
+                environ.pop(name, None)
+            else:
+                environ[name] = value
+        return environ
+
+    def set_environ(self, environ: Dict[str, str]) -> None:
+        for name in set(os.environ) - set(environ):
+            del os.environ[name]
+        os.environ.update(environ)
+
+    def run_request(self, request: dict) -> dict:
+        if request.get("ping"):
+            return {"pong": True}
+        if request.get("fingerprint") != self.fingerprint or request.get("cwd") != (
+            self.cwd
+        ):
+            self.stopped = True
+            return {"error": "The daemon is stale."}
+        if request.get("module") not in HOOK_MODULES:
+            return {"error": f"Unknown hook module '{request.get('module')}'."}
+
+        main = importlib.import_module(request["module"]).main
+        with self.lock:
+            self.set_environ(self.client_environ(request.get("env", {})))
+            try:
+                return self.run_hook(main, request["argv"])
+            finally:
+                self.set_environ(self.environ)
+
+    def run_hook(self, main: Callable, argv: Sequence[str]) -> dict:
+        global _serving
+
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        _serving = True
+        try:
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                exit_code = main(argv)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception:
+            # Let the client run the hook itself rather than fail the commit
+            traceback.print_exc()
+            return {"error": "The hook failed in the daemon."}
+        finally:
+            _serving = False
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+    def serve(self) -> None:
+        while not self.stopped:
+            self.handle_request()
+
+
+def serve(idle_timeout: Optional[float] = None) -> int:
+    """
+    Run the daemon for the repository in the current directory until it is
+    idle for ``idle_timeout`` seconds or becomes stale.
+
+    Args:
+        idle_timeout (Optional[float]): Seconds without a request before
+            shutting down. Defaults to ``DEFAULT_IDLE_TIMEOUT``.
+
+    Returns:
+        int: The exit code, 1 if the daemon could not start.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        print("The daemon needs Unix domain sockets", file=sys.stderr)
+        return 1
+
+    path = socket_path()
+    directory = os.path.dirname(path)
+    with contextlib.suppress(FileExistsError):
+        os.makedirs(directory, mode=0o700)
+    if not _is_private(directory, stat.S_IFDIR):
+        print(
+            f"Refusing to use '{directory}', it must be a directory only the "
+            f"current user can write to",
+            file=sys.stderr,
+        )
+        return 1
+    if os.path.exists(path):
+        if _exchange(path, {"ping": True}) is not None:
+            print(f"A daemon is already listening on '{path}'", file=sys.stderr)
+            return 1
+        # Left behind by a daemon that was killed
+        os.remove(path)
+
+    if idle_timeout is None:
+        idle_timeout = DEFAULT_IDLE_TIMEOUT
+    server = DaemonServer(path, idle_timeout)
+    print(f"Listening on '{path}'", file=sys.stderr)
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.remove(path)
+    return 0
@@ -0,0 +1,122 @@
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from lightdash_pre_commit.positions import Position
+
+# Errors fail the hook, warnings are only printed.
+SEVERITIES = ("error", "warning")
+
+
+class Diagnostic(str):
+    """
+    An error message reported by a check, with its source position.
+
+    Diagnostics compare and print like their message, so callers that only
+    care about the text can treat them as plain strings. ``occurrences``
+    lists every position involved when an error concerns several nodes, such
+    as a duplicated name. ``severity`` is one of ``SEVERITIES``. ``rule`` is
+    the id of the check that reported it, and ``model`` and ``node`` name the
+    model and the dimension, metric or column it is about, when known.
+    """
+
+    def __new__(
+        cls,
+        message: str,
+        line: Optional[int] = None,
+        column: Optional[int] = None,
+        occurrences: Sequence[Position] = (),
+        severity: str = "error",
+        rule: Optional[str] = None,
+        model: Optional[str] = None,
+        node: Optional[str] = None,
+    ):
+        diagnostic = super().__new__(cls, message)
+        diagnostic.line = line
+        diagnostic.column = column
+        diagnostic.occurrences = [tuple(occurrence) for occurrence in occurrences]
+        diagnostic.severity = severity
+        diagnostic.rule = rule
+        diagnostic.model = model
+        diagnostic.node = node
+        return diagnostic
+
+    @property
+    def message(self) -> str:
+        return str.__str__(self)
+
+    def location(self, file_path: str) -> str:
+        """
+        Format the position of the diagnostic.
+
+        Args:
+            file_path (str): The file the diagnostic was found in.
+
+        Returns:
+            str: ``path:line:column``, or just the path if the position is
+                unknown.
+        """
+        return format_location(file_path, (self.line, self.column))
+
+    def format(self, file_path: str) -> str:
+        """
+        Format the diagnostic as a line of hook output.
+
+        Args:
+            file_path (str): The file the diagnostic was found in.
+
+        Returns:
+            str: The location followed by the message, and every occurrence
+                when there is more than one. Warnings are marked as such.
+        """
+        text = self.message
+        if self.severity != "error":
+            text = f"{self.severity}: {text}"
+        if self.line is not None:
+            text = f"{self.location(file_path)}: {text}"
+        if len(self.occurrences) > 1:
+            locations = ", ".join(
+                format_location(file_path, occurrence)
+                for occurrence in self.occurrences
+            )
+            text = f"{text} Defined at: {locations}."
+        return text
+
+    def to_dict(self) -> dict:
+        return {
+            "message": self.message,
+            "line": self.line,
+            "column": self.column,
+            "occurrences": self.occurrences,
+            "severity": self.severity,
+            "rule": self.rule,
+            "model": self.model,
+            "node": self.node,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Diagnostic":
+        return cls(
+            data["message"],
+            data["line"],
+            data["column"],
+            data["occurrences"],
+            data["severity"],
+            data["rule"],
+            data["model"],
+            data["node"],
+        )
+
+
+def format_location(file_path: str, position: Position) -> str:
+    line, column = position
+    if line is None:
+        return file_path
+    return f"{file_path}:{line}:{column}"
+
+
+def to_diagnostics(errors: List[str]) -> List[Diagnostic]:
+    return [
+        error if isinstance(error, Diagnostic) else Diagnostic(error)
+        for error in errors
+    ]
@@ -0,0 +1,158 @@
+import os
+import re
+import sys
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from lightdash_pre_commit.core import visit_column_nodes
+from lightdash_pre_commit.core import visit_model_nodes
+from lightdash_pre_commit.nodes import Schema
+from lightdash_pre_commit.positions import Located
+from lightdash_pre_commit.positions import position_of
+
+# First and last changed line of a hunk, 1-based and inclusive.
+LineRange = Tuple[int, int]
+
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+# Lines past the end of any file, used as the end of the last node.
+END_OF_FILE = sys.maxsize
+
+
+def parse_diff(diff: str) -> Dict[str, List[LineRange]]:
+    """
+    Get the changed lines of each file from a unified diff.
+
+    Args:
+        diff (str): Output of ``git diff --no-prefix -U0``.
+
+    Returns:
+        Dict[str, List[LineRange]]: The changed line ranges of the new version
+            of each file, keyed by normalized path. A hunk that only deletes
+            lines covers the lines on either side of the deletion.
+    """
+    changes: Dict[str, List[LineRange]] = {}
+    ranges = None
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            path = line[4:]
+            if path == "/dev/null":
+                ranges = None
+            else:
+                ranges = changes.setdefault(os.path.normpath(path), [])
+            continue
+        match = HUNK_HEADER.match(line)
+        if match is None or ranges is None:
+            continue
+        start = int(match.group(1))
+        count = 1 if match.group(2) is None else int(match.group(2))
+        if count == 0:
+            ranges.append((max(start, 1), start + 1))
+        else:
+            ranges.append((start, start + count - 1))
+    return changes
+
+
+def staged_changes(filenames: Sequence[str]) -> Optional[Dict[str, List[LineRange]]]:
+    """
+    Get the staged changes of files from git.
+
+    Args:
+        filenames (Sequence[str]): The files, relative to the current
+            directory.
+
+    Returns:
+        Optional[Dict[str, List[LineRange]]]: See :func:`parse_diff`, with
+            paths relative to the current directory. None if git failed, for
+            example outside a repository.
+    """
+    import subprocess
+
+    try:
+        output = subprocess.run(
+            [
+                "git",
+                "diff",
+                "--cached",
+                "--no-prefix",
+                "--no-color",
+                "--no-ext-diff",
+                "--relative",
+                "-U0",
+                "--",
+                *filenames,
+            ],
+            capture_output=True,
+            check=True,
+        ).stdout.decode("utf-8", errors="replace")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return parse_diff(output)
+
+
+def changed_lines_of(
+    changes: Dict[str, List[LineRange]], file_path: str
+) -> List[LineRange]:
+    """
+    Look up the changed lines of a file.
+
+    Args:
+        changes (Dict[str, List[LineRange]]): See :func:`staged_changes`.
+        file_path (str): The file, as given on the command line.
+
+    Returns:
+        List[LineRange]: The changed line ranges, empty if the file has no
+            staged changes.
+    """
+    return changes.get(os.path.normpath(os.path.relpath(file_path)), [])
+
+
+def _overlaps(ranges: Sequence[LineRange], start: Optional[int], end: int) -> bool:
+    # Nodes without a position cannot be placed, so they are always checked
+    if start is None:
+        return True
+    return any(first <= end and last >= start for first, last in ranges)
+
+
+def _spans(nodes: list, end: int) -> Iterator[Tuple[Located, Optional[int], int]]:
+    # Each node reaches up to the line before the next one starts
+    starts = [position_of(node)[0] for node in nodes]
+    for i, node in enumerate(nodes):
+        next_start = starts[i + 1] if i + 1 < len(nodes) else None
+        yield node, starts[i], end if next_start is None else next_start - 1
+
+
+def walk_changed(
+    schema: Schema,
+    ranges: Sequence[LineRange],
+    dispatch: Dict[str, List[Callable]],
+    model_scope_dispatch: Dict[str, List[Callable]],
+) -> None:
+    """
+    Dispatch only the nodes of a schema file that enclose changed lines.
+
+    Every model holding a changed line is visited. Its changed columns are
+    dispatched to every check, and its other columns only to the checks that
+    need the whole model, such as duplicate detection.
+
+    Args:
+        schema (Schema): The normalized dbt schema file.
+        ranges (Sequence[LineRange]): The changed lines.
+        dispatch (Dict[str, List[Callable]]): Visitor methods of every check.
+        model_scope_dispatch (Dict[str, List[Callable]]): Visitor methods of
+            the checks whose ``diff_scope`` is "model".
+    """
+    for model, start, end in _spans(schema.models, END_OF_FILE):
+        if not _overlaps(ranges, start, end):
+            continue
+        visit_model_nodes(model, dispatch)
+        for column, column_start, column_end in _spans(model.columns, end):
+            if _overlaps(ranges, column_start, column_end):
+                visit_column_nodes(model, column, dispatch)
+            else:
+                visit_column_nodes(model, column, model_scope_dispatch)
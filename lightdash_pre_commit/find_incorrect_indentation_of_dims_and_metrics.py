@@ -1,43 +1,67 @@
 import argparse
+from typing import FrozenSet
 from typing import Optional
 from typing import Sequence
 
-import yaml
+from lightdash_pre_commit.core import add_core_arguments
+from lightdash_pre_commit.core import Check
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.core import forward_or_skip
+from lightdash_pre_commit.nodes import AdditionalDimension
+from lightdash_pre_commit.nodes import Column
+from lightdash_pre_commit.nodes import Dimension
+from lightdash_pre_commit.nodes import Model
+from lightdash_pre_commit.nodes import Schema
+
+
+class IndentationCheck(Check):
+    name = "find_incorrect_indentation_of_dims_and_metrics"
+
+    def applies_to(self, schema: Schema) -> bool:
+        summary = schema.summary
+        return summary.dimensions + summary.additional_dimensions > 0
+
+    def may_report(self, keys: FrozenSet[str]) -> bool:
+        return "dimension" in keys
+
+    def visit_dimension(
+        self, model: Model, column: Column, dimension: Dimension
+    ) -> None:
+        # Check additional_dimensions under dimension
+        if dimension.nested_additional_dimensions is not None:
+            self.report(
+                f"Incorrect indent: 'additional_dimensions' should not be a child of 'dimension' "
+                f"for column: {column.name}.",
+                dimension.nested_additional_dimensions,
+                model=model,
+                name=column.name,
+            )
+
+        # Check metrics under dimension
+        if dimension.nested_metrics is not None:
+            self.report(
+                f"Incorrect indent: 'metrics' should not be a child of 'dimension' for column:"
+                f" {column.name}.",
+                dimension.nested_metrics,
+                model=model,
+                name=column.name,
+            )
+
+    # Check metrics under additional_dimensions
+    def visit_additional_dimension(
+        self, model: Model, column: Column, dimension: AdditionalDimension
+    ) -> None:
+        if dimension.name == "metrics":
+            self.report(
+                f"Incorrect indent: 'metrics' should not be a child of "
+                f"'additional_dimensions' at key '{dimension.name}' in column: {column.name}.",
+                dimension,
+                model=model,
+            )
 
 
 def find_indentation_issues(data: dict) -> list:
-    errors = []
-
-    for model in data.get("models", []):
-        for column in model.get("columns", []):
-            if "meta" in column:
-                # Check additional_dimensions under dimension
-                if "dimension" in column["meta"]:
-                    if "additional_dimensions" in column["meta"]["dimension"]:
-                        errors.append(
-                            f"Incorrect indent: 'additional_dimensions' should not be a child of 'dimension' "
-                            f"for column: {column.get('name')}."
-                        )
-
-                    # Check metrics under dimension
-                    if "metrics" in column["meta"]["dimension"]:
-                        errors.append(
-                            f"Incorrect indent: 'metrics' should not be a child of 'dimension' for column:"
-                            f" {column.get('name')}."
-                        )
-
-                # Check metrics under additional_dimensions
-                if "additional_dimensions" in column["meta"]:
-                    for ad_key, ad_value in column["meta"][
-                        "additional_dimensions"
-                    ].items():
-                        if ad_key == "metrics":
-                            errors.append(
-                                f"Incorrect indent: 'metrics' should not be a child of "
-                                f"'additional_dimensions' at key '{ad_key}' in column: {column.get('name')}."
-                            )
-
-    return errors
+    return Core([IndentationCheck()]).check_data(data)
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
@@ -45,27 +69,19 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     parser.add_argument(
         "filenames", nargs="*", help="Filenames to check for indentation correctness"
     )
+    add_core_arguments(parser)
     args = parser.parse_args(argv)
 
-    error_flag = False
-    for file_path in args.filenames:
-        try:
-            with open(file_path, "r") as file:
-                data = yaml.safe_load(file)
-                errors = find_indentation_issues(data)
-                if errors:
-                    print(f"Errors found in '{file_path}':")
-                    for error in errors:
-                        print(error)
-                    error_flag = True
-        except Exception as e:
-            print(f"Failed to process '{file_path}': {e}")
-            error_flag = True
-
-    if error_flag:
-        return 1
-
-    return 0
+    exit_code = forward_or_skip(
+        "lightdash_pre_commit.find_incorrect_indentation_of_dims_and_metrics",
+        argv,
+        args,
+    )
+    if exit_code is not None:
+        return exit_code
+
+    checks = [IndentationCheck()]
+    return Core.from_args(checks, args).run(args.filenames)
 
 
 if __name__ == "__main__":
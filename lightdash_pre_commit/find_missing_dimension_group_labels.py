@@ -1,47 +1,86 @@
 import argparse
+from typing import FrozenSet
 from typing import Optional
 from typing import Sequence
+from typing import Union
 
-import yaml
-
-
-def find_missing_group_labels(data: dict) -> list:
-    errors = []
-
-    for model in data.get("models", []):
-        # Check metrics and dimensions inside each column
-        for column in model.get("columns", []):
-            if "meta" in column:
-                # Check primary dimension
-                if "dimension" in column["meta"]:
-                    dimension_details = column["meta"]["dimension"]
-                    if (
-                        not dimension_details.get("hidden", False)
-                        and not dimension_details.get("skip_group_label", False)
-                        and "group_label" not in dimension_details
-                        and "groups" not in dimension_details
-                    ):
-                        errors.append(
-                            f"Missing 'group_label' or 'groups' in dimension of column '{column.get('name')}'."
-                        )
-
-                # Check additional dimensions
-                if "additional_dimensions" in column["meta"]:
-                    for dimension_name, dim_details in column["meta"][
-                        "additional_dimensions"
-                    ].items():
-                        if (
-                            not dim_details.get("hidden", False)
-                            and not dim_details.get("skip_group_label", False)
-                            and "group_label" not in dim_details
-                            and "groups" not in dim_details
-                        ):
-                            errors.append(
-                                f"Missing 'group_label' or 'groups' in additional dimension '{dimension_name}' "
-                                f"in column '{column.get('name')}'."
-                            )
-
-    return errors
+from lightdash_pre_commit.core import add_core_arguments
+from lightdash_pre_commit.core import Check
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.core import forward_or_skip
+from lightdash_pre_commit.labels import add_label_arguments
+from lightdash_pre_commit.labels import LabelRegistry
+from lightdash_pre_commit.labels import registry_from_args
+from lightdash_pre_commit.nodes import AdditionalDimension
+from lightdash_pre_commit.nodes import Column
+from lightdash_pre_commit.nodes import Dimension
+from lightdash_pre_commit.nodes import Field
+from lightdash_pre_commit.nodes import Model
+from lightdash_pre_commit.nodes import Schema
+
+
+class MissingDimensionGroupLabelsCheck(Check):
+    name = "find_missing_dimension_group_labels"
+
+    def __init__(
+        self, allowed_labels: Union[LabelRegistry, Sequence[str], None] = None
+    ):
+        super().__init__()
+        self.allowed_labels = LabelRegistry.of(allowed_labels)
+
+    def signature(self) -> str:
+        if self.allowed_labels is None:
+            return self.name
+        return f"{self.name}:{self.allowed_labels.signature()}"
+
+    def applies_to(self, schema: Schema) -> bool:
+        summary = schema.summary
+        return summary.dimensions + summary.additional_dimensions > 0
+
+    def may_report(self, keys: FrozenSet[str]) -> bool:
+        return "dimension" in keys
+
+    # Check primary dimension
+    def visit_dimension(
+        self, model: Model, column: Column, dimension: Dimension
+    ) -> None:
+        self.check_dimension(model, dimension, f"dimension of column '{column.name}'")
+
+    # Check additional dimensions
+    def visit_additional_dimension(
+        self, model: Model, column: Column, dimension: AdditionalDimension
+    ) -> None:
+        self.check_dimension(
+            model,
+            dimension,
+            f"additional dimension '{dimension.name}' in column '{column.name}'",
+        )
+
+    def check_dimension(self, model: Model, dimension: Field, what: str) -> None:
+        if dimension.hidden or dimension.skip_group_label:
+            return
+        if not dimension.labelled:
+            self.report(
+                f"Missing 'group_label' or 'groups' in {what}.", dimension, model=model
+            )
+        elif (
+            self.allowed_labels is not None
+            and dimension.group_label is not None
+            and dimension.group_label not in self.allowed_labels
+        ):
+            self.report(
+                f"Invalid 'group_label' '{dimension.group_label}' in {what}. "
+                f"{self.allowed_labels.hint(dimension.group_label)}",
+                dimension,
+                model=model,
+            )
+
+
+def find_missing_group_labels(
+    data: dict, allowed_labels: Union[LabelRegistry, Sequence[str], None] = None
+) -> list:
+    check = MissingDimensionGroupLabelsCheck(allowed_labels)
+    return Core([check]).check_data(data)
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
@@ -51,27 +90,22 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         nargs="*",
         help="Check YAML files for missing 'group_label' in dimensions",
     )
+    add_label_arguments(parser, "dimension group labels")
+    add_core_arguments(parser)
     args = parser.parse_args(argv)
 
-    error_flag = False
-    for file_path in args.filenames:
-        try:
-            with open(file_path, "r") as file:
-                data = yaml.safe_load(file)
-                errors = find_missing_group_labels(data)
-                if errors:
-                    print(f"Errors found in '{file_path}':")
-                    for error in errors:
-                        print(error)
-                    error_flag = True
-        except Exception as e:
-            print(f"Failed to process '{file_path}': {e}")
-            error_flag = True
-
-    if error_flag:
-        return 1
-
-    return 0
+    exit_code = forward_or_skip(
+        "lightdash_pre_commit.find_missing_dimension_group_labels", argv, args
+    )
+    if exit_code is not None:
+        return exit_code
+
+    checks = [
+        MissingDimensionGroupLabelsCheck(
+            registry_from_args(args.allowed_labels, args.allowed_labels_file)
+        )
+    ]
+    return Core.from_args(checks, args).run(args.filenames)
 
 
 if __name__ == "__main__":
@@ -1,43 +1,90 @@
 import argparse
+from typing import FrozenSet
 from typing import Optional
 from typing import Sequence
+from typing import Union
 
-import yaml
+from lightdash_pre_commit.core import add_core_arguments
+from lightdash_pre_commit.core import Check
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.core import forward_or_skip
+from lightdash_pre_commit.labels import add_label_arguments
+from lightdash_pre_commit.labels import LabelRegistry
+from lightdash_pre_commit.labels import registry_from_args
+from lightdash_pre_commit.nodes import Column
+from lightdash_pre_commit.nodes import Metric
+from lightdash_pre_commit.nodes import Model
+from lightdash_pre_commit.nodes import Schema
 
-from lightdash_pre_commit.utils import has_dimensions
-from lightdash_pre_commit.utils import has_metrics
 
+class MissingMetricGroupLabelsCheck(Check):
+    name = "find_missing_metric_group_labels"
 
-def find_missing_group_labels(data: dict) -> list:
-    errors = []
+    def __init__(
+        self,
+        skip_without_dimensions_and_metrics: bool = False,
+        allowed_labels: Union[LabelRegistry, Sequence[str], None] = None,
+    ):
+        super().__init__()
+        self.skip_without_dimensions_and_metrics = skip_without_dimensions_and_metrics
+        self.allowed_labels = LabelRegistry.of(allowed_labels)
 
-    for model in data.get("models", []):
-        # Check metrics at the model-level 'meta' tag
-        model_level_metrics = model.get("meta", {}).get("metrics", {})
-        for metric, details in model_level_metrics.items():
-            if (
-                "group_label" not in details
-                and "groups" not in details
-                and not details.get("skip_group_label", False)
-            ):
-                errors.append(
-                    f"Missing 'group_label' or 'groups' in model-level metric '{metric}'."
-                )
+    def signature(self) -> str:
+        labels = (
+            None if self.allowed_labels is None else self.allowed_labels.signature()
+        )
+        return f"{self.name}:{self.skip_without_dimensions_and_metrics}:{labels}"
 
-        # Check metrics within the columns' 'meta' tag
-        for column in model.get("columns", []):
-            if "meta" in column and "metrics" in column["meta"]:
-                for metric, details in column["meta"]["metrics"].items():
-                    if (
-                        "group_label" not in details
-                        and "groups" not in details
-                        and not details.get("skip_group_label", False)
-                    ):
-                        errors.append(
-                            f"Missing 'group_label' or 'groups' in column metric '{metric}'."
-                        )
+    def applies_to(self, schema: Schema) -> bool:
+        summary = schema.summary
+        if self.skip_without_dimensions_and_metrics:
+            # Only files of models are checked by the hook
+            if not schema.has_models:
+                raise ValueError("Unsupported dbt resource type")
+            # Skip files without dimensions or metrics, as the hook always has
+            if summary.dimensions + summary.additional_dimensions == 0:
+                return False
+        # Skip files without metrics, counting model-level ones
+        return summary.metrics > 0
 
-    return errors
+    def may_report(self, keys: FrozenSet[str]) -> bool:
+        if self.skip_without_dimensions_and_metrics:
+            return keys >= {"metrics", "dimension"}
+        return "metrics" in keys
+
+    # Check metrics at the model-level 'meta' tag
+    def visit_model_metric(self, model: Model, metric: Metric) -> None:
+        self.check_metric(model, metric, f"model-level metric '{metric.name}'")
+
+    # Check metrics within the columns' 'meta' tag
+    def visit_column_metric(self, model: Model, column: Column, metric: Metric) -> None:
+        self.check_metric(model, metric, f"column metric '{metric.name}'")
+
+    def check_metric(self, model: Model, metric: Metric, what: str) -> None:
+        if metric.skip_group_label:
+            return
+        if not metric.labelled:
+            self.report(
+                f"Missing 'group_label' or 'groups' in {what}.", metric, model=model
+            )
+        elif (
+            self.allowed_labels is not None
+            and metric.group_label is not None
+            and metric.group_label not in self.allowed_labels
+        ):
+            self.report(
+                f"Invalid 'group_label' '{metric.group_label}' in {what}. "
+                f"{self.allowed_labels.hint(metric.group_label)}",
+                metric,
+                model=model,
+            )
+
+
+def find_missing_group_labels(
+    data: dict, allowed_labels: Union[LabelRegistry, Sequence[str], None] = None
+) -> list:
+    check = MissingMetricGroupLabelsCheck(allowed_labels=allowed_labels)
+    return Core([check]).check_data(data)
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
@@ -47,31 +94,23 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         nargs="*",
         help="Check YAML files for missing 'group_label' or 'groups' in metrics",
     )
+    add_label_arguments(parser, "metric group labels")
+    add_core_arguments(parser)
     args = parser.parse_args(argv)
 
-    error_flag = False
-    for file_path in args.filenames:
-        try:
-            with open(file_path, "r") as file:
-                data = yaml.safe_load(file)
-                # Skip files without dimensions or metrics
-                if not has_dimensions(data) or not has_metrics(data):
-                    continue
-                # Check for missing group labels
-                errors = find_missing_group_labels(data)
-                if errors:
-                    print(f"Errors found in '{file_path}':")
-                    for error in errors:
-                        print(error)
-                    error_flag = True
-        except Exception as e:
-            print(f"Failed to process '{file_path}': {e}")
-            error_flag = True
-
-    if error_flag:
-        return 1
-
-    return 0
+    exit_code = forward_or_skip(
+        "lightdash_pre_commit.find_missing_metric_group_labels", argv, args
+    )
+    if exit_code is not None:
+        return exit_code
+
+    check = MissingMetricGroupLabelsCheck(
+        skip_without_dimensions_and_metrics=True,
+        allowed_labels=registry_from_args(
+            args.allowed_labels, args.allowed_labels_file
+        ),
+    )
+    return Core.from_args([check], args).run(args.filenames)
 
 
 if __name__ == "__main__":
@@ -1,61 +1,77 @@
 import argparse
-from typing import List
 from typing import Optional
 from typing import Sequence
+from typing import Union
 
-import yaml
+from lightdash_pre_commit.core import add_core_arguments
+from lightdash_pre_commit.core import Check
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.core import forward_or_skip
+from lightdash_pre_commit.labels import add_label_arguments
+from lightdash_pre_commit.labels import LabelRegistry
+from lightdash_pre_commit.labels import registry_from_args
+from lightdash_pre_commit.nodes import Model
 
 
-def find_missing_model_group_labels(
-    data: dict, allowed_labels: Optional[List[str]] = None
-) -> list:
-    errors = []
-
-    for model in data.get("models", []):
-        # Check model-level 'group_label' in meta
-        model_group_label = model.get("meta", {}).get("group_label")
-        if not model_group_label:
-            errors.append(f"Missing 'group_label' in model '{model['name']}' meta.")
-        elif allowed_labels and model_group_label not in allowed_labels:
-            errors.append(
-                f"Invalid 'group_label' '{model_group_label}' in model '{model['name']}'. Allowed labels are: "
-                f"{allowed_labels}."
+class MissingModelGroupLabelsCheck(Check):
+    name = "find_missing_model_group_labels"
+    # Only looks at the model mappings
+    cost = 0
+
+    def __init__(
+        self, allowed_labels: Union[LabelRegistry, Sequence[str], None] = None
+    ):
+        super().__init__()
+        self.allowed_labels = LabelRegistry.of(allowed_labels)
+
+    def signature(self) -> str:
+        if self.allowed_labels is None:
+            return f"{self.name}:None"
+        return f"{self.name}:{self.allowed_labels.signature()}"
+
+    # Check model-level 'group_label' in meta
+    def visit_model(self, model: Model) -> None:
+        if not model.group_label:
+            self.report(
+                f"Missing 'group_label' in model '{model.name}' meta.",
+                model,
+                model=model,
+            )
+        elif (
+            self.allowed_labels is not None
+            and model.group_label not in self.allowed_labels
+        ):
+            self.report(
+                f"Invalid 'group_label' '{model.group_label}' in model '{model.name}'. "
+                f"{self.allowed_labels.hint(model.group_label)}",
+                model.meta,
+                model=model,
             )
 
-    return errors
+
+def find_missing_model_group_labels(
+    data: dict, allowed_labels: Union[LabelRegistry, Sequence[str], None] = None
+) -> list:
+    return Core([MissingModelGroupLabelsCheck(allowed_labels)]).check_data(data)
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("filenames", nargs="*", help="Filenames to check")
-    parser.add_argument(
-        "--allowed-labels",
-        type=str,
-        help="Comma-separated list of allowed group labels",
-    )
+    add_label_arguments(parser, "group labels")
+    add_core_arguments(parser)
     args = parser.parse_args(argv)
 
-    allowed_labels = args.allowed_labels.split(",") if args.allowed_labels else None
-
-    error_flag = False
-    for file_path in args.filenames:
-        try:
-            with open(file_path, "r") as file:
-                data = yaml.safe_load(file)
-                errors = find_missing_model_group_labels(data, allowed_labels)
-                if errors:
-                    print(f"Errors found in '{file_path}':")
-                    for error in errors:
-                        print(error)
-                    error_flag = True
-        except Exception as e:
-            print(f"Failed to process '{file_path}': {e}")
-            error_flag = True
-
-    if error_flag:
-        return 1
-
-    return 0
+    exit_code = forward_or_skip(
+        "lightdash_pre_commit.find_missing_model_group_labels", argv, args
+    )
+    if exit_code is not None:
+        return exit_code
+
+    allowed_labels = registry_from_args(args.allowed_labels, args.allowed_labels_file)
+
+    checks = [MissingModelGroupLabelsCheck(allowed_labels)]
+    return Core.from_args(checks, args).run(args.filenames)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,451 @@
+import json
+import re
+from typing import Dict
+from typing import FrozenSet
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+# Replace content[start:end] with the bytes, offsets being byte offsets.
+Edit = Tuple[int, int, bytes]
+
+# What --fix repairs for each check, by check name.
+FIXES = {
+    "find_incorrect_indentation_of_dims_and_metrics": "indentation",
+    "find_missing_dimension_group_labels": "dimensions",
+    "find_missing_metric_group_labels": "metrics",
+    "find_missing_model_group_labels": "models",
+}
+
+# Keys indented under a dimension by mistake, which belong to the column's
+# meta.
+NESTED_KEYS = ("additional_dimensions", "metrics")
+
+# A line and its line break. YAML also breaks lines at these other characters,
+# which files are not fixed around.
+LINE = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+\Z")
+OTHER_BREAKS = re.compile("[\x85\u2028\u2029\ufeff]")
+
+
+class Source:
+    """
+    The text of a schema file, mapping the character positions of the YAML
+    composer to byte offsets.
+    """
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.lines = LINE.findall(content.decode("utf-8"))
+        self.starts = [0]
+        for line in self.lines:
+            self.starts.append(self.starts[-1] + len(line.encode("utf-8")))
+        self.newline = "\r\n" if b"\r\n" in content else "\n"
+
+    def offset(self, line: int, column: int) -> int:
+        if line >= len(self.lines):
+            return len(self.content)
+        return self.starts[line] + len(self.lines[line][:column].encode("utf-8"))
+
+    def line_end(self, line: int) -> int:
+        # The offset after the line's line break
+        return self.starts[min(line + 1, len(self.lines))]
+
+    def starts_line(self, mark) -> bool:
+        # True if only indentation comes before the mark on its line
+        if mark.line >= len(self.lines):
+            return False
+        return not self.lines[mark.line][: mark.column].strip(" ")
+
+    def at_line_start(self, offset: int) -> bool:
+        return offset == 0 or self.content[offset - 1] in b"\n\r"
+
+    def end_of(self, node) -> int:
+        """
+        Find where a node's text ends, after the line break of its last line.
+
+        Args:
+            node: A node of the composed file.
+
+        Returns:
+            int: The byte offset.
+        """
+        mark = last_mark(node)
+        # Block scalars end at the start of the next line
+        if mark.column == 0 and mark.line > 0:
+            return self.offset(mark.line, 0)
+        return self.line_end(mark.line)
+
+    def line_at(self, offset: int, column: int, text: str) -> bytes:
+        # A new line of text at a column, inserted at the start of a line
+        prefix = "" if self.at_line_start(offset) else self.newline
+        return f"{prefix}{' ' * column}{text}{self.newline}".encode("utf-8")
+
+
+def last_mark(node):
+    # The end of the last scalar or flow collection under a node
+    import yaml
+
+    while isinstance(node, yaml.CollectionNode) and node.value and not node.flow_style:
+        node = node.value[-1]
+        if isinstance(node, tuple):
+            node = node[1]
+    return node.end_mark
+
+
+def apply_edits(content: bytes, edits: Sequence[Edit]) -> bytes:
+    """
+    Apply byte-offset patches to a file's content in one pass.
+
+    Args:
+        content (bytes): The content.
+        edits (Sequence[Edit]): Non-overlapping edits in any order. Insertions
+            at an offset where a replacement starts are applied before it.
+
+    Returns:
+        bytes: The patched content.
+
+    Raises:
+        ValueError: If two edits overlap.
+    """
+    parts = []
+    position = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: edit[:2]):
+        if start < position:
+            raise ValueError(f"Overlapping edits at byte {start}")
+        parts.append(content[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(content[position:])
+    return b"".join(parts)
+
+
+def shared_nodes(root) -> FrozenSet[int]:
+    """
+    Find the nodes reached through more than one path, through aliases.
+
+    Editing one of them would change every place it is used.
+
+    Args:
+        root: The composed file.
+
+    Returns:
+        FrozenSet[int]: The ids of the shared nodes.
+    """
+    import yaml
+
+    seen, shared = set(), set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            shared.add(id(node))
+            continue
+        seen.add(id(node))
+        if isinstance(node, yaml.MappingNode):
+            for key, value in node.value:
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(node, yaml.SequenceNode):
+            stack.extend(node.value)
+    return frozenset(shared)
+
+
+class Fixer:
+    """
+    Repair what the checks report, by patching the bytes of each file.
+
+    Edits are computed from the parsed file and applied to its bytes in one
+    pass, so comments and formatting are kept and the file is written once. Nodes
+    in flow style, shared through aliases or built with merge keys are left
+    as they are, and so is any file the patches would not leave valid.
+
+    Args:
+        kinds (FrozenSet[str]): The values of ``FIXES`` to apply.
+        group_label (Optional[str]): The ``group_label`` inserted where one is
+            missing. Without it only indentation is fixed.
+    """
+
+    def __init__(self, kinds: FrozenSet[str], group_label: Optional[str] = None):
+        if group_label is None:
+            kinds = kinds & {"indentation"}
+        self.kinds = frozenset(kinds)
+        self.group_label = group_label
+
+    @classmethod
+    def for_checks(cls, checks: Sequence, group_label: Optional[str]) -> "Fixer":
+        """
+        Create a fixer repairing what the enabled checks report.
+
+        Args:
+            checks (Sequence[Check]): The enabled checks.
+            group_label (Optional[str]): See :class:`Fixer`.
+
+        Returns:
+            Fixer: The fixer.
+        """
+        kinds = frozenset(FIXES[check.name] for check in checks if check.name in FIXES)
+        return cls(kinds, group_label)
+
+    def __repr__(self) -> str:
+        return f"Fixer({sorted(self.kinds)}, {self.group_label!r})"
+
+    def fix(self, content: bytes) -> Tuple[bytes, int]:
+        """
+        Repair a schema file.
+
+        Misplaced blocks are moved first, so the metrics they hold get a
+        ``group_label`` too.
+
+        Args:
+            content (bytes): The file's content.
+
+        Returns:
+            Tuple[bytes, int]: The repaired content and the number of issues
+                fixed. The content is unchanged when nothing was fixed or the
+                file cannot be parsed. The repaired content is not parsed
+                again, see :meth:`Core.fix_file
+                <lightdash_pre_commit.core.Core.fix_file>`.
+        """
+        import yaml
+
+        fixed, count = content, 0
+        try:
+            source = self.compose(content)
+            if source is None:
+                return content, 0
+            if "indentation" in self.kinds:
+                edits, count = self.indentation_edits(*source)
+                if edits:
+                    # The labels are placed in the moved blocks
+                    fixed = apply_edits(content, edits)
+                    source = self.compose(fixed)
+                    if source is None:
+                        return content, 0
+            if self.kinds - {"indentation"}:
+                edits = self.label_edits(*source)
+                if edits:
+                    fixed, count = apply_edits(fixed, edits), count + len(edits)
+        except (yaml.YAMLError, UnicodeDecodeError):
+            return content, 0
+        return fixed, count
+
+    @staticmethod
+    def compose(content: bytes):
+        # The node tree of a file of one document, with the positions of
+        # every node, or None when the file cannot be edited safely
+        import yaml
+
+        text = content.decode("utf-8")
+        if OTHER_BREAKS.search(text):
+            return None
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        root = yaml.compose(text, Loader=loader)
+        if not isinstance(root, yaml.MappingNode):
+            return None
+        # Only aliases share nodes
+        shared = shared_nodes(root) if "*" in text else frozenset()
+        return Source(content), root, shared
+
+    @staticmethod
+    def entries(node, shared: FrozenSet[int]) -> Optional[Dict[str, tuple]]:
+        # The key and value nodes of a block mapping by key, or None when it
+        # cannot be edited
+        import yaml
+
+        if (
+            not isinstance(node, yaml.MappingNode)
+            or node.flow_style
+            or not node.value
+            or id(node) in shared
+        ):
+            return None
+        entries = {}
+        for key, value in node.value:
+            if not isinstance(key, yaml.ScalarNode) or key.value == "<<":
+                return None
+            entries[key.value] = (key, value)
+        return entries
+
+    def models(self, root, shared: FrozenSet[int]):
+        # The entries of each model and of its meta, when editable
+        import yaml
+
+        models = (self.entries(root, shared) or {}).get("models")
+        if models is None or not isinstance(models[1], yaml.SequenceNode):
+            return
+        for model in models[1].value:
+            model_entries = self.entries(model, shared)
+            if model_entries is not None:
+                yield model_entries, self.entry_mapping(model_entries, "meta", shared)
+
+    def entry_mapping(self, entries: Optional[dict], key: str, shared):
+        if entries is None or key not in entries:
+            return None
+        return self.entries(entries[key][1], shared)
+
+    def columns(self, model_entries: dict, shared: FrozenSet[int]):
+        # The entries of each column's meta, when editable
+        import yaml
+
+        columns = model_entries.get("columns")
+        if columns is None or not isinstance(columns[1], yaml.SequenceNode):
+            return
+        for column in columns[1].value:
+            meta = self.entry_mapping(self.entries(column, shared), "meta", shared)
+            if meta is not None:
+                yield meta
+
+    def indentation_edits(
+        self, source: Source, root, shared: FrozenSet[int]
+    ) -> Tuple[List[Edit], int]:
+        """
+        Move blocks indented under a dimension, and metrics indented under
+        ``additional_dimensions``, up to the column's meta.
+
+        A block is left in place when the meta already has its key.
+
+        Returns:
+            Tuple[List[Edit], int]: The edits and the number of blocks moved.
+        """
+        edits: List[Edit] = []
+        moved = 0
+        for model, _ in self.models(root, shared):
+            for meta in self.columns(model, shared):
+                meta_column = next(iter(meta.values()))[0].start_mark.column
+                taken = set(meta)
+                for container, keys in (
+                    ("dimension", NESTED_KEYS),
+                    ("additional_dimensions", ("metrics",)),
+                ):
+                    if container not in meta:
+                        continue
+                    key, mapping = meta[container]
+                    entries = self.entries(mapping, shared)
+                    if entries is None:
+                        continue
+                    nested = [
+                        name
+                        for name in keys
+                        if name in entries
+                        and name not in taken
+                        and source.starts_line(entries[name][0].start_mark)
+                    ]
+                    if not nested:
+                        continue
+                    if self.move_out(source, key, mapping, nested, meta_column, edits):
+                        taken.update(nested)
+                    moved += len(nested)
+        return edits, moved
+
+    @staticmethod
+    def move_out(
+        source: Source,
+        container_key,
+        mapping,
+        names: List[str],
+        column: int,
+        edits: List[Edit],
+    ) -> bool:
+        # Delete the entries of a mapping, dedent them to a column and insert
+        # them after the rest of the mapping
+        remaining = [value for key, value in mapping.value if key.value not in names]
+        if remaining:
+            insert_at = source.end_of(remaining[-1])
+        elif mapping.value[0][0].start_mark.line > container_key.start_mark.line:
+            insert_at = source.line_end(container_key.start_mark.line)
+        else:
+            return False
+        blocks = []
+        removals = []
+        for key, value in mapping.value:
+            if key.value not in names:
+                continue
+            start = source.offset(key.start_mark.line, 0)
+            end = source.end_of(value)
+            indent = key.start_mark.column - column
+            text = source.content[start:end].decode("utf-8")
+            for line in LINE.findall(text):
+                spaces = len(line) - len(line.lstrip(" "))
+                dedent = min(spaces, indent)
+                blocks.append(line[dedent:])
+            removals.append((start, end, b""))
+        block = "".join(blocks)
+        if not source.at_line_start(insert_at):
+            block = source.newline + block
+        if not block.endswith(("\n", "\r")):
+            block += source.newline
+        edits.append((insert_at, insert_at, block.encode("utf-8")))
+        edits.extend(removals)
+        return True
+
+    def needs_label(self, node, shared: FrozenSet[int], hideable: bool) -> bool:
+        # Mirrors the group label checks: hidden dimensions and fields that
+        # skip the check or have group_label or groups are left alone
+        import yaml
+
+        entries = self.entries(node, shared)
+        if entries is None or "group_label" in entries or "groups" in entries:
+            return False
+        flags = ["skip_group_label", "hidden"] if hideable else ["skip_group_label"]
+        constructor = yaml.constructor.SafeConstructor()
+        for flag in flags:
+            if flag in entries and constructor.construct_object(entries[flag][1]):
+                return False
+        return True
+
+    def label_edits(self, source: Source, root, shared: FrozenSet[int]) -> List[Edit]:
+        """
+        Insert the default ``group_label`` into the models, dimensions and
+        metrics missing one, as the last key of their mapping.
+
+        Returns:
+            List[Edit]: One insertion per field.
+        """
+        fields = []
+        for model, meta in self.models(root, shared):
+            if meta is None:
+                continue
+            if "models" in self.kinds and "group_label" not in meta:
+                fields.append(model["meta"][1])
+            if "metrics" in self.kinds:
+                fields.extend(self.fields(meta, "metrics", shared))
+            for column_meta in self.columns(model, shared):
+                if "dimensions" in self.kinds:
+                    dimension = column_meta.get("dimension", (None, None))[1]
+                    if self.needs_label(dimension, shared, True):
+                        fields.append(dimension)
+                    fields.extend(
+                        self.fields(column_meta, "additional_dimensions", shared, True)
+                    )
+                if "metrics" in self.kinds:
+                    fields.extend(self.fields(column_meta, "metrics", shared))
+
+        line = f"group_label: {json.dumps(self.group_label)}"
+        insertions = []
+        for mapping in fields:
+            column = mapping.value[0][0].start_mark.column
+            insertions.append((source.end_of(mapping), column))
+        # A model's meta can end where its last metric does, and the inner
+        # mapping's line must come first
+        insertions.sort(key=lambda insertion: (insertion[0], -insertion[1]))
+        return [
+            (offset, offset, source.line_at(offset, column, line))
+            for offset, column in insertions
+        ]
+
+    def fields(
+        self, meta: dict, key: str, shared: FrozenSet[int], hideable: bool = False
+    ) -> list:
+        # The mappings of the fields under a key of a meta that need a label
+        mapping = self.entry_mapping(meta, key, shared)
+        if mapping is None:
+            return []
+        # A "metrics" block under additional_dimensions is misplaced rather
+        # than a dimension missing its label
+        return [
+            value
+            for name, (_, value) in mapping.items()
+            if not (hideable and name == "metrics")
+            and self.needs_label(value, shared, hideable)
+        ]
@@ -0,0 +1,283 @@
+import argparse
+import re
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+# Invalid labels list every allowed label when there are at most this many.
+MAX_LISTED_LABELS = 10
+
+# Suggestions given for an invalid label, closest first.
+MAX_SUGGESTIONS = 3
+
+SEPARATORS = re.compile(r"[\s_-]+")
+
+
+def normalize_label(label) -> str:
+    """
+    Reduce a label to the form labels are compared in for suggestions,
+    ignoring case and how words are separated.
+
+    Args:
+        label: A group label, usually a string.
+
+    Returns:
+        str: The normalized label.
+    """
+    return SEPARATORS.sub(" ", str(label).casefold()).strip()
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Count the insertions, deletions and substitutions turning one string into
+    another.
+
+    Args:
+        a (str): The first string.
+        b (str): The second string.
+
+    Returns:
+        int: The Levenshtein distance.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """
+    An index of words by edit distance, finding the words near a query
+    without comparing it to every word.
+
+    The tree is kept in flat lists, so it is cheap to pickle for worker
+    processes.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.words: List[str] = []
+        # The children of each word by their distance to it
+        self.children: List[Dict[int, int]] = []
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> None:
+        if not self.words:
+            self.words.append(word)
+            self.children.append({})
+            return
+        index = 0
+        while True:
+            distance = edit_distance(word, self.words[index])
+            if distance == 0:
+                return
+            child = self.children[index].get(distance)
+            if child is None:
+                self.children[index][distance] = len(self.words)
+                self.words.append(word)
+                self.children.append({})
+                return
+            index = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        """
+        Find the words within a distance of a word.
+
+        Args:
+            word (str): The query.
+            max_distance (int): The largest distance returned.
+
+        Returns:
+            List[Tuple[int, str]]: The distance and word of each match, in
+                no particular order.
+        """
+        matches = []
+        stack = [0] if self.words else []
+        while stack:
+            index = stack.pop()
+            distance = edit_distance(word, self.words[index])
+            if distance <= max_distance:
+                matches.append((distance, self.words[index]))
+            # Only subtrees at a distance within the bound of this word's can
+            # hold matches, by the triangle inequality
+            for child_distance, child in self.children[index].items():
+                if abs(child_distance - distance) <= max_distance:
+                    stack.append(child)
+        return matches
+
+
+class LabelRegistry:
+    """
+    The allowed group labels, with a set for membership and a
+    :class:`BKTree` of their normalized forms for suggestions.
+
+    Args:
+        labels (Iterable[str]): The allowed labels, in the order they are
+            listed in messages.
+    """
+
+    def __init__(self, labels: Iterable[str]):
+        self.ordered = list(dict.fromkeys(labels))
+        self.labels = frozenset(self.ordered)
+        self.by_normalized: Dict[str, List[str]] = {}
+        for label in self.ordered:
+            self.by_normalized.setdefault(normalize_label(label), []).append(label)
+        self.index = BKTree(self.by_normalized)
+        # Models share labels, so each invalid one is looked up once
+        self.suggestions: Dict[str, List[str]] = {}
+
+    @classmethod
+    def of(
+        cls, labels: Union["LabelRegistry", Sequence[str], None]
+    ) -> Optional["LabelRegistry"]:
+        # Accepts the lists of allowed labels checks used to take
+        if labels is None or isinstance(labels, LabelRegistry):
+            return labels
+        return cls(labels) if labels else None
+
+    def __contains__(self, label) -> bool:
+        # YAML allows lists and mappings, which are not labels and cannot be
+        # looked up in a set
+        return isinstance(label, str) and label in self.labels
+
+    def __len__(self) -> int:
+        return len(self.ordered)
+
+    def __repr__(self) -> str:
+        return f"LabelRegistry({len(self)} labels)"
+
+    def signature(self) -> str:
+        """
+        Describe the labels for the result cache, in a fixed size.
+
+        Returns:
+            str: A digest of the sorted labels.
+        """
+        import hashlib
+
+        digest = hashlib.sha1("\n".join(sorted(self.labels)).encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def suggest(self, label) -> List[str]:
+        """
+        Rank the allowed labels close to an invalid one.
+
+        Args:
+            label: The invalid label.
+
+        Returns:
+            List[str]: Up to ``MAX_SUGGESTIONS`` allowed labels, closest first.
+        """
+        key = normalize_label(label)
+        suggestions = self.suggestions.get(key)
+        if suggestions is None:
+            # Allow about one typo in three characters
+            max_distance = max(1, min(3, len(key) // 3))
+            matches = sorted(self.index.search(key, max_distance))
+            suggestions = [
+                allowed
+                for _, normalized in matches
+                for allowed in self.by_normalized[normalized]
+            ][:MAX_SUGGESTIONS]
+            self.suggestions[key] = suggestions
+        return suggestions
+
+    def hint(self, label) -> str:
+        """
+        Explain how to fix an invalid label.
+
+        Args:
+            label: The invalid label.
+
+        Returns:
+            str: A "did you mean" sentence, or the allowed labels when there
+                is no close one and they are few.
+        """
+        suggestions = self.suggest(label)
+        if suggestions:
+            quoted = [f"'{suggestion}'" for suggestion in suggestions]
+            if len(quoted) > 1:
+                quoted[-2:] = [f"{quoted[-2]} or {quoted[-1]}"]
+            return f"Did you mean {', '.join(quoted)}?"
+        if len(self) <= MAX_LISTED_LABELS:
+            return f"Allowed labels are: {self.ordered}."
+        return f"It is not one of the {len(self)} allowed labels."
+
+
+def read_labels_file(path: str) -> List[str]:
+    """
+    Read allowed labels from a file of one label per line. Blank lines and
+    lines starting with ``#`` are ignored.
+
+    Args:
+        path (str): The file.
+
+    Returns:
+        List[str]: The labels, in file order.
+
+    Raises:
+        argparse.ArgumentTypeError: If the file cannot be read.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            lines = [line.strip() for line in file]
+    except (OSError, UnicodeDecodeError) as e:
+        raise argparse.ArgumentTypeError(f"cannot read '{path}': {e}")
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def add_label_arguments(
+    parser: argparse.ArgumentParser, what: str, prefix: str = "allowed-labels"
+) -> None:
+    """
+    Add the options giving allowed group labels.
+
+    Args:
+        parser (argparse.ArgumentParser): The hook's argument parser.
+        what (str): What the labels are allowed for, for the help.
+        prefix (str): The name of the options, without dashes.
+    """
+    parser.add_argument(
+        f"--{prefix}",
+        type=str,
+        help=f"Comma-separated list of allowed {what}",
+    )
+    parser.add_argument(
+        f"--{prefix}-file",
+        type=read_labels_file,
+        metavar="PATH",
+        help=f"File of allowed {what}, one per line. Combined with --{prefix}.",
+    )
+
+
+def registry_from_args(
+    labels: Optional[str], file_labels: Optional[List[str]]
+) -> Optional[LabelRegistry]:
+    """
+    Build the registry of the options added by :func:`add_label_arguments`.
+
+    Args:
+        labels (Optional[str]): The comma-separated labels.
+        file_labels (Optional[List[str]]): The labels read from a file.
+
+    Returns:
+        Optional[LabelRegistry]: The registry, or None when no labels were
+            given and any label is allowed.
+    """
+    allowed = labels.split(",") if labels else []
+    return LabelRegistry.of([*allowed, *(file_labels or [])])
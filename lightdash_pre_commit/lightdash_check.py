@@ -0,0 +1,158 @@
+import argparse
+import sys
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+from lightdash_pre_commit.check_duplicate_metric_dimension_names import (
+    DuplicateNamesCheck,
+)
+from lightdash_pre_commit.check_naming_conventions import add_naming_arguments
+from lightdash_pre_commit.check_naming_conventions import build_rules
+from lightdash_pre_commit.check_naming_conventions import NamingConventionCheck
+from lightdash_pre_commit.core import add_core_arguments
+from lightdash_pre_commit.core import Check
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.core import forward_or_skip
+from lightdash_pre_commit.find_incorrect_indentation_of_dims_and_metrics import (
+    IndentationCheck,
+)
+from lightdash_pre_commit.find_missing_dimension_group_labels import (
+    MissingDimensionGroupLabelsCheck,
+)
+from lightdash_pre_commit.find_missing_metric_group_labels import (
+    MissingMetricGroupLabelsCheck,
+)
+from lightdash_pre_commit.find_missing_model_group_labels import (
+    MissingModelGroupLabelsCheck,
+)
+from lightdash_pre_commit.labels import add_label_arguments
+from lightdash_pre_commit.labels import LabelRegistry
+from lightdash_pre_commit.labels import registry_from_args
+from lightdash_pre_commit.project_index import add_project_arguments
+from lightdash_pre_commit.watch import add_watch_arguments
+
+CHECK_NAMES = (
+    DuplicateNamesCheck.name,
+    MissingMetricGroupLabelsCheck.name,
+    MissingDimensionGroupLabelsCheck.name,
+    IndentationCheck.name,
+    MissingModelGroupLabelsCheck.name,
+    NamingConventionCheck.name,
+)
+
+
+def build_checks(
+    skip: Sequence[str] = (),
+    allowed_labels: Union[LabelRegistry, Sequence[str], None] = None,
+    allowed_field_labels: Union[LabelRegistry, Sequence[str], None] = None,
+    naming_rules: Optional[Dict[str, str]] = None,
+) -> List[Check]:
+    """
+    Create the enabled checks in the order their hooks are documented.
+
+    Args:
+        skip (Sequence[str]): Names of checks to leave out.
+        allowed_labels (Union[LabelRegistry, Sequence[str], None]): Allowed
+            model group labels.
+        allowed_field_labels (Union[LabelRegistry, Sequence[str], None]):
+            Allowed group labels of metrics and dimensions.
+        naming_rules (Optional[Dict[str, str]]): The naming rules to enforce,
+            see :func:`build_rules`. The naming check runs only when given.
+
+    Returns:
+        List[Check]: The checks to run.
+    """
+    checks = [
+        DuplicateNamesCheck(),
+        MissingMetricGroupLabelsCheck(
+            skip_without_dimensions_and_metrics=True,
+            allowed_labels=allowed_field_labels,
+        ),
+        MissingDimensionGroupLabelsCheck(allowed_field_labels),
+        IndentationCheck(),
+        MissingModelGroupLabelsCheck(allowed_labels),
+    ]
+    if naming_rules is not None:
+        checks.append(NamingConventionCheck(naming_rules))
+    return [check for check in checks if check.name not in skip]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    # "lightdash-check merge" combines the partial results of shards
+    if list(sys.argv[1:] if argv is None else argv)[:1] == ["merge"]:
+        from lightdash_pre_commit.shards import merge_main
+
+        return merge_main(list(sys.argv[2:] if argv is None else argv[1:]))
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filenames", nargs="*", help="Filenames to check")
+    parser.add_argument(
+        "--skip",
+        action="append",
+        default=[],
+        choices=CHECK_NAMES,
+        help="Name of a check to leave out. May be given more than once.",
+    )
+    add_label_arguments(parser, "model group labels")
+    add_label_arguments(
+        parser, "metric and dimension group labels", "allowed-field-labels"
+    )
+    parser.add_argument(
+        "--naming-conventions",
+        action="store_true",
+        help="Also check dimension and metric names against the naming rules. "
+        "Implied by --naming-rule.",
+    )
+    add_naming_arguments(parser)
+    add_core_arguments(parser)
+    add_project_arguments(parser)
+    add_watch_arguments(parser)
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Serve hook runs for this repository from a warm process over a "
+        "Unix socket instead of checking files.",
+    )
+    parser.add_argument(
+        "--daemon-idle-timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Stop the daemon after this long without a request. Defaults to "
+        "15 minutes.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.daemon:
+        from lightdash_pre_commit.daemon import serve
+
+        return serve(args.daemon_idle_timeout)
+
+    if args.watch is None:
+        exit_code = forward_or_skip("lightdash_pre_commit.lightdash_check", argv, args)
+        if exit_code is not None:
+            return exit_code
+
+    checks = build_checks(
+        args.skip,
+        registry_from_args(args.allowed_labels, args.allowed_labels_file),
+        registry_from_args(args.allowed_field_labels, args.allowed_field_labels_file),
+        (
+            build_rules(args.naming_rule)
+            if args.naming_conventions or args.naming_rule
+            else None
+        ),
+    )
+
+    if args.watch is not None:
+        from lightdash_pre_commit.watch import watch
+
+        return watch(checks, args)
+
+    return Core.from_args(checks, args).run(args.filenames)
+
+
+if __name__ == "__main__":
+    exit(main(None))
@@ -0,0 +1,36 @@
+import yaml
+
+from lightdash_pre_commit.positions import mark_mapping
+from lightdash_pre_commit.positions import MarkedDict
+
+
+def construct_marked_mapping(loader: yaml.BaseLoader, node: yaml.MappingNode):
+    data = MarkedDict()
+    mark_mapping(data, node.start_mark)
+    yield data
+    data.update(loader.construct_mapping(node))
+    # Point nested mappings at their key. Values are cached by node, so this
+    # looks them up rather than constructing them again.
+    for key_node, value_node in node.value:
+        value = loader.constructed_objects.get(value_node)
+        if isinstance(value, MarkedDict):
+            mark_mapping(value, key_node.start_mark)
+
+
+class PositionSafeLoader(yaml.SafeLoader):
+    pass
+
+
+PositionSafeLoader.add_constructor("tag:yaml.org,2002:map", construct_marked_mapping)
+
+if getattr(yaml, "CSafeLoader", None) is not None:
+
+    class PositionCSafeLoader(yaml.CSafeLoader):
+        pass
+
+    PositionCSafeLoader.add_constructor(
+        "tag:yaml.org,2002:map", construct_marked_mapping
+    )
+
+else:
+    PositionCSafeLoader = None
@@ -0,0 +1,116 @@
+import json
+import os
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+
+def _load_json(path: str) -> dict:
+    with open(path, "rb") as file:
+        content = file.read()
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(content)
+    return orjson.loads(content)
+
+
+def iter_nodes(path: str, streaming: bool = False) -> Iterator[Tuple[str, dict]]:
+    """
+    Iterate over the nodes of a dbt manifest.
+
+    Args:
+        path (str): Path to ``manifest.json``.
+        streaming (bool): Read the nodes one at a time with ``ijson`` instead
+            of loading the whole manifest. Slower, but memory stays flat on
+            very large manifests.
+
+    Yields:
+        Tuple[str, dict]: Each node's unique id and the node.
+
+    Raises:
+        ValueError: If streaming is requested and ``ijson`` is not installed.
+    """
+    if not streaming:
+        yield from _load_json(path).get("nodes", {}).items()
+        return
+
+    try:
+        import ijson
+    except ImportError:
+        raise ValueError("Streaming a manifest requires the 'ijson' package")
+    with open(path, "rb") as file:
+        yield from ijson.kvitems(file, "nodes")
+
+
+def default_project_root(path: str) -> str:
+    """
+    Guess the dbt project directory of a manifest.
+
+    Args:
+        path (str): Path to ``manifest.json``.
+
+    Returns:
+        str: The parent of the manifest's directory, as dbt writes the
+            manifest to ``<project>/target/manifest.json`` by default.
+    """
+    return os.path.dirname(os.path.dirname(os.path.abspath(path)))
+
+
+def schema_file_path(node: dict) -> str:
+    """
+    Get the file a model's meta was defined in.
+
+    Model and column meta live in the schema YAML file that patches the
+    model, so that file is preferred over the model's SQL file.
+
+    Args:
+        node (dict): A manifest node.
+
+    Returns:
+        str: The path, relative to the dbt project root.
+    """
+    patch_path = node.get("patch_path")
+    if patch_path:
+        # Patch paths are prefixed with the project name, e.g. "jaffle://"
+        return patch_path.split("://", 1)[-1]
+    return node["original_file_path"]
+
+
+def model_from_node(node: dict) -> dict:
+    """
+    Rebuild the schema file entry of a model from its manifest node.
+
+    Args:
+        node (dict): A manifest node of resource type "model".
+
+    Returns:
+        dict: The model in the shape the checks expect.
+    """
+    meta = node.get("meta") or node.get("config", {}).get("meta") or {}
+    columns = [
+        {"name": column.get("name", name), "meta": column.get("meta") or {}}
+        for name, column in (node.get("columns") or {}).items()
+    ]
+    return {"name": node["name"], "meta": meta, "columns": columns}
+
+
+def load_manifest_models(path: str, streaming: bool = False) -> Dict[str, dict]:
+    """
+    Group the models of a dbt manifest by the schema file they came from.
+
+    Args:
+        path (str): Path to ``manifest.json``.
+        streaming (bool): Read the manifest incrementally, see
+            :func:`iter_nodes`.
+
+    Returns:
+        Dict[str, dict]: A parsed schema document per file, sorted by path.
+    """
+    files: Dict[str, List[dict]] = {}
+    for _, node in iter_nodes(path, streaming):
+        if node.get("resource_type") != "model":
+            continue
+        files.setdefault(schema_file_path(node), []).append(model_from_node(node))
+    return {file_path: {"models": files[file_path]} for file_path in sorted(files)}
@@ -0,0 +1,334 @@
+import sys
+from typing import List
+from typing import Optional
+
+from lightdash_pre_commit.positions import Located
+from lightdash_pre_commit.positions import position_of
+
+
+def _mapping(value, what: str) -> dict:
+    # A key with nothing under it, such as "metrics:", is an empty mapping
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise ValueError(f"Expected a mapping for {what}, got {type(value).__name__}")
+    return value
+
+
+def _sequence(value, what: str) -> list:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError(f"Expected a list for {what}, got {type(value).__name__}")
+    return value
+
+
+def _intern(name):
+    # Names repeat across files and runs, so equal names share one string
+    return sys.intern(name) if isinstance(name, str) else name
+
+
+class Mark(Located):
+    """
+    The position of a key inside a node, such as a model's ``meta``.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, node):
+        self.line, self.column = position_of(node)
+
+
+class Field(Located):
+    """
+    A dimension, additional dimension or metric.
+
+    ``labelled`` is true when the field has a ``group_label`` or ``groups``
+    key, whatever their values.
+    """
+
+    __slots__ = (
+        "name",
+        "hidden",
+        "skip_group_label",
+        "group_label",
+        "groups",
+        "labelled",
+    )
+
+    def __init__(self, name, details: dict):
+        self.line, self.column = position_of(details)
+        self.name = _intern(name)
+        self.hidden = bool(details.get("hidden", False))
+        self.skip_group_label = bool(details.get("skip_group_label", False))
+        self.group_label = details.get("group_label")
+        self.groups = details.get("groups")
+        self.labelled = "group_label" in details or "groups" in details
+
+    @classmethod
+    def from_dict(cls, name, details) -> "Field":
+        return cls(name, _mapping(details, f"'{name}'"))
+
+
+class Dimension(Field):
+    """
+    The primary dimension of a column, named after the column.
+
+    ``nested_additional_dimensions`` and ``nested_metrics`` mark keys that
+    were indented under the dimension by mistake.
+    """
+
+    __slots__ = ("nested_additional_dimensions", "nested_metrics")
+
+    def __init__(self, name, details: dict):
+        super().__init__(name, details)
+        self.nested_additional_dimensions = None
+        self.nested_metrics = None
+        if "additional_dimensions" in details:
+            self.nested_additional_dimensions = Mark(
+                details["additional_dimensions"] or details
+            )
+        if "metrics" in details:
+            self.nested_metrics = Mark(details["metrics"] or details)
+
+
+class AdditionalDimension(Field):
+    __slots__ = ()
+
+
+class Metric(Field):
+    __slots__ = ("type",)
+
+    def __init__(self, name, details: dict):
+        super().__init__(name, details)
+        self.type = details.get("type")
+
+
+class Column(Located):
+    """
+    A column and the dimensions and metrics defined in its meta.
+    """
+
+    __slots__ = ("name", "dimension", "additional_dimensions", "metrics")
+
+    def __init__(
+        self,
+        name,
+        dimension: Optional[Dimension] = None,
+        additional_dimensions: Optional[List[AdditionalDimension]] = None,
+        metrics: Optional[List[Metric]] = None,
+    ):
+        self.line = self.column = None
+        self.name = _intern(name)
+        self.dimension = dimension
+        self.additional_dimensions = additional_dimensions or []
+        self.metrics = metrics or []
+
+    @classmethod
+    def from_dict(cls, column) -> "Column":
+        column = _mapping(column, "a column")
+        name = column.get("name")
+        meta = _mapping(column.get("meta"), f"the meta of column '{name}'")
+        dimension = None
+        if "dimension" in meta:
+            dimension = Dimension.from_dict(name, meta["dimension"])
+        additional_dimensions = [
+            AdditionalDimension.from_dict(key, details)
+            for key, details in _mapping(
+                meta.get("additional_dimensions"),
+                f"the additional dimensions of column '{name}'",
+            ).items()
+        ]
+        metrics = [
+            Metric.from_dict(key, details)
+            for key, details in _mapping(
+                meta.get("metrics"), f"the metrics of column '{name}'"
+            ).items()
+        ]
+        node = cls(name, dimension, additional_dimensions, metrics)
+        node.line, node.column = position_of(column)
+        return node
+
+
+class Model(Located):
+    """
+    A model, its model-level metrics and its columns.
+
+    ``meta`` marks the model's ``meta`` key, or is None without one.
+    """
+
+    __slots__ = ("name", "meta", "group_label", "metrics", "columns")
+
+    def __init__(
+        self,
+        name,
+        meta: Optional[Mark] = None,
+        group_label=None,
+        metrics: Optional[List[Metric]] = None,
+        columns: Optional[List[Column]] = None,
+    ):
+        self.line = self.column = None
+        self.name = _intern(name)
+        self.meta = meta
+        self.group_label = group_label
+        self.metrics = metrics or []
+        self.columns = columns or []
+
+    @classmethod
+    def from_dict(cls, model) -> "Model":
+        """
+        Normalize a model of a parsed schema file.
+
+        Args:
+            model: The model's mapping.
+
+        Returns:
+            Model: The model, with its columns when the mapping has any.
+
+        Raises:
+            ValueError: If a node that must be a mapping or a list is not.
+        """
+        model = _mapping(model, "a model")
+        name = model.get("name")
+        meta = None
+        if "meta" in model:
+            meta = Mark(model["meta"])
+        model_meta = _mapping(model.get("meta"), f"the meta of model '{name}'")
+        metrics = [
+            Metric.from_dict(key, details)
+            for key, details in _mapping(
+                model_meta.get("metrics"), f"the metrics of model '{name}'"
+            ).items()
+        ]
+        columns = [
+            Column.from_dict(column)
+            for column in _sequence(
+                model.get("columns"), f"the columns of model '{name}'"
+            )
+        ]
+        node = cls(name, meta, model_meta.get("group_label"), metrics, columns)
+        node.line, node.column = position_of(model)
+        return node
+
+
+class ModelSummary:
+    """
+    How many dimensions and metrics a model defines.
+    """
+
+    __slots__ = (
+        "name",
+        "dimensions",
+        "additional_dimensions",
+        "column_metrics",
+        "model_metrics",
+    )
+
+    def __init__(self, name=None):
+        self.name = name
+        self.dimensions = 0
+        self.additional_dimensions = 0
+        self.column_metrics = 0
+        self.model_metrics = 0
+
+    @classmethod
+    def of(cls, model: Model) -> "ModelSummary":
+        summary = cls(model.name)
+        summary.model_metrics = len(model.metrics)
+        for column in model.columns:
+            summary.count_column(column)
+        return summary
+
+    def count_column(self, column: Column) -> None:
+        self.dimensions += column.dimension is not None
+        self.additional_dimensions += len(column.additional_dimensions)
+        self.column_metrics += len(column.metrics)
+
+
+class Summary:
+    """
+    How many dimensions and metrics each model of a schema file defines, and
+    in total.
+
+    It is counted once as the file is normalized, so every check can decide
+    whether to skip the file without walking it again.
+    """
+
+    __slots__ = (
+        "models",
+        "dimensions",
+        "additional_dimensions",
+        "column_metrics",
+        "model_metrics",
+    )
+
+    def __init__(self):
+        self.models: List[ModelSummary] = []
+        self.dimensions = 0
+        self.additional_dimensions = 0
+        self.column_metrics = 0
+        self.model_metrics = 0
+
+    def add(self, model: ModelSummary) -> None:
+        self.models.append(model)
+        self.dimensions += model.dimensions
+        self.additional_dimensions += model.additional_dimensions
+        self.column_metrics += model.column_metrics
+        self.model_metrics += model.model_metrics
+
+    @property
+    def metrics(self) -> int:
+        """Metrics of columns and models."""
+        return self.column_metrics + self.model_metrics
+
+    @property
+    def fields(self) -> int:
+        """Named dimensions and metrics, which must not share names."""
+        return self.dimensions + self.additional_dimensions + self.metrics
+
+
+class Schema:
+    """
+    The models of a schema file and their :class:`Summary`.
+    """
+
+    __slots__ = ("models", "has_models", "summary")
+
+    def __init__(
+        self,
+        models: Optional[List[Model]] = None,
+        has_models: bool = False,
+        summary: Optional[Summary] = None,
+    ):
+        self.models = models or []
+        self.has_models = has_models
+        self.summary = summary or Summary()
+
+
+def normalize(data) -> Schema:
+    """
+    Turn a parsed schema file into compact nodes.
+
+    Checks only read the keys copied onto the nodes, so the parsed file can
+    be dropped as soon as it is normalized.
+
+    Args:
+        data: The parsed dbt schema file.
+
+    Returns:
+        Schema: The file's models.
+
+    Raises:
+        ValueError: If the root of the file or a node that must be a mapping
+            or a list is not.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(
+            f"Expected a mapping at the root of the file, got {type(data).__name__}"
+        )
+    schema = Schema(has_models="models" in data)
+    for model in _sequence(data.get("models"), "models"):
+        model = Model.from_dict(model)
+        schema.models.append(model)
+        schema.summary.add(ModelSummary.of(model))
+    return schema
@@ -0,0 +1,139 @@
+from typing import Callable
+from typing import Dict
+from typing import IO
+from typing import Iterator
+from typing import Union
+
+
+class Parser:
+    """
+    A YAML parser backend used to load dbt schema files.
+
+    Backends must return plain mappings and sequences (or subclasses of them)
+    so that every check can consume their output unchanged.
+    """
+
+    name = ""
+    description = ""
+
+    def load(self, stream: Union[str, bytes, IO]):
+        raise NotImplementedError
+
+    def parse(self, stream: Union[str, bytes, IO]) -> Iterator:
+        """
+        Produce the parse events of a stream without constructing it.
+
+        Raises:
+            ValueError: If the backend cannot produce events.
+        """
+        raise ValueError(f"The '{self.name}' parser does not support streaming")
+
+
+class PyYAMLParser(Parser):
+    def __init__(self, name: str, loader: type, description: str):
+        self.name = name
+        self.loader = loader
+        self.description = description
+
+    def load(self, stream: Union[str, bytes, IO]):
+        import yaml
+
+        return yaml.load(stream, Loader=self.loader)
+
+    def parse(self, stream: Union[str, bytes, IO]) -> Iterator:
+        import yaml
+
+        return yaml.parse(stream, Loader=self.loader)
+
+
+class RoundTripParser(Parser):
+    """
+    Round-trip loader that keeps comments and line/column information on
+    every mapping and sequence. Requires the optional ``ruamel.yaml`` package.
+    """
+
+    name = "roundtrip"
+    description = "ruamel.yaml round-trip loader"
+
+    def __init__(self):
+        try:
+            from ruamel.yaml import YAML
+        except ImportError:
+            raise ValueError(
+                "The 'roundtrip' parser requires the 'ruamel.yaml' package"
+            )
+        self.yaml = YAML(typ="rt")
+
+    def __reduce__(self):
+        # Recreate the loader in worker processes instead of pickling it
+        return RoundTripParser, ()
+
+    def load(self, stream: Union[str, bytes, IO]):
+        return self.yaml.load(stream)
+
+
+# PyYAML is imported by the factories rather than at the top, so that the
+# hooks can parse their arguments and exit without loading it when there is
+# nothing to check.
+
+
+def _c_parser() -> Parser:
+    import yaml
+
+    from lightdash_pre_commit.loaders import PositionCSafeLoader
+
+    if getattr(yaml, "CSafeLoader", None) is None:
+        raise ValueError("PyYAML was built without libyaml, 'c' parser unavailable")
+    return PyYAMLParser("c", PositionCSafeLoader, "libyaml CSafeLoader")
+
+
+def _python_parser() -> Parser:
+    from lightdash_pre_commit.loaders import PositionSafeLoader
+
+    return PyYAMLParser("python", PositionSafeLoader, "pure-Python SafeLoader")
+
+
+def _auto_parser() -> Parser:
+    try:
+        return _c_parser()
+    except ValueError:
+        return _python_parser()
+
+
+PARSERS: Dict[str, Callable[[], Parser]] = {
+    "auto": _auto_parser,
+    "c": _c_parser,
+    "python": _python_parser,
+    "roundtrip": RoundTripParser,
+}
+
+
+def register_parser(name: str, factory: Callable[[], Parser]) -> None:
+    """
+    Register a parser backend so it can be selected with ``--parser``.
+
+    Args:
+        name (str): The backend name.
+        factory (Callable[[], Parser]): Creates the backend. Raises ValueError
+            if the backend cannot be used in this environment.
+    """
+    PARSERS[name] = factory
+
+
+def get_parser(name: str = "auto") -> Parser:
+    """
+    Create a parser backend by name.
+
+    Args:
+        name (str): The backend name. "auto" picks the libyaml loader when
+            available and falls back to the pure-Python loader.
+
+    Returns:
+        Parser: The parser backend.
+
+    Raises:
+        ValueError: If the backend is unknown or unavailable.
+    """
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser '{name}'")
+    return PARSERS[name]()
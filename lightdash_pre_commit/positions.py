@@ -0,0 +1,53 @@
+from typing import Optional
+from typing import Tuple
+
+Position = Tuple[Optional[int], Optional[int]]
+
+
+class MarkedDict(dict):
+    """
+    A mapping that remembers where it was defined.
+
+    ``line`` and ``column`` are 1-based. For a mapping that is the value of a
+    key they point at that key, so the position of a metric's details is the
+    line holding the metric's name. Otherwise they point at the first key of
+    the mapping itself.
+    """
+
+    line = None
+    column = None
+
+
+class Located:
+    """
+    Base class of the compact nodes of
+    :mod:`lightdash_pre_commit.nodes`, which copy the position of the mapping
+    they were built from.
+    """
+
+    __slots__ = ("line", "column")
+
+
+def position_of(node) -> Position:
+    """
+    Get the source position of a parsed node.
+
+    Args:
+        node: A value produced by one of the parser backends.
+
+    Returns:
+        Position: The 1-based line and column, or (None, None) if the node
+            does not carry a position.
+    """
+    if isinstance(node, (MarkedDict, Located)):
+        return node.line, node.column
+    lc = getattr(node, "lc", None)
+    if lc is not None and lc.line is not None:
+        # ruamel.yaml round-trip containers
+        return lc.line + 1, lc.col + 1
+    return None, None
+
+
+def mark_mapping(data: MarkedDict, mark) -> None:
+    data.line = mark.line + 1
+    data.column = mark.column + 1
@@ -0,0 +1,194 @@
+import mmap
+import re
+from typing import FrozenSet
+from typing import Optional
+
+# Files at least this large are searched through a memory map instead of
+# being read.
+MMAP_THRESHOLD = 1024 * 1024
+
+# Words whose presence decides whether a check can report anything, see
+# Check.may_report. "dimension" also matches "additional_dimensions".
+KEYS = ("metrics", "dimension")
+
+# A top-level "models" key, so the file is a mapping of models when it is
+# valid YAML.
+MODELS_KEY = re.compile(rb"^models[ \t]*:", re.MULTILINE)
+
+# A document marker, which only ends a file of a single document when it is
+# its first line.
+DOCUMENT_MARKER = re.compile(rb"^(?:---|\.\.\.)", re.MULTILINE)
+
+
+def scan(content) -> Optional[FrozenSet[str]]:
+    """
+    Find which of ``KEYS`` the raw bytes of a schema file mention.
+
+    A word counts wherever it appears, in a key, a value or a comment, so a
+    file may mention a key it does not define but never the other way round.
+
+    Args:
+        content: The file's bytes, or a memory map of the file.
+
+    Returns:
+        Optional[FrozenSet[str]]: The words found, or None when the bytes
+            cannot be judged without parsing: no top-level ``models`` key,
+            escape sequences that could spell a key, several documents, or
+            an encoding other than UTF-8.
+    """
+    if content.find(b"\0") != -1 or content.find(b"\\") != -1:
+        return None
+    if DOCUMENT_MARKER.search(content, 1) is not None:
+        return None
+    if MODELS_KEY.search(content) is None:
+        return None
+    return frozenset(key for key in KEYS if content.find(key.encode()) != -1)
+
+
+def scan_file(file_path: str) -> Optional[FrozenSet[str]]:
+    """
+    Find which of ``KEYS`` a schema file mentions without reading it whole.
+
+    Args:
+        file_path (str): The file.
+
+    Returns:
+        Optional[FrozenSet[str]]: See :func:`scan`.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(0, 2)
+        size = file.tell()
+        if size < MMAP_THRESHOLD:
+            file.seek(0)
+            return scan(file.read())
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            return scan(content)
+
+
+# Plain scalars that load as None.
+NULLS = ("", "~", "null", "Null", "NULL")
+
+# Plain scalars that load as timestamps, which fail to load when the date is
+# out of range.
+TIMESTAMP = re.compile(r"^[0-9]{4}-[0-9]")
+
+
+class _Unsure(Exception):
+    pass
+
+
+class _ShapeValidator:
+    # Mirrors the types that nodes.normalize requires of the keys it reads,
+    # for a file that mentions neither metrics nor dimensions
+
+    def __init__(self, events):
+        import yaml
+
+        self.yaml = yaml
+        self.events = iter(events)
+        self.anchors = set()
+
+    def next(self):
+        event = next(self.events, None)
+        if event is None or getattr(event, "tag", None) is not None:
+            raise _Unsure
+        anchor = getattr(event, "anchor", None)
+        if isinstance(event, self.yaml.AliasEvent):
+            if anchor not in self.anchors:
+                raise _Unsure
+        elif anchor is not None:
+            self.anchors.add(anchor)
+        if isinstance(event, self.yaml.ScalarEvent) and event.implicit[0]:
+            if TIMESTAMP.match(event.value):
+                raise _Unsure
+        return event
+
+    def is_null(self, event) -> bool:
+        return (
+            isinstance(event, self.yaml.ScalarEvent)
+            and event.implicit[0]
+            and event.value in NULLS
+        )
+
+    def skip(self, event) -> None:
+        if isinstance(event, self.yaml.MappingStartEvent):
+            self.mapping(event, {})
+        elif isinstance(event, self.yaml.SequenceStartEvent):
+            self.sequence(event, self.skip)
+
+    def mapping(self, event, fields: dict) -> None:
+        if self.is_null(event):
+            return
+        if not isinstance(event, self.yaml.MappingStartEvent):
+            raise _Unsure
+        while True:
+            key = self.next()
+            if isinstance(key, self.yaml.MappingEndEvent):
+                return
+            # Keys that are collections or merges fail to load or change the
+            # shape of the mapping
+            if not isinstance(key, self.yaml.ScalarEvent) or key.value == "<<":
+                raise _Unsure
+            fields.get(key.value, self.skip)(self.next())
+
+    def sequence(self, event, item) -> None:
+        if self.is_null(event):
+            return
+        if not isinstance(event, self.yaml.SequenceStartEvent):
+            raise _Unsure
+        while True:
+            event = self.next()
+            if isinstance(event, self.yaml.SequenceEndEvent):
+                return
+            item(event)
+
+    def meta(self, event) -> None:
+        self.mapping(event, {})
+
+    def column(self, event) -> None:
+        self.mapping(event, {"meta": self.meta})
+
+    def model(self, event) -> None:
+        self.mapping(
+            event,
+            {
+                "meta": self.meta,
+                "columns": lambda columns: self.sequence(columns, self.column),
+            },
+        )
+
+    def document(self) -> bool:
+        self.next()
+        if not isinstance(self.next(), self.yaml.DocumentStartEvent):
+            raise _Unsure
+        root = self.next()
+        if not isinstance(root, self.yaml.MappingStartEvent):
+            raise _Unsure
+        self.mapping(root, {"models": lambda models: self.sequence(models, self.model)})
+        # A second document is an error when loading
+        self.next()
+        return isinstance(self.next(), self.yaml.StreamEndEvent)
+
+
+def validate(events) -> bool:
+    """
+    Check from the parse events of a schema file that it loads and
+    normalizes without errors, without constructing it.
+
+    Only meant for files :func:`scan` found no metrics or dimensions in, whose
+    metrics and dimensions need no checking.
+
+    Args:
+        events: The parse events of the file.
+
+    Returns:
+        bool: True if the file is known to load cleanly, False if it has
+            errors or cannot be judged from its events, such as explicit tags
+            or merge keys.
+    """
+    import yaml
+
+    try:
+        return _ShapeValidator(events).document()
+    except (yaml.YAMLError, _Unsure):
+        return False
@@ -0,0 +1,165 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+PROFILE_ENV_VAR = "LIGHTDASH_PRECOMMIT_PROFILE"
+DEFAULT_TRACE_FILE = "lightdash_precommit_trace.json"
+
+# Number of files listed in the summary line.
+SLOWEST_FILES = 3
+
+
+def profiling_requested(flag: bool) -> bool:
+    """
+    Decide whether profiling is enabled by the command line or environment.
+
+    Args:
+        flag (bool): Whether --profile was given.
+
+    Returns:
+        bool: True if --profile was given or the LIGHTDASH_PRECOMMIT_PROFILE
+            environment variable is set to anything but "" or "0".
+    """
+    return flag or os.environ.get(PROFILE_ENV_VAR, "") not in ("", "0")
+
+
+class Profiler:
+    """
+    Record timed spans of a hook run and export them as Chrome trace events.
+
+    Spans cover each file and each phase of it (read, parse, walk, report).
+    Checks share a single walk, so the time spent in each check is
+    accumulated per file and recorded as consecutive spans inside the walk.
+    The trace can be opened in chrome://tracing or https://ui.perfetto.dev.
+    """
+
+    def __init__(
+        self, trace_path: str = DEFAULT_TRACE_FILE, cprofile_path: Optional[str] = None
+    ):
+        self.trace_path = trace_path
+        self.cprofile_path = cprofile_path
+        self.events: List[dict] = []
+        self.check_times: Dict[str, float] = {}
+        self._cprofile = None
+        self._started = None
+
+    def __getstate__(self) -> dict:
+        # Worker processes record their own events and send them back
+        state = self.__dict__.copy()
+        state["events"] = []
+        state["_cprofile"] = None
+        return state
+
+    def add_span(
+        self, name: str, category: str, start: float, duration: float, **args
+    ) -> None:
+        self.events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": duration * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = "phase", **args) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, category, start, time.perf_counter() - start, **args)
+
+    def timed(self, name: str, method: Callable) -> Callable:
+        """
+        Wrap a check's visitor method so its time is added to ``check_times``.
+
+        Args:
+            name (str): The check's name.
+            method (Callable): The visitor method.
+
+        Returns:
+            Callable: The wrapped method.
+        """
+        check_times = self.check_times
+        perf_counter = time.perf_counter
+
+        def wrapper(*args):
+            start = perf_counter()
+            try:
+                method(*args)
+            finally:
+                check_times[name] = check_times.get(name, 0.0) + perf_counter() - start
+
+        return wrapper
+
+    @contextlib.contextmanager
+    def walk_span(self) -> Iterator[None]:
+        """
+        Record a walk and one span per check with the time it accumulated.
+        """
+        self.check_times.clear()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span("walk", "phase", start, time.perf_counter() - start)
+            offset = start
+            for name, duration in self.check_times.items():
+                self.add_span(name, "check", offset, duration, accumulated=True)
+                offset += duration
+
+    def drain(self) -> List[dict]:
+        events = self.events
+        self.events = []
+        return events
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self.cprofile_path:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop(self) -> str:
+        """
+        Finish profiling, write the trace and the optional cProfile dump.
+
+        Returns:
+            str: A one-line summary with files per second and the slowest
+                files.
+        """
+        duration = time.perf_counter() - self._started
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_path)
+        self.add_span("run", "run", self._started, duration)
+
+        with open(self.trace_path, "w") as file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, file)
+
+        files = [event for event in self.events if event["cat"] == "file"]
+        files.sort(key=lambda event: event["dur"], reverse=True)
+        rate = len(files) / duration if duration else 0.0
+        slowest = ", ".join(
+            f"{event['name']} ({event['dur'] / 1000:.1f} ms)"
+            for event in files[:SLOWEST_FILES]
+        )
+        summary = (
+            f"Profiled {len(files)} files in {duration:.3f}s ({rate:.1f} files/s)."
+        )
+        if slowest:
+            summary += f" Slowest: {slowest}."
+        return f"{summary} Trace written to '{self.trace_path}'."
@@ -0,0 +1,359 @@
+import argparse
+import json
+import os
+import re
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from lightdash_pre_commit.cache import DEFAULT_CACHE_DIR
+from lightdash_pre_commit.cache import package_version
+from lightdash_pre_commit.core import Check
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.diagnostics import Diagnostic
+from lightdash_pre_commit.diagnostics import format_location
+from lightdash_pre_commit.nodes import AdditionalDimension
+from lightdash_pre_commit.nodes import Column
+from lightdash_pre_commit.nodes import Dimension
+from lightdash_pre_commit.nodes import Metric
+from lightdash_pre_commit.nodes import Model
+from lightdash_pre_commit.parsers import Parser
+from lightdash_pre_commit.positions import position_of
+
+# Matches the files the hooks run on, see .pre-commit-hooks.yaml
+SCHEMA_FILE_PATTERN = re.compile(r"models/.*\.(yml|yaml)$")
+
+INDEX_FILE_NAME = "project_index.json"
+
+# Bump when the layout of the index file changes.
+INDEX_FORMAT = "1"
+
+# Clashes are reported under the id of the hook that looks for them.
+PROJECT_DUPLICATES_RULE = "check-duplicate-dims-and-metrics"
+
+# (name, model, kind, line, column)
+Definition = Tuple[str, str, str, Optional[int], Optional[int]]
+
+
+class DefinitionsCollector(Check):
+    """
+    Collect every metric and dimension name a file defines, with the model it
+    belongs to. Visits the same nodes as the duplicate names check.
+    """
+
+    name = "definitions"
+
+    def may_report(self, keys: FrozenSet[str]) -> bool:
+        return bool(keys)
+
+    def start(self) -> None:
+        super().start()
+        self.definitions = []
+
+    def add(self, name: str, model: Model, kind: str, node) -> None:
+        line, column = position_of(node)
+        self.definitions.append((name, model.name, kind, line, column))
+
+    def visit_model_metric(self, model: Model, metric: Metric) -> None:
+        self.add(metric.name, model, "metric", metric)
+
+    def visit_dimension(
+        self, model: Model, column: Column, dimension: Dimension
+    ) -> None:
+        self.add(column.name, model, "dimension", column)
+
+    def visit_additional_dimension(
+        self, model: Model, column: Column, dimension: AdditionalDimension
+    ) -> None:
+        self.add(dimension.name, model, "additional_dimension", dimension)
+
+    def visit_column_metric(self, model: Model, column: Column, metric: Metric) -> None:
+        self.add(metric.name, model, "metric", metric)
+
+
+def discover_schema_files(root: str) -> List[str]:
+    """
+    List the dbt schema files of a project.
+
+    Uses ``git ls-files`` so ignored files such as installed packages are
+    left out, and falls back to walking the directory outside a git
+    repository.
+
+    Args:
+        root (str): The project root.
+
+    Returns:
+        List[str]: Paths relative to ``root`` matching the hooks' file pattern.
+    """
+    import subprocess
+
+    try:
+        output = subprocess.run(
+            ["git", "ls-files", "-z"],
+            cwd=root,
+            capture_output=True,
+            check=True,
+        ).stdout.decode("utf-8")
+        paths = [path for path in output.split("\0") if path]
+    except (OSError, subprocess.CalledProcessError):
+        paths = []
+        for dir_path, dir_names, file_names in os.walk(root):
+            dir_names[:] = [name for name in dir_names if not name.startswith(".")]
+            for file_name in file_names:
+                path = os.path.relpath(os.path.join(dir_path, file_name), root)
+                paths.append(path.replace(os.sep, "/"))
+    return sorted(path for path in paths if SCHEMA_FILE_PATTERN.search(path))
+
+
+class ProjectIndex:
+    """
+    Persistent index of where every metric and dimension name in a project is
+    defined.
+
+    ``files`` maps each schema file to the names it defines, and ``names`` is
+    the reverse map from each name to its definitions. Only files whose size
+    or modification time changed since the index was written are parsed
+    again, so checking a handful of changed files stays cheap on a large
+    project.
+    """
+
+    def __init__(self, root: str = ".", cache_dir: str = DEFAULT_CACHE_DIR):
+        self.root = root
+        self.path = os.path.join(cache_dir, INDEX_FILE_NAME)
+        self.version = package_version()
+        self.files: Dict[str, dict] = {}
+        self.names: Dict[str, List[Tuple[str, Definition]]] = {}
+        self.dirty = False
+
+    def relative(self, filename: str) -> str:
+        """
+        Get the key of a file given to a hook in the index.
+
+        Args:
+            filename (str): The file, as passed to the hook.
+
+        Returns:
+            str: Its path relative to the project root, with ``/`` separators.
+        """
+        return os.path.relpath(filename, self.root).replace(os.sep, "/")
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("format") != INDEX_FORMAT or data.get("version") != self.version:
+            return
+        for file_path, entry in data["files"].items():
+            entry["definitions"] = [tuple(d) for d in entry["definitions"]]
+            self._add(file_path, entry)
+
+    def save(self) -> None:
+        import tempfile
+
+        if not self.dirty:
+            return
+        data = {"format": INDEX_FORMAT, "version": self.version, "files": self.files}
+        try:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as file:
+                json.dump(data, file)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError:
+            pass
+
+    def _add(self, file_path: str, entry: dict) -> None:
+        self.files[file_path] = entry
+        for definition in entry["definitions"]:
+            self.names.setdefault(definition[0], []).append((file_path, definition))
+
+    def remove(self, file_path: str) -> None:
+        """
+        Drop a file's contributions from the index.
+
+        Args:
+            file_path (str): The file, relative to the project root.
+        """
+        entry = self.files.pop(file_path, None)
+        if entry is None:
+            return
+        for definition in entry["definitions"]:
+            remaining = [
+                item for item in self.names[definition[0]] if item[0] != file_path
+            ]
+            if remaining:
+                self.names[definition[0]] = remaining
+            else:
+                del self.names[definition[0]]
+        self.dirty = True
+
+    def update(
+        self,
+        file_path: str,
+        stat: Optional[os.stat_result],
+        definitions: List[Definition],
+    ) -> None:
+        """
+        Replace a file's contributions to the index.
+
+        Args:
+            file_path (str): The file, relative to the project root.
+            stat (Optional[os.stat_result]): The file's stat when it was read,
+                or None for files not read here, such as those of the
+                partial results of a shard.
+            definitions (List[Definition]): The names the file defines.
+        """
+        self.remove(file_path)
+        self._add(
+            file_path,
+            {
+                "mtime_ns": None if stat is None else stat.st_mtime_ns,
+                "size": None if stat is None else stat.st_size,
+                "definitions": definitions,
+            },
+        )
+        self.dirty = True
+
+    def refresh(self, parser: Parser, file_paths: Sequence[str]) -> None:
+        """
+        Bring the index up to date with the project, parsing only the files
+        that changed since it was last written.
+
+        Args:
+            parser (Parser): The parser backend to read changed files with.
+            file_paths (Sequence[str]): Every schema file of the project,
+                relative to the project root.
+        """
+        current = set(file_paths)
+        for file_path in list(self.files):
+            if file_path not in current:
+                self.remove(file_path)
+        self.refresh_files(parser, file_paths)
+
+    def refresh_files(self, parser: Parser, file_paths: Sequence[str]) -> None:
+        """
+        Parse the given files again if they changed since the index was
+        written, leaving the other files of the index as they are.
+
+        Args:
+            parser (Parser): The parser backend to read changed files with.
+            file_paths (Sequence[str]): Schema files of the project, relative
+                to the project root.
+        """
+        collector = DefinitionsCollector()
+        core = Core([collector], parser=parser)
+        for file_path in file_paths:
+            full_path = os.path.join(self.root, file_path)
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                self.remove(file_path)
+                continue
+            entry = self.files.get(file_path)
+            if (
+                entry is not None
+                and entry["mtime_ns"] == stat.st_mtime_ns
+                and entry["size"] == stat.st_size
+            ):
+                continue
+            try:
+                core.check_file(full_path)
+                definitions = collector.definitions
+            except Exception:
+                # Unparseable files are reported by the per-file checks
+                definitions = []
+            self.update(file_path, stat, definitions)
+
+    def clashes(self, file_path: str) -> List[Diagnostic]:
+        """
+        Find names a file defines that are also defined in another file.
+
+        Args:
+            file_path (str): The file, relative to the project root.
+
+        Returns:
+            List[Diagnostic]: One error per clashing definition in the file.
+        """
+        errors = []
+        entry = self.files.get(file_path)
+        if entry is None:
+            return errors
+        for name, model, kind, line, column in entry["definitions"]:
+            others = [
+                (other_path, definition)
+                for other_path, definition in self.names[name]
+                if other_path != file_path
+            ]
+            if not others:
+                continue
+            locations = ", ".join(
+                f"'{definition[1]}' ({format_location(other_path, definition[3:])})"
+                for other_path, definition in others
+            )
+            errors.append(
+                Diagnostic(
+                    f"Name '{name}' in model '{model}' is also defined in other "
+                    f"models of the project: {locations}.",
+                    line,
+                    column,
+                    rule=PROJECT_DUPLICATES_RULE,
+                    model=model,
+                    node=name,
+                )
+            )
+        return errors
+
+    def check(
+        self, parser: Parser, filenames: Sequence[str]
+    ) -> Iterator[Tuple[str, List[Diagnostic]]]:
+        """
+        Update the index and report clashes for the given files.
+
+        Args:
+            parser (Parser): The parser backend to read changed files with.
+            filenames (Sequence[str]): The files being checked, as passed to
+                the hook.
+
+        Yields:
+            Tuple[str, List[Diagnostic]]: Each file with clashing names and
+                its errors.
+        """
+        self.load()
+        relative = {filename: self.relative(filename) for filename in filenames}
+        file_paths = discover_schema_files(self.root)
+        known = set(file_paths)
+        file_paths.extend(path for path in relative.values() if path not in known)
+        self.refresh(parser, file_paths)
+        self.save()
+        for filename, file_path in relative.items():
+            errors = self.clashes(file_path)
+            if errors:
+                yield filename, errors
+
+
+def add_project_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options of the project-wide duplicate names check.
+
+    Args:
+        parser (argparse.ArgumentParser): The hook's argument parser.
+    """
+    parser.add_argument(
+        "--project-duplicates",
+        action="store_true",
+        help="Also report metric and dimension names defined in more than one "
+        "file of the project.",
+    )
+    parser.add_argument(
+        "--project-root",
+        default=".",
+        help="Root of the dbt project used by --project-duplicates.",
+    )
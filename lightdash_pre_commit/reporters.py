@@ -0,0 +1,320 @@
+import json
+import os
+from typing import Dict
+from typing import IO
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from lightdash_pre_commit.diagnostics import Diagnostic
+from lightdash_pre_commit.diagnostics import format_location
+
+FORMATS = ("text", "json", "sarif", "junit")
+
+# Output is written in chunks of about this many characters.
+BUFFER_SIZE = 64 * 1024
+
+# Rule id of files that could not be read or parsed.
+FAILURE_RULE = "failed-to-process"
+
+TOOL_NAME = "lightdash-pre-commit"
+TOOL_URI = "https://github.com/dbt-checkpoint/dbt-checkpoint"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+class BufferedOutput:
+    """
+    Collect output and write it to a stream in large chunks.
+
+    Writing one line at a time is slow when there are thousands of them, but
+    only the pending chunk is held in memory.
+    """
+
+    def __init__(self, stream: IO[str], size: int = BUFFER_SIZE):
+        self.stream = stream
+        self.size = size
+        self.parts: List[str] = []
+        self.pending = 0
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+        self.pending += len(text)
+        if self.pending >= self.size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.parts:
+            self.stream.write("".join(self.parts))
+            self.parts = []
+            self.pending = 0
+        self.stream.flush()
+
+
+class Reporter:
+    """
+    Write the results of each file as they are produced.
+
+    Subclasses override :meth:`start`, :meth:`file` and :meth:`finish`.
+    """
+
+    def __init__(self, output: BufferedOutput, rules: Sequence[str]):
+        self.output = output
+        self.rules = list(rules)
+
+    def start(self) -> None:
+        pass
+
+    def file(
+        self, file_path: str, errors: List[Diagnostic], failure: Optional[str]
+    ) -> None:
+        """
+        Report the results of one file.
+
+        Args:
+            file_path (str): The file, as it should be shown.
+            errors (List[Diagnostic]): Its diagnostics.
+            failure (Optional[str]): Why it could not be processed, if so.
+        """
+        raise NotImplementedError
+
+    def finish(self) -> None:
+        self.output.flush()
+
+
+class TextReporter(Reporter):
+    # The hooks' original output, one line per diagnostic
+    def file(
+        self, file_path: str, errors: List[Diagnostic], failure: Optional[str]
+    ) -> None:
+        write = self.output.write
+        if errors:
+            failed = any(error.severity == "error" for error in errors)
+            kind = "Errors" if failed else "Warnings"
+            write(f"{kind} found in '{file_path}':\n")
+            for error in errors:
+                write(f"{error.format(file_path)}\n")
+        if failure is not None:
+            write(f"Failed to process '{file_path}': {failure}\n")
+
+
+def records(
+    file_path: str, errors: List[Diagnostic], failure: Optional[str]
+) -> Iterator[dict]:
+    """
+    Describe the results of a file as flat records.
+
+    Args:
+        file_path (str): The file.
+        errors (List[Diagnostic]): Its diagnostics.
+        failure (Optional[str]): Why it could not be processed, if so.
+
+    Yields:
+        dict: One record per diagnostic, then one for the failure. A failure
+            is reported as an error of rule ``FAILURE_RULE``.
+    """
+    for error in errors:
+        yield {
+            "rule": error.rule,
+            "severity": error.severity,
+            "file": file_path,
+            "line": error.line,
+            "column": error.column,
+            "model": error.model,
+            "node": error.node,
+            "message": error.message,
+            "occurrences": [list(occurrence) for occurrence in error.occurrences],
+        }
+    if failure is not None:
+        yield {
+            "rule": FAILURE_RULE,
+            "severity": "error",
+            "file": file_path,
+            "line": None,
+            "column": None,
+            "model": None,
+            "node": None,
+            "message": failure,
+            "occurrences": [],
+        }
+
+
+def qualified_name(record: dict) -> List[str]:
+    # The model and node names of a record, leaving out unknown ones
+    return [str(name) for name in (record["model"], record["node"]) if name is not None]
+
+
+def _json(value) -> str:
+    # Names can be any YAML scalar, such as dates
+    return json.dumps(value, default=str)
+
+
+class JsonReporter(Reporter):
+    # A JSON array with one object per diagnostic, see records()
+    def start(self) -> None:
+        self.output.write("[")
+        self.separator = "\n"
+
+    def file(
+        self, file_path: str, errors: List[Diagnostic], failure: Optional[str]
+    ) -> None:
+        for record in records(file_path, errors, failure):
+            self.output.write(f"{self.separator}{_json(record)}")
+            self.separator = ",\n"
+
+    def finish(self) -> None:
+        self.output.write("\n]\n")
+        super().finish()
+
+
+class SarifReporter(Reporter):
+    # A SARIF 2.1.0 log with a single run
+    def start(self) -> None:
+        from lightdash_pre_commit.cache import package_version
+
+        log = {
+            "$schema": SARIF_SCHEMA,
+            "version": "2.1.0",
+            "runs": [
+                {
+                    "tool": {
+                        "driver": {
+                            "name": TOOL_NAME,
+                            "version": package_version(),
+                            "informationUri": TOOL_URI,
+                            "rules": [{"id": rule} for rule in self.rules],
+                        }
+                    },
+                    "results": [],
+                }
+            ],
+        }
+        # Results are streamed between the two halves of the log
+        self.head, self.tail = json.dumps(log).split('"results": []')
+        self.output.write(f'{self.head}"results": [')
+        self.separator = "\n"
+
+    @staticmethod
+    def location(file_path: str, line: Optional[int], column: Optional[int]) -> dict:
+        physical = {"artifactLocation": {"uri": file_path.replace(os.sep, "/")}}
+        if line is not None:
+            physical["region"] = {"startLine": line, "startColumn": column}
+        return {"physicalLocation": physical}
+
+    def file(
+        self, file_path: str, errors: List[Diagnostic], failure: Optional[str]
+    ) -> None:
+        for record in records(file_path, errors, failure):
+            location = self.location(file_path, record["line"], record["column"])
+            names = qualified_name(record)
+            if names:
+                location["logicalLocations"] = [
+                    {
+                        "name": names[-1],
+                        "fullyQualifiedName": ".".join(names),
+                        "kind": "member",
+                    }
+                ]
+            result: Dict = {
+                "ruleId": record["rule"],
+                "level": record["severity"],
+                "message": {"text": record["message"]},
+                "locations": [location],
+            }
+            if len(record["occurrences"]) > 1:
+                result["relatedLocations"] = [
+                    self.location(file_path, line, column)
+                    for line, column in record["occurrences"]
+                ]
+            self.output.write(f"{self.separator}{_json(result)}")
+            self.separator = ",\n"
+
+    def finish(self) -> None:
+        self.output.write(f"\n]{self.tail}\n")
+        super().finish()
+
+
+class JUnitReporter(Reporter):
+    # One test suite per file and one failing test case per error. Warnings
+    # are passing test cases with the warning as output
+    def start(self) -> None:
+        self.output.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        self.output.write(f"<testsuites name={self.attribute(TOOL_NAME)}>\n")
+
+    @staticmethod
+    def attribute(value) -> str:
+        from xml.sax.saxutils import quoteattr
+
+        return quoteattr(str(value))
+
+    @staticmethod
+    def text(value) -> str:
+        from xml.sax.saxutils import escape
+
+        return escape(str(value))
+
+    def file(
+        self, file_path: str, errors: List[Diagnostic], failure: Optional[str]
+    ) -> None:
+        cases = []
+        failures = 0
+        for record in records(file_path, errors, failure):
+            location = format_location(file_path, (record["line"], record["column"]))
+            name = ".".join(qualified_name(record)) or location
+            name = f"{record['rule']}: {name}"
+            case = (
+                f"    <testcase classname={self.attribute(file_path)} "
+                f"name={self.attribute(name)}>"
+            )
+            if record["severity"] == "error":
+                failures += 1
+                case += (
+                    f"<failure type={self.attribute(record['rule'])} "
+                    f"message={self.attribute(record['message'])}>"
+                    f"{self.text(location)}</failure>"
+                )
+            else:
+                case += (
+                    f"<system-out>{self.text(location)}: warning: "
+                    f"{self.text(record['message'])}</system-out>"
+                )
+            cases.append(f"{case}</testcase>\n")
+        if not cases:
+            cases.append(
+                f"    <testcase classname={self.attribute(file_path)} "
+                f"name={self.attribute(TOOL_NAME)}/>\n"
+            )
+        self.output.write(
+            f'  <testsuite name={self.attribute(file_path)} tests="{len(cases)}" '
+            f'failures="{failures}" errors="0">\n'
+        )
+        for case in cases:
+            self.output.write(case)
+        self.output.write("  </testsuite>\n")
+
+    def finish(self) -> None:
+        self.output.write("</testsuites>\n")
+        super().finish()
+
+
+REPORTERS = {
+    "text": TextReporter,
+    "json": JsonReporter,
+    "sarif": SarifReporter,
+    "junit": JUnitReporter,
+}
+
+
+def get_reporter(name: str, stream: IO[str], rules: Sequence[str]) -> Reporter:
+    """
+    Create the reporter of an output format.
+
+    Args:
+        name (str): One of ``FORMATS``.
+        stream (IO[str]): Where to write, usually stdout.
+        rules (Sequence[str]): Ids of every rule that may report.
+
+    Returns:
+        Reporter: The reporter, not started yet.
+    """
+    return REPORTERS[name](BufferedOutput(stream), rules)
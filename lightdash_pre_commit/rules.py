@@ -0,0 +1,99 @@
+import os
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from lightdash_pre_commit.core import Check
+from lightdash_pre_commit.diagnostics import SEVERITIES
+
+DEFAULT_CONFIG_FILE = ".lightdash-precommit.yml"
+
+# Settings a rule accepts in the config file, with their defaults.
+RULE_SETTINGS = {"enabled": True, "severity": "error"}
+
+
+def load_rule_config(path: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Read the rule settings of a project.
+
+    The config file is YAML with a ``rules`` mapping from check names to
+    their settings::
+
+        rules:
+          check-duplicate-dims-and-metrics:
+            severity: warning
+          find_missing_model_group_labels:
+            enabled: false
+
+    Args:
+        path (Optional[str]): The config file. Defaults to
+            ``DEFAULT_CONFIG_FILE`` in the current directory, which need not
+            exist.
+
+    Returns:
+        Dict[str, dict]: The complete settings of each configured rule.
+
+    Raises:
+        ValueError: If the file cannot be read or is not a valid config.
+    """
+    if path is None:
+        if not os.path.exists(DEFAULT_CONFIG_FILE):
+            return {}
+        path = DEFAULT_CONFIG_FILE
+
+    import yaml
+
+    try:
+        with open(path, "rb") as file:
+            data = yaml.safe_load(file)
+    except (OSError, yaml.YAMLError) as e:
+        raise ValueError(f"Cannot read '{path}': {e}")
+
+    if data is None:
+        data = {}
+    if not isinstance(data, dict) or not isinstance(data.get("rules") or {}, dict):
+        raise ValueError(f"'{path}' must have a 'rules' mapping of rule names")
+
+    config = {}
+    for name, settings in (data.get("rules") or {}).items():
+        settings = settings or {}
+        if not isinstance(settings, dict):
+            raise ValueError(f"Settings of rule '{name}' must be a mapping")
+        unknown = sorted(set(settings) - set(RULE_SETTINGS))
+        if unknown:
+            raise ValueError(
+                f"Unknown settings {', '.join(unknown)} for rule '{name}', "
+                f"expected {', '.join(RULE_SETTINGS)}"
+            )
+        settings = {**RULE_SETTINGS, **settings}
+        if not isinstance(settings["enabled"], bool):
+            raise ValueError(f"'enabled' of rule '{name}' must be true or false")
+        if settings["severity"] not in SEVERITIES:
+            raise ValueError(
+                f"'severity' of rule '{name}' must be one of {', '.join(SEVERITIES)}"
+            )
+        config[name] = settings
+    return config
+
+
+def configure_checks(checks: Sequence[Check], config: Dict[str, dict]) -> List[Check]:
+    """
+    Apply rule settings to the checks of a hook.
+
+    Args:
+        checks (Sequence[Check]): The hook's checks.
+        config (Dict[str, dict]): See :func:`load_rule_config`. Rules the
+            hook does not run are ignored.
+
+    Returns:
+        List[Check]: The enabled checks, with their severity set.
+    """
+    configured = []
+    for check in checks:
+        settings = config.get(check.name, RULE_SETTINGS)
+        if not settings["enabled"]:
+            continue
+        check.severity = settings["severity"]
+        configured.append(check)
+    return configured
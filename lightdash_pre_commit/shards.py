@@ -0,0 +1,400 @@
+import argparse
+import json
+import os
+import sys
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from lightdash_pre_commit.diagnostics import Diagnostic
+from lightdash_pre_commit.reporters import FORMATS
+from lightdash_pre_commit.reporters import get_reporter
+from lightdash_pre_commit.reporters import Reporter
+
+# Bump when the layout of partial result files changes.
+PARTIAL_FORMAT = "2"
+
+Shard = Tuple[int, int]
+
+
+def parse_shard(value: str) -> Shard:
+    """
+    Parse a ``I/N`` shard from the command line.
+
+    Args:
+        value (str): The shard, numbered from 1.
+
+    Returns:
+        Shard: The shard's number and the number of shards.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a shard.
+    """
+    number, _, count = value.partition("/")
+    try:
+        shard = int(number), int(count)
+    except ValueError:
+        shard = None
+    if shard is None or not 1 <= shard[0] <= shard[1]:
+        raise argparse.ArgumentTypeError(
+            f"expected I/N with 1 <= I <= N, got '{value}'"
+        )
+    return shard
+
+
+def shard_of(file_path: str, count: int) -> int:
+    """
+    Assign a file to a shard by a hash of its path, so every run and every
+    machine splits the same files the same way.
+
+    Args:
+        file_path (str): The file. Paths are taken relative to the current
+            directory, the repository root in CI, so it does not matter how
+            they were spelled.
+        count (int): The number of shards.
+
+    Returns:
+        int: The file's shard, numbered from 1.
+    """
+    import hashlib
+
+    key = os.path.relpath(file_path).replace(os.sep, "/").encode("utf-8")
+    digest = hashlib.sha1(key).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def select_shard(filenames: Sequence[str], shard: Shard) -> List[str]:
+    number, count = shard
+    return [path for path in filenames if shard_of(path, count) == number]
+
+
+def project_definitions(
+    index, parser, filenames: Sequence[str], shard: Shard
+) -> Dict[str, list]:
+    """
+    Collect the names defined by the shard's part of the schema files of the
+    project that were not given to the run.
+
+    A run without shards looks for names defined in several files across the
+    whole project, so each shard indexes a share of the other files for the
+    merge, split the same way as the files it checks.
+
+    Args:
+        index (ProjectIndex): The project index, which keeps the names of
+            files that did not change since the last run.
+        parser (Parser): The parser backend to read changed files with.
+        filenames (Sequence[str]): Every file given to the run, before it
+            was split.
+        shard (Shard): The shard.
+
+    Returns:
+        Dict[str, list]: The definitions of each file, keyed by its path
+            relative to the project root.
+    """
+    from lightdash_pre_commit.project_index import discover_schema_files
+
+    given = {index.relative(filename) for filename in filenames}
+    file_paths = select_shard(
+        [path for path in discover_schema_files(index.root) if path not in given],
+        shard,
+    )
+    index.load()
+    index.refresh_files(parser, file_paths)
+    index.save()
+    return {
+        file_path: [list(definition) for definition in entry["definitions"]]
+        for file_path, entry in ((path, index.files.get(path)) for path in file_paths)
+        if entry is not None and entry["definitions"]
+    }
+
+
+class PartialResults(Reporter):
+    """
+    Write the results of a shard to a file for :func:`merge`, instead of
+    reporting them.
+
+    The file holds the diagnostics of each of the shard's files, as lists of
+    the arguments of :class:`Diagnostic`, and the definitions of every
+    metric and dimension name, keyed by name, so the merge can find names
+    defined in files of different shards. When looking for such names, it
+    also holds the names defined by the shard's share of the project's other
+    files, see :func:`project_definitions`.
+
+    Args:
+        path (str): The partial result file to write.
+        shard (Shard): The shard the results are of.
+        rules (Sequence[str]): Ids of every rule that may report.
+        signature (str): Describes the checks and options, which must be the
+            same for every shard.
+        filenames (Sequence[str]): Every file given to the run, before it was
+            split, so the merge can report files in that order.
+        definitions (Dict[str, list]): The definitions of each file, filled
+            in as files are checked. Entries are removed once written.
+        index: The :class:`ProjectIndex` when the merge looks for names
+            defined in several files, None otherwise.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        shard: Shard,
+        rules: Sequence[str],
+        signature: str,
+        filenames: Sequence[str],
+        definitions: Dict[str, list],
+        index=None,
+    ):
+        super().__init__(None, rules)
+        self.path = path
+        self.shard = shard
+        self.signature = signature
+        self.positions = {path: position for position, path in enumerate(filenames)}
+        self.definitions = definitions
+        self.index = index
+        self.files: List[list] = []
+        self.names: Dict[str, List[list]] = {}
+        # Set by the engine, see project_definitions
+        self.project_files: Dict[str, list] = {}
+        self.failed = False
+
+    def file(
+        self, file_path: str, errors: List[Diagnostic], failure: Optional[str]
+    ) -> None:
+        number = len(self.files)
+        self.files.append(
+            [
+                self.positions.get(file_path, number),
+                file_path,
+                failure,
+                [
+                    [
+                        error.message,
+                        error.line,
+                        error.column,
+                        error.occurrences,
+                        error.severity,
+                        error.rule,
+                        error.model,
+                        error.node,
+                    ]
+                    for error in errors
+                ],
+                # The file's key in the project index
+                None if self.index is None else self.index.relative(file_path),
+            ]
+        )
+        for name, *definition in self.definitions.pop(file_path, ()):
+            self.names.setdefault(name, []).append([number, *definition])
+
+    def finish(self) -> None:
+        import tempfile
+
+        from lightdash_pre_commit.cache import package_version
+
+        data = {
+            "format": PARTIAL_FORMAT,
+            "version": package_version(),
+            "shard": list(self.shard),
+            "signature": self.signature,
+            "rules": self.rules,
+            "project_duplicates": self.index is not None,
+            "files": self.files,
+            "definitions": self.names,
+            "project_files": self.project_files,
+        }
+        try:
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as file:
+                json.dump(data, file, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(
+                f"Cannot write the partial results to '{self.path}': {e}",
+                file=sys.stderr,
+            )
+            self.failed = True
+            return
+        number, count = self.shard
+        print(
+            f"Wrote the results of {len(self.files)} file(s) of shard "
+            f"{number}/{count} to '{self.path}'",
+            file=sys.stderr,
+        )
+
+
+def load_partial(path: str) -> dict:
+    """
+    Read a partial result file written by :class:`PartialResults`.
+
+    Args:
+        path (str): The file.
+
+    Returns:
+        dict: Its content.
+
+    Raises:
+        ValueError: If the file cannot be read or was not written by this
+            version of the hooks.
+    """
+    from lightdash_pre_commit.cache import package_version
+
+    try:
+        with open(path, "r") as file:
+            data = json.load(file)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"cannot read '{path}': {e}")
+    if (
+        not isinstance(data, dict)
+        or data.get("format") != PARTIAL_FORMAT
+        or data.get("version") != package_version()
+    ):
+        raise ValueError(
+            f"'{path}' is not a partial result file of this version of the hooks"
+        )
+    return data
+
+
+def check_partials(partials: Sequence[dict]) -> None:
+    """
+    Make sure partial results are of the same run, with one of each shard.
+
+    Args:
+        partials (Sequence[dict]): The loaded partial result files.
+
+    Raises:
+        ValueError: If they cannot be merged.
+    """
+    first = partials[0]
+    count = first["shard"][1]
+    for partial in partials:
+        if (
+            partial["signature"] != first["signature"]
+            or partial["project_duplicates"] != first["project_duplicates"]
+            or partial["shard"][1] != count
+        ):
+            raise ValueError(
+                "the partial results were written with different checks, "
+                "options or numbers of shards"
+            )
+    numbers = sorted(partial["shard"][0] for partial in partials)
+    if numbers != list(range(1, count + 1)):
+        missing = sorted(set(range(1, count + 1)) - set(numbers))
+        if missing:
+            shards = ", ".join(f"{number}/{count}" for number in missing)
+            raise ValueError(f"missing the results of shard(s) {shards}")
+        raise ValueError("the results of a shard were given more than once")
+
+
+def merge(paths: Sequence[str], output_format: str = "text") -> int:
+    """
+    Combine the partial results of every shard, report them and look for
+    names defined in several files.
+
+    Files are reported in the order they were given to the shards, followed
+    by the names they share with other files of the project, the same as a
+    run without shards.
+
+    Args:
+        paths (Sequence[str]): The partial result files, one per shard.
+        output_format (str): One of ``FORMATS``.
+
+    Returns:
+        int: 1 if any file had errors or failed to process, 2 if the partial
+            results cannot be merged, 0 otherwise.
+    """
+    from lightdash_pre_commit.project_index import ProjectIndex
+
+    try:
+        partials = [load_partial(path) for path in paths]
+        check_partials(partials)
+    except ValueError as e:
+        print(f"Cannot merge: {e}", file=sys.stderr)
+        return 2
+
+    files = []
+    # Keyed by path relative to the project root, as in the project index
+    definitions: Dict[str, list] = {}
+    for partial in partials:
+        files.extend(partial["files"])
+        for name, entries in partial["definitions"].items():
+            for number, *definition in entries:
+                file_path = partial["files"][number][4]
+                definitions.setdefault(file_path, []).append((name, *definition))
+        for file_path, entries in partial["project_files"].items():
+            definitions[file_path] = [tuple(definition) for definition in entries]
+    files.sort(key=lambda entry: entry[0])
+
+    index = None
+    if partials[0]["project_duplicates"]:
+        # Files are added in the order the project index adds them, so other
+        # definitions are listed in the same order whatever the shards
+        index = ProjectIndex()
+        for file_path in sorted(definitions):
+            index.update(file_path, None, definitions[file_path])
+
+    rules = list(dict.fromkeys(rule for p in partials for rule in p["rules"]))
+    reporter = get_reporter(output_format, sys.stdout, rules)
+    reporter.start()
+    error_flag = False
+    for _, file_path, failure, errors, _ in files:
+        errors = [Diagnostic(*error) for error in errors]
+        reporter.file(file_path, errors, failure)
+        if failure is not None or any(error.severity == "error" for error in errors):
+            error_flag = True
+    if index is not None:
+        for _, file_path, _, _, key in files:
+            errors = index.clashes(key)
+            if errors:
+                reporter.file(file_path, errors, None)
+                error_flag = True
+    reporter.finish()
+    print(
+        f"Merged the results of {len(files)} file(s) from {len(partials)} shard(s)",
+        file=sys.stderr,
+    )
+    return 1 if error_flag else 0
+
+
+def add_shard_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options splitting a run into shards.
+
+    Args:
+        parser (argparse.ArgumentParser): The hook's argument parser.
+    """
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        metavar="I/N",
+        help="Only check the files of shard I of N, split by a hash of their "
+        "paths, so N machines can each check a part of the files.",
+    )
+    parser.add_argument(
+        "--shard-output",
+        metavar="PATH",
+        help="Write the results, with the names each file defines, to a partial "
+        "result file instead of reporting them. Combine the files of every shard "
+        "with 'lightdash-check merge'.",
+    )
+
+
+def merge_main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="lightdash-check merge",
+        description="Report the combined partial results of every shard.",
+    )
+    parser.add_argument(
+        "partials", nargs="+", metavar="PATH", help="Partial result files"
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="Output format of the diagnostics. Defaults to text.",
+    )
+    args = parser.parse_args(argv)
+    return merge(args.partials, args.format)
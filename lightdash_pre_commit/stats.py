@@ -0,0 +1,53 @@
+from typing import Dict
+from typing import List
+
+from lightdash_pre_commit.nodes import Summary
+
+HEADER = (
+    "File",
+    "Model",
+    "Dimensions",
+    "Additional dimensions",
+    "Column metrics",
+    "Model metrics",
+)
+
+
+def _counts(node) -> List[str]:
+    return [
+        str(node.dimensions),
+        str(node.additional_dimensions),
+        str(node.column_metrics),
+        str(node.model_metrics),
+    ]
+
+
+def format_summaries(summaries: Dict[str, Summary]) -> str:
+    """
+    Lay out the feature summary of each checked file as a table.
+
+    Args:
+        summaries (Dict[str, Summary]): The summary of each file, in the
+            order the files were checked.
+
+    Returns:
+        str: One row per model, then a row of totals over every file.
+    """
+    rows = [list(HEADER)]
+    total = Summary()
+    for file_path, summary in summaries.items():
+        for model in summary.models:
+            rows.append([file_path, str(model.name), *_counts(model)])
+            total.add(model)
+    rows.append(
+        [f"Total ({len(summaries)} files)", f"{len(total.models)} models"]
+        + _counts(total)
+    )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(HEADER))]
+    lines = []
+    for row in rows:
+        # Names are left-aligned and counts right-aligned
+        cells = [row[0].ljust(widths[0]), row[1].ljust(widths[1])]
+        cells += [cell.rjust(width) for cell, width in zip(row[2:], widths[2:])]
+        lines.append("  ".join(cells).rstrip())
+    return "\n".join(lines)
@@ -0,0 +1,287 @@
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+
+import yaml
+from yaml.constructor import SafeConstructor
+from yaml.events import AliasEvent
+from yaml.events import CollectionStartEvent
+from yaml.events import DocumentEndEvent
+from yaml.events import DocumentStartEvent
+from yaml.events import MappingEndEvent
+from yaml.events import MappingStartEvent
+from yaml.events import ScalarEvent
+from yaml.events import SequenceEndEvent
+from yaml.events import SequenceStartEvent
+from yaml.events import StreamEndEvent
+from yaml.events import StreamStartEvent
+from yaml.resolver import Resolver
+
+from lightdash_pre_commit.core import visit_column_nodes
+from lightdash_pre_commit.core import visit_model_nodes
+from lightdash_pre_commit.nodes import Column
+from lightdash_pre_commit.nodes import Model
+from lightdash_pre_commit.nodes import ModelSummary
+from lightdash_pre_commit.nodes import normalize
+from lightdash_pre_commit.nodes import Schema
+from lightdash_pre_commit.nodes import Summary
+from lightdash_pre_commit.positions import mark_mapping
+from lightdash_pre_commit.positions import MarkedDict
+
+MERGE_TAG = "tag:yaml.org,2002:merge"
+
+
+class EventWalker:
+    """
+    Dispatch the nodes of a dbt schema file to checks straight from its
+    parse events.
+
+    ``yaml.safe_load`` builds the object graph of a whole file before any
+    check runs. This walker instead follows the ``models[].columns[].meta``
+    path through the event stream and only builds one model's non-column keys
+    and one column at a time, normalizing each before it is dispatched, so
+    peak memory is bounded by the largest column rather than the whole file.
+    Anchored nodes are always built so that aliases and merge keys resolve as
+    they would with ``yaml.safe_load``.
+
+    Nodes are dispatched in the same order as :meth:`Core.walk`, except that
+    a model whose ``name`` or ``meta`` key follows its ``columns`` key has its
+    model-level nodes dispatched after its columns.
+
+    A document whose root is not a plain mapping, including an empty one, is
+    not walked. It is built whole into ``document`` instead, with
+    ``walked_whole`` set, so the caller can check it the same way as a fully
+    loaded file and fail the same way on malformed files.
+    """
+
+    def __init__(self, dispatch: Dict[str, List[Callable]]):
+        self.dispatch = dispatch
+        self.constructor = SafeConstructor()
+        self.resolver = Resolver()
+        self.anchors = {}
+        self.has_models = False
+        self.summary = Summary()
+        self.walked_whole = False
+        self.document = None
+
+    def walk(self, events: Iterable[yaml.Event]) -> None:
+        """
+        Consume the events of a single-document YAML stream.
+
+        Args:
+            events (Iterable[yaml.Event]): The parse events.
+
+        Raises:
+            ValueError: If the stream holds more than one document.
+        """
+        events = iter(events)
+        self._expect(events, StreamStartEvent)
+        event = next(events)
+        if isinstance(event, StreamEndEvent):
+            # yaml.safe_load gives None for an empty stream
+            self.walked_whole = True
+            return
+        if not isinstance(event, DocumentStartEvent):
+            raise ValueError(f"Expected the start of a document, got {event}")
+
+        root = next(events)
+        if isinstance(root, MappingStartEvent) and root.anchor is None:
+            for key, _, event in self._mapping_items(events):
+                if key == "models":
+                    self.has_models = True
+                    self._walk_models(events, event)
+                else:
+                    self._skip(events, event)
+        else:
+            self.walked_whole = True
+            self.document = self._build(events, root)
+
+        self._expect(events, DocumentEndEvent)
+        if not isinstance(next(events), StreamEndEvent):
+            raise ValueError("Expected a single document in the stream")
+
+    def presence(self) -> Schema:
+        """
+        Describe which kinds of node the walked file contains.
+
+        Returns:
+            Schema: A schema without models but with the summary of the
+                whole file, suitable for :meth:`Check.applies_to`.
+        """
+        return Schema(has_models=self.has_models, summary=self.summary)
+
+    @staticmethod
+    def _expect(events: Iterator[yaml.Event], event_type: type) -> yaml.Event:
+        event = next(events)
+        if not isinstance(event, event_type):
+            raise ValueError(f"Expected {event_type.__name__}, got {event}")
+        return event
+
+    def _mapping_items(self, events: Iterator[yaml.Event]):
+        # Yield each key of a mapping together with its position and the
+        # first event of its value. The caller must consume the value before
+        # asking for the next key.
+        while True:
+            event = next(events)
+            if isinstance(event, MappingEndEvent):
+                return
+            key_mark = event.start_mark
+            key = self._build(events, event)
+            yield key, key_mark, next(events)
+
+    def _walk_models(self, events: Iterator[yaml.Event], event: yaml.Event) -> None:
+        if not isinstance(event, SequenceStartEvent) or event.anchor is not None:
+            self._visit_models(self._build(events, event))
+            return
+
+        for event in iter(lambda: next(events), None):
+            if isinstance(event, SequenceEndEvent):
+                return
+            self._walk_model(events, event)
+
+    def _walk_model(self, events: Iterator[yaml.Event], event: yaml.Event) -> None:
+        if not isinstance(event, MappingStartEvent) or event.anchor is not None:
+            self._visit_models([self._build(events, event)])
+            return
+
+        data = MarkedDict()
+        mark_mapping(data, event.start_mark)
+        model = None
+        visited = False
+        summary = ModelSummary()
+        for key, key_mark, event in self._mapping_items(events):
+            if key != "columns":
+                data[key] = self._build(events, event)
+                if isinstance(data[key], MarkedDict):
+                    mark_mapping(data[key], key_mark)
+                model = None
+                continue
+
+            # Columns are visited with the model's keys seen so far
+            if model is None:
+                model = Model.from_dict(data)
+            if not visited and "name" in data and "meta" in data:
+                visit_model_nodes(model, self.dispatch)
+                visited = True
+            if not isinstance(event, SequenceStartEvent) or event.anchor is not None:
+                for column in self._build(events, event) or []:
+                    self._visit_column(model, column, summary)
+                continue
+            for event in iter(lambda: next(events), None):
+                if isinstance(event, SequenceEndEvent):
+                    break
+                self._visit_column(model, self._build(events, event), summary)
+
+        # Keys after the columns may have changed the model
+        if model is None:
+            model = Model.from_dict(data)
+        if not visited:
+            visit_model_nodes(model, self.dispatch)
+        summary.name = model.name
+        summary.model_metrics = len(model.metrics)
+        self.summary.add(summary)
+
+    def _visit_models(self, models) -> None:
+        # Models built whole, because they are anchored or not mappings
+        schema = normalize({"models": models})
+        for summary in schema.summary.models:
+            self.summary.add(summary)
+        for model in schema.models:
+            visit_model_nodes(model, self.dispatch)
+            for column in model.columns:
+                visit_column_nodes(model, column, self.dispatch)
+
+    def _visit_column(self, model: Model, data: dict, summary: ModelSummary) -> None:
+        column = Column.from_dict(data)
+        summary.count_column(column)
+        visit_column_nodes(model, column, self.dispatch)
+
+    def _skip(self, events: Iterator[yaml.Event], event: yaml.Event) -> None:
+        # Consume a node without building it, except for anchored nodes that
+        # later aliases may refer to.
+        if isinstance(event, (ScalarEvent, AliasEvent)) or event.anchor is not None:
+            self._build(events, event)
+            return
+        end_type = (
+            MappingEndEvent
+            if isinstance(event, MappingStartEvent)
+            else SequenceEndEvent
+        )
+        for event in iter(lambda: next(events), None):
+            if isinstance(event, end_type):
+                return
+            self._skip(events, event)
+
+    def _build(self, events: Iterator[yaml.Event], event: yaml.Event):
+        # Construct the Python value of the node starting at ``event``, the
+        # same way yaml.safe_load would.
+        if isinstance(event, AliasEvent):
+            if event.anchor not in self.anchors:
+                raise ValueError(f"Found undefined alias '{event.anchor}'")
+            return self.anchors[event.anchor]
+
+        if isinstance(event, ScalarEvent):
+            value = self._construct_scalar(event)
+        elif isinstance(event, SequenceStartEvent):
+            value = []
+            for item in iter(lambda: next(events), None):
+                if isinstance(item, SequenceEndEvent):
+                    break
+                value.append(self._build(events, item))
+        elif isinstance(event, MappingStartEvent):
+            value = self._build_mapping(events, event)
+        else:
+            raise ValueError(f"Unexpected event {event}")
+
+        if isinstance(event, (ScalarEvent, CollectionStartEvent)) and event.anchor:
+            self.anchors[event.anchor] = value
+        return value
+
+    def _build_mapping(
+        self, events: Iterator[yaml.Event], start: MappingStartEvent
+    ) -> MarkedDict:
+        merged = []
+        value = MarkedDict()
+        for event in iter(lambda: next(events), None):
+            if isinstance(event, MappingEndEvent):
+                break
+            if (
+                isinstance(event, ScalarEvent)
+                and event.value == "<<"
+                and self._resolve(event) == MERGE_TAG
+            ):
+                source = self._build(events, next(events))
+                merged.extend(source if isinstance(source, list) else [source])
+                continue
+            key = self._build(events, event)
+            value[key] = self._build(events, next(events))
+            if isinstance(value[key], MarkedDict):
+                mark_mapping(value[key], event.start_mark)
+
+        if merged:
+            # Explicit keys win over merged ones, and earlier merges win over
+            # later ones
+            explicit = value
+            value = MarkedDict()
+            for source in reversed(merged):
+                value.update(source)
+            value.update(explicit)
+        mark_mapping(value, start.start_mark)
+        return value
+
+    def _resolve(self, event: ScalarEvent) -> str:
+        if event.tag is None or event.tag == "!":
+            return self.resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+        return event.tag
+
+    def _construct_scalar(self, event: ScalarEvent):
+        tag = self._resolve(event)
+        node = yaml.ScalarNode(
+            tag, event.value, event.start_mark, event.end_mark, event.style
+        )
+        constructor = self.constructor.yaml_constructors.get(
+            tag, SafeConstructor.construct_undefined
+        )
+        return constructor(self.constructor, node)
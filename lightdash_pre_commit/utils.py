@@ -1,9 +1,45 @@
-def has_dimensions(data: dict) -> bool:
+from typing import Union
+
+from lightdash_pre_commit.nodes import normalize
+from lightdash_pre_commit.nodes import Schema
+from lightdash_pre_commit.nodes import Summary
+
+
+def summarize(data: Union[dict, Schema]) -> Summary:
+    """
+    Count the dimensions and metrics of each model of a dbt resource.
+
+    The counts are made once, as the resource is normalized, and kept on the
+    :class:`Schema`. Pass the normalized schema to ask several questions of
+    one file without walking it again.
+
+    Args:
+        data (Union[dict, Schema]): The dbt resource data, or its schema.
+
+    Returns:
+        Summary: The counts of each model and of the whole resource.
+
+    Raises:
+        ValueError: If the dbt resource type is unsupported.
+    """
+    schema = data if isinstance(data, Schema) else None
+    if schema is None and "models" in data:
+        schema = normalize(data)
+    if schema is None or not schema.has_models:
+        raise ValueError("Unsupported dbt resource type")
+    return schema.summary
+
+
+def _model_summary(data: Union[dict, Schema]) -> Summary:
+    return data.summary if isinstance(data, Schema) else normalize(data).summary
+
+
+def has_dimensions(data: Union[dict, Schema]) -> bool:
     """
     Check if the dbt resource has any dimensions.
 
     Args:
-        data (dict): The dbt resource data.
+        data (Union[dict, Schema]): The dbt resource data, or its schema.
 
     Returns:
         bool: True if the resource has dimensions, False otherwise.
@@ -11,39 +47,31 @@ def has_dimensions(data: dict) -> bool:
     Raises:
         ValueError: If the dbt resource type is unsupported.
     """
-    if "models" in data:
-        return has_dimensions_in_model(data=data)
-    else:
-        raise ValueError("Unsupported dbt resource type")
+    summary = summarize(data)
+    return summary.dimensions + summary.additional_dimensions > 0
 
 
-def has_dimensions_in_model(data: dict) -> bool:
+def has_dimensions_in_model(data: Union[dict, Schema]) -> bool:
     """
     Check if the dbt model has any dimensions.
 
     Args:
-        data (dict): The dbt model data.
+        data (Union[dict, Schema]): The dbt model data, or its schema.
 
     Returns:
         bool: True if the model has dimensions, False otherwise.
     """
-    for model in data.get("models", []):
-        for column in model.get("columns", []):
-            if "meta" in column:
-                if (
-                    "dimension" in column["meta"]
-                    or "additional_dimensions" in column["meta"]
-                ):
-                    return True
-    return False
-
-
-def has_metrics(data: dict) -> bool:
+    summary = _model_summary(data)
+    return summary.dimensions + summary.additional_dimensions > 0
+
+
+def has_metrics(data: Union[dict, Schema]) -> bool:
     """
-    Check if the dbt resource has any metrics.
+    Check if the dbt resource has any metrics, in columns or model-level
+    ``meta``.
 
     Args:
-        data (dict): The dbt resource data.
+        data (Union[dict, Schema]): The dbt resource data, or its schema.
 
     Returns:
         bool: True if the resource has metrics, False otherwise.
@@ -51,25 +79,18 @@ def has_metrics(data: dict) -> bool:
     Raises:
         ValueError: If the dbt resource type is unsupported.
     """
-    if "models" in data:
-        return has_metrics_in_model(data=data)
-    else:
-        raise ValueError("Unsupported dbt resource type")
+    return summarize(data).metrics > 0
 
 
-def has_metrics_in_model(data: dict) -> bool:
+def has_metrics_in_model(data: Union[dict, Schema]) -> bool:
     """
-    Check if the dbt model has any metrics.
+    Check if the dbt model has any metrics, in columns or model-level
+    ``meta``.
 
     Args:
-        data (dict): The dbt model data.
+        data (Union[dict, Schema]): The dbt model data, or its schema.
 
     Returns:
         bool: True if the model has metrics, False otherwise.
     """
-    for model in data.get("models", []):
-        for column in model.get("columns", []):
-            if "meta" in column:
-                if "metrics" in column["meta"]:
-                    return True
-    return False
+    return _model_summary(data).metrics > 0
@@ -0,0 +1,530 @@
+import argparse
+import gc
+import os
+import sys
+import time
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+
+from lightdash_pre_commit.cache import DEFAULT_MAX_PARSED_FILES
+from lightdash_pre_commit.cache import ParseCache
+from lightdash_pre_commit.core import Check
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.core import read_file
+from lightdash_pre_commit.project_index import DefinitionsCollector
+from lightdash_pre_commit.project_index import ProjectIndex
+from lightdash_pre_commit.project_index import SCHEMA_FILE_PATTERN
+
+# How often files are looked at when inotify is not available.
+POLL_INTERVAL = 0.5
+
+# Editors save in several steps, such as writing a temporary file and moving
+# it over the original. Events arriving within this many seconds of each
+# other are handled together.
+SETTLE_TIME = 0.005
+
+# How long a watcher waits for changes before returning none, so the loop
+# notices a keyboard interrupt.
+WAIT_TIMEOUT = 1.0
+
+# inotify event masks, see inotify(7)
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+
+# Files are looked at once written and closed rather than on every write
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+
+def is_schema_file(path: str) -> bool:
+    return SCHEMA_FILE_PATTERN.search(path.replace(os.sep, "/")) is not None
+
+
+def schema_files(root: str) -> List[str]:
+    """
+    List the dbt schema files under a directory, leaving out hidden
+    directories.
+
+    Args:
+        root (str): The directory.
+
+    Returns:
+        List[str]: The files, joined to ``root``, in sorted order.
+    """
+    paths = []
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = [name for name in dir_names if not name.startswith(".")]
+        for file_name in file_names:
+            path = os.path.join(dir_path, file_name)
+            if is_schema_file(path):
+                paths.append(path)
+    return sorted(paths)
+
+
+class PollingWatcher:
+    """
+    Find changed schema files by comparing the modification time and size of
+    every file every ``interval`` seconds.
+
+    Args:
+        root (str): The directory to watch.
+        interval (float): Seconds between looks.
+    """
+
+    name = "polling"
+
+    def __init__(self, root: str, interval: float = POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.stats = self.snapshot()
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        stats = {}
+        for path in schema_files(self.root):
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            stats[path] = (info.st_mtime_ns, info.st_size)
+        return stats
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Wait for files to change.
+
+        Args:
+            timeout (float): The longest to wait, in seconds.
+
+        Returns:
+            Optional[Set[str]]: The files created, changed or removed since the
+                last call, empty when none changed within the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            stats = self.snapshot()
+            changed = {
+                path
+                for path in stats.keys() | self.stats.keys()
+                if stats.get(path) != self.stats.get(path)
+            }
+            self.stats = stats
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """
+    Find changed schema files with Linux inotify, through the C library, so
+    changes are seen as soon as they are written.
+
+    Every directory under the root is watched, including the ones created
+    later.
+
+    Args:
+        root (str): The directory to watch.
+
+    Raises:
+        OSError: If inotify is not available or the directories cannot be
+            watched, for example when the limit on watches is reached.
+    """
+
+    name = "inotify"
+
+    def __init__(self, root: str):
+        import ctypes
+
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(None, use_errno=True)
+        try:
+            inotify_init1 = libc.inotify_init1
+            self.inotify_add_watch = libc.inotify_add_watch
+        except AttributeError:
+            raise OSError("the C library does not provide inotify")
+        self.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        self.fd = inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"cannot start inotify: {os.strerror(errno)}")
+        # The directory of each watch descriptor
+        self.directories: Dict[int, str] = {}
+        try:
+            self.add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def add_directory(self, path: str) -> None:
+        import ctypes
+        import errno
+
+        descriptor = self.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if descriptor < 0:
+            error = ctypes.get_errno()
+            # A directory removed since it was listed needs no watch
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(error, f"cannot watch '{path}': {os.strerror(error)}")
+        self.directories[descriptor] = path
+
+    def add_tree(self, root: str) -> Set[str]:
+        # Returns the schema files in the tree, which are new to the caller
+        # when the tree was created or moved in
+        files = set()
+        for dir_path, dir_names, file_names in os.walk(root):
+            dir_names[:] = [name for name in dir_names if not name.startswith(".")]
+            self.add_directory(dir_path)
+            for file_name in file_names:
+                path = os.path.join(dir_path, file_name)
+                if is_schema_file(path):
+                    files.add(path)
+        return files
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        """
+        Wait for files to change.
+
+        Args:
+            timeout (float): The longest to wait, in seconds.
+
+        Returns:
+            Optional[Set[str]]: The files created, changed or removed, empty
+                when none changed within the timeout, or None when changes
+                may have been missed and every file must be looked at again.
+        """
+        import select
+
+        changed: Optional[Set[str]] = set()
+        ready = select.select([self.fd], [], [], timeout)[0]
+        while ready:
+            events = self.read_events()
+            if events is None or changed is None:
+                changed = None
+            else:
+                changed |= events
+            ready = select.select([self.fd], [], [], SETTLE_TIME)[0]
+        return changed
+
+    def read_events(self) -> Optional[Set[str]]:
+        import struct
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed: Set[str] = set()
+        rescan = False
+        offset = 0
+        while offset < len(data):
+            descriptor, mask, _, length = struct.unpack_from("iIII", data, offset)
+            start = offset + 16
+            offset = start + length
+            name = os.fsdecode(data[start:offset].rstrip(b"\0"))
+            if mask & IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            if mask & IN_IGNORED:
+                self.directories.pop(descriptor, None)
+                continue
+            directory = self.directories.get(descriptor)
+            if directory is None or mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                continue
+            path = os.path.join(directory, name)
+            if not mask & IN_ISDIR:
+                if is_schema_file(path):
+                    changed.add(path)
+            elif mask & (IN_CREATE | IN_MOVED_TO):
+                if not name.startswith("."):
+                    changed |= self.add_tree(path)
+            elif mask & IN_MOVED_FROM:
+                # The files of a directory moved away are not listed
+                rescan = True
+        return None if rescan else changed
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def open_watcher(root: str, polling: bool = False):
+    """
+    Watch a directory with inotify when available, polling otherwise.
+
+    Args:
+        root (str): The directory to watch.
+        polling (bool): Poll even when inotify is available, for example for
+            network filesystems, where inotify misses changes made on other
+            machines.
+
+    Returns:
+        Union[InotifyWatcher, PollingWatcher]: The watcher.
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(root)
+        except OSError as e:
+            print(
+                f"Cannot use inotify ({e}), looking for changes every "
+                f"{POLL_INTERVAL} seconds instead",
+                file=sys.stderr,
+            )
+    return PollingWatcher(root)
+
+
+class Watch:
+    """
+    Check the schema files under a directory, then check again each file that
+    changes, keeping every file's results in memory.
+
+    The parsed and normalized files are kept in the engine's parse cache, so
+    a file saved again without changes, or changed back, is not parsed
+    again. With project-wide duplicates, an in-memory
+    :class:`~lightdash_pre_commit.project_index.ProjectIndex` of the watched
+    files is updated with the names of the changed files only, and only the
+    files sharing a name with them are reported again.
+
+    Args:
+        core (Core): The engine checking each file.
+        root (str): The directory watched.
+        project_duplicates (bool): Also report names defined in more than one
+            watched file.
+    """
+
+    def __init__(self, core: Core, root: str, project_duplicates: bool = False):
+        self.core = core
+        self.root = root
+        # Results are kept here rather than in the result cache
+        self.core.cache = None
+        if Core.parse_cache is None:
+            Core.parse_cache = ParseCache()
+        # The errors and failure reason of each file
+        self.results: Dict[str, Tuple[list, Optional[str]]] = {}
+        # The files last reported with errors or a failure
+        self.failing: Set[str] = set()
+        self.index = None
+        if project_duplicates:
+            self.collector = DefinitionsCollector()
+            self.index_core = Core([self.collector], parser=core.parser)
+            self.index = ProjectIndex(root)
+
+    def check(self, paths: Sequence[str]) -> List[str]:
+        """
+        Check files again after they changed.
+
+        Args:
+            paths (Sequence[str]): The files created, changed or removed.
+
+        Returns:
+            List[str]: The files whose results may have changed, in sorted
+                order. Besides the changed files, these are the files
+                sharing a name with them, whose project-wide duplicates may
+                have changed.
+        """
+        # Every file of the initial scan can be held in memory
+        if len(self.results) + len(paths) > Core.parse_cache.max_entries:
+            Core.parse_cache.max_entries = max(
+                DEFAULT_MAX_PARSED_FILES, 2 * (len(self.results) + len(paths))
+            )
+        affected = set()
+        for path in paths:
+            names = self.names_of(path)
+            try:
+                content = read_file(path)
+                info = os.stat(path)
+            except OSError:
+                # Removed, or moved away
+                self.results.pop(path, None)
+                self.failing.discard(path)
+                if self.index is not None:
+                    self.index.remove(path)
+                    affected |= self.defining(names)
+                continue
+            self.results[path] = self.core.process_file(path, content)
+            affected.add(path)
+            if self.index is not None:
+                self.index.update(path, info, self.definitions(path, content))
+                affected |= self.defining(names | self.names_of(path))
+        return sorted(path for path in affected if path in self.results)
+
+    def names_of(self, path: str) -> Set[str]:
+        if self.index is None or path not in self.index.files:
+            return set()
+        return {definition[0] for definition in self.index.files[path]["definitions"]}
+
+    def defining(self, names: Set[str]) -> Set[str]:
+        return {path for name in names for path, _ in self.index.names.get(name, ())}
+
+    def definitions(self, path: str, content: bytes) -> list:
+        # The file was parsed for the checks, so this is only a walk
+        try:
+            self.index_core.check_file(path, content)
+        except Exception:
+            # Unparseable files are reported by the per-file checks
+            return []
+        return self.collector.definitions
+
+    def errors_of(self, path: str) -> Tuple[list, Optional[str]]:
+        errors, failure = self.results[path]
+        if self.index is not None:
+            errors = [*errors, *self.index.clashes(path)]
+        return errors, failure
+
+    def report(self, paths: Sequence[str], started: float) -> None:
+        """
+        Print the results of files, then a status line to stderr.
+
+        Only the results of these files can have changed, so the files with
+        errors are counted without looking at the others.
+
+        Args:
+            paths (Sequence[str]): The files checked.
+            started (float): When checking them started, from
+                :func:`time.perf_counter`.
+        """
+        reporter = self.core.reporter()
+        reporter.start()
+        for path in paths:
+            errors, failure = self.errors_of(path)
+            reporter.file(path, errors, failure)
+            if failure is not None or any(
+                error.severity == "error" for error in errors
+            ):
+                self.failing.add(path)
+            else:
+                self.failing.discard(path)
+        reporter.finish()
+        sys.stdout.flush()
+        elapsed = time.perf_counter() - started
+        print(
+            f"[{time.strftime('%H:%M:%S')}] Checked {len(paths)} file(s) in "
+            f"{elapsed * 1000:.0f} ms, {len(self.failing)} of {len(self.results)} "
+            f"file(s) have errors.",
+            file=sys.stderr,
+        )
+
+    def run(self, watcher) -> int:
+        """
+        Check every file, then check changed files until interrupted.
+
+        Args:
+            watcher (Union[InotifyWatcher, PollingWatcher]): Tells which files
+                changed. Started before the first check, so changes made
+                during it are not missed.
+
+        Returns:
+            int: 1 if any file had errors when the watch was stopped, 0
+                otherwise.
+        """
+        if self.core.profiler is not None:
+            self.core.profiler.start()
+        try:
+            started = time.perf_counter()
+            self.report(self.check(schema_files(self.root)), started)
+            # The files parsed by the first check stay in memory. Leaving them
+            # out of garbage collection keeps full collections, which would
+            # walk every one of them, from adding to the time of a re-check.
+            gc.freeze()
+            print(
+                f"Watching '{self.root}' for changes ({watcher.name}), press "
+                f"Ctrl+C to stop",
+                file=sys.stderr,
+            )
+            while True:
+                changed = watcher.wait(WAIT_TIMEOUT)
+                if changed is None:
+                    changed = set(schema_files(self.root)) | set(self.results)
+                if not changed:
+                    continue
+                started = time.perf_counter()
+                affected = self.check(sorted(changed))
+                self.report(affected, started)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+            if self.core.profiler is not None:
+                print(self.core.profiler.stop(), file=sys.stderr)
+        return 1 if self.failing else 0
+
+
+def add_watch_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options of watch mode.
+
+    Args:
+        parser (argparse.ArgumentParser): The hook's argument parser.
+    """
+    parser.add_argument(
+        "--watch",
+        metavar="DIR",
+        help="Check the schema files under DIR, then keep checking each file "
+        "again as it is saved, until interrupted.",
+    )
+    parser.add_argument(
+        "--watch-polling",
+        action="store_true",
+        help="With --watch, look for changes every "
+        f"{POLL_INTERVAL} seconds instead of using inotify.",
+    )
+
+
+def watch(checks: Sequence[Check], args: argparse.Namespace) -> int:
+    """
+    Run watch mode for the options added by :func:`add_watch_arguments`.
+
+    Args:
+        checks (Sequence[Check]): The enabled checks.
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        int: The exit code, 2 for options watch mode cannot be used with.
+    """
+    if args.filenames:
+        print(
+            "--watch checks every schema file under its directory, filenames "
+            "cannot be given",
+            file=sys.stderr,
+        )
+        return 2
+    for option in ("manifest", "fix", "diff_scope"):
+        if getattr(args, option, None):
+            print(
+                f"--{option.replace('_', '-')} cannot be used with --watch",
+                file=sys.stderr,
+            )
+            return 2
+    if not os.path.isdir(args.watch):
+        print(f"Cannot watch '{args.watch}': not a directory", file=sys.stderr)
+        return 2
+    core = Core.from_args(checks, args)
+    watcher = open_watcher(args.watch, args.watch_polling)
+    return Watch(core, args.watch, args.project_duplicates).run(watcher)
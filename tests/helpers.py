@@ -0,0 +1,32 @@
+import contextlib
+import io
+from typing import Callable
+from typing import Optional
+from typing import Sequence
+from typing import TextIO
+from typing import Tuple
+
+
+def run_main(
+    main: Callable[[Sequence[str]], int],
+    argv: Sequence[str],
+    stderr: Optional[TextIO] = None,
+) -> Tuple[int, str]:
+    """
+    Run a hook's main function with its output captured.
+
+    Args:
+        main (Callable[[Sequence[str]], int]): The hook's main function.
+        argv (Sequence[str]): The hook's arguments.
+        stderr (Optional[TextIO]): Receives what the hook writes to stderr,
+            which is dropped by default.
+
+    Returns:
+        Tuple[int, str]: The exit code and what the hook wrote to stdout.
+    """
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(
+        io.StringIO() if stderr is None else stderr
+    ):
+        exit_code = main(list(argv))
+    return exit_code, stdout.getvalue()
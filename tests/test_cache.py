@@ -0,0 +1,130 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from helpers import run_main
+
+from lightdash_pre_commit.cache import ParseCache
+from lightdash_pre_commit.cache import ResultCache
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.diagnostics import Diagnostic
+from lightdash_pre_commit.find_missing_model_group_labels import main
+from lightdash_pre_commit.parsers import PyYAMLParser
+
+YAML_DATA = """
+models:
+  - name: orders
+    meta:
+      group_label: "Sales"
+"""
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        cache = ResultCache(self.cache_dir)
+        key = cache.key(b"models: []", "check")
+        self.assertIsNone(cache.get(key))
+        cache.put(key, [Diagnostic("an error", 3, 7, [(3, 7), (9, 7)])])
+        (error,) = cache.get(key)
+        self.assertEqual(error, "an error")
+        self.assertEqual((error.line, error.column), (3, 7))
+        self.assertEqual(error.occurrences, [(3, 7), (9, 7)])
+
+    def test_key_depends_on_content_and_signature(self):
+        cache = ResultCache(self.cache_dir)
+        key = cache.key(b"models: []", "check")
+        self.assertEqual(key, cache.key(b"models: []", "check"))
+        self.assertNotEqual(key, cache.key(b"models: [] ", "check"))
+        self.assertNotEqual(key, cache.key(b"models: []", "check:['Finance']"))
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(self.cache_dir)
+        keys = [cache.key(str(i).encode(), "check") for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, [Diagnostic("x" * 100)])
+            path = os.path.join(cache.results_dir, f"{key}.json")
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+        # Reading the oldest entry makes it the most recently used
+        self.assertIsNotNone(cache.get(keys[0]))
+
+        entry_size = os.path.getsize(os.path.join(cache.results_dir, f"{keys[0]}.json"))
+        cache.max_bytes = entry_size * 2
+        cache.evict()
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+
+
+class TestParseCache(unittest.TestCase):
+    def test_key_depends_on_content_and_parser(self):
+        key = ParseCache.key(b"a: 1", "c")
+        self.assertEqual(key, ParseCache.key(b"a: 1", "c"))
+        self.assertNotEqual(key, ParseCache.key(b"a: 2", "c"))
+        self.assertNotEqual(key, ParseCache.key(b"a: 1", "python"))
+
+    def test_evicts_least_recently_used(self):
+        cache = ParseCache(max_entries=2)
+        cache.put("a", {"a": 1})
+        cache.put("b", {"b": 1})
+        cache.get("a")
+        cache.put("c", {"c": 1})
+        self.assertEqual(cache.get("a"), {"a": 1})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), {"c": 1})
+
+
+class TestMainWithCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        self.file_path = os.path.join(self.tmp_dir.name, "schema.yml")
+        with open(self.file_path, "w") as file:
+            file.write(YAML_DATA)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_main(self, *extra_args):
+        return run_main(
+            main, [self.file_path, "--cache-dir", self.cache_dir, *extra_args]
+        )
+
+    def test_cache_hit_skips_parsing(self):
+        first = self.run_main("--allowed-labels", "Finance")
+        with mock.patch.object(PyYAMLParser, "load") as load:
+            second = self.run_main("--allowed-labels", "Finance")
+            load.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(first[0], 1)
+
+    def test_arguments_are_part_of_the_key(self):
+        self.assertEqual(self.run_main("--allowed-labels", "Finance")[0], 1)
+        self.assertEqual(self.run_main("--allowed-labels", "Sales")[0], 0)
+
+    def test_parser_and_streaming_are_part_of_the_key(self):
+        self.run_main("--parser", "python")
+        with mock.patch.object(PyYAMLParser, "load", return_value={}) as load:
+            self.run_main("--parser", "c")
+            load.assert_called_once()
+        with mock.patch.object(Core, "check_events", return_value=[]) as check_events:
+            self.run_main("--parser", "c", "--streaming")
+            check_events.assert_called_once()
+
+    def test_no_cache(self):
+        self.run_main()
+        with mock.patch.object(PyYAMLParser, "load", return_value={}) as load:
+            self.run_main("--no-cache")
+            load.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
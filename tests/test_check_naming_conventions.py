@@ -0,0 +1,150 @@
+import argparse
+import os
+import pickle
+import tempfile
+import unittest
+
+from helpers import run_main
+import yaml
+
+from lightdash_pre_commit.check_naming_conventions import build_rules
+from lightdash_pre_commit.check_naming_conventions import compile_pattern
+from lightdash_pre_commit.check_naming_conventions import find_naming_issues
+from lightdash_pre_commit.check_naming_conventions import main
+from lightdash_pre_commit.check_naming_conventions import NamingConventionCheck
+from lightdash_pre_commit.check_naming_conventions import parse_rule
+from lightdash_pre_commit.check_naming_conventions import SNAKE_CASE
+from lightdash_pre_commit.lightdash_check import main as lightdash_check_main
+
+YAML_DATA = """
+models:
+  - name: orders
+    meta:
+      metrics:
+        TotalRevenue:
+          type: sum
+        order_count:
+          type: count
+        avg_amount:
+          type: average
+        max_amount:
+          type: max
+    columns:
+      - name: OrderId
+        meta:
+          dimension:
+            type: string
+          additional_dimensions:
+            order-prefix:
+              type: string
+          metrics:
+            id_count:
+              type: count
+      - name: amount
+"""
+
+
+class TestFindNamingIssues(unittest.TestCase):
+    def test_default_rules(self):
+        errors = find_naming_issues(yaml.safe_load(YAML_DATA))
+        self.assertEqual(
+            errors,
+            [
+                f"Metric name 'TotalRevenue' does not match '{SNAKE_CASE}'.",
+                "Metric name 'TotalRevenue' does not match '_sum$' required for "
+                "metrics of type 'sum'.",
+                "Metric name 'avg_amount' does not match '_avg$' required for "
+                "metrics of type 'average'.",
+                f"Dimension name 'OrderId' does not match '{SNAKE_CASE}'.",
+                f"Additional dimension name 'order-prefix' does not match "
+                f"'{SNAKE_CASE}'.",
+            ],
+        )
+
+    def test_overridden_and_disabled_rules(self):
+        rules = build_rules(
+            [("metric.average", "^avg_"), ("metric", ""), ("dimension", "")]
+        )
+        errors = find_naming_issues(yaml.safe_load(YAML_DATA), rules)
+        self.assertEqual(
+            errors,
+            [
+                "Metric name 'TotalRevenue' does not match '_sum$' required for "
+                "metrics of type 'sum'.",
+                f"Additional dimension name 'order-prefix' does not match "
+                f"'{SNAKE_CASE}'.",
+            ],
+        )
+
+    def test_non_string_names(self):
+        errors = find_naming_issues(
+            {"models": [{"name": "m", "meta": {"metrics": {1: {"type": "count"}}}}]}
+        )
+        self.assertEqual(len(errors), 2)
+
+
+class TestRules(unittest.TestCase):
+    def test_parse_rule(self):
+        self.assertEqual(parse_rule("metric.max=_max$"), ("metric.max", "_max$"))
+        self.assertEqual(parse_rule("dimension="), ("dimension", ""))
+        for rule in ("dimension", "model=x", "dimension.string=x", "metric=("):
+            with self.subTest(rule=rule):
+                with self.assertRaises(argparse.ArgumentTypeError):
+                    parse_rule(rule)
+
+    def test_patterns_are_compiled_once(self):
+        first = NamingConventionCheck()
+        second = NamingConventionCheck()
+        self.assertIs(first.patterns["metric"], second.patterns["metric"])
+        self.assertIs(compile_pattern(SNAKE_CASE), first.patterns["dimension"])
+
+    def test_pickled_check_compiles_its_patterns(self):
+        check = NamingConventionCheck(build_rules([("metric.max", "_max$")]))
+        state = check.__getstate__()
+        self.assertNotIn("patterns", state)
+        copy = pickle.loads(pickle.dumps(check))
+        self.assertEqual(copy.rules, check.rules)
+        self.assertIs(copy.patterns["metric.max"], check.patterns["metric.max"])
+        self.assertEqual(copy.signature(), check.signature())
+        self.assertNotEqual(copy.signature(), NamingConventionCheck().signature())
+
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.file_path = os.path.join(self.tmp_dir.name, "schema.yml")
+        with open(self.file_path, "w") as file:
+            file.write(YAML_DATA)
+
+    def run_main(self, main, *args):
+        return run_main(main, [self.file_path, "--no-cache", "--jobs", "1", *args])
+
+    def test_hook(self):
+        exit_code, output = self.run_main(main)
+        self.assertEqual(exit_code, 1)
+        self.assertIn(":6:9: Metric name 'TotalRevenue'", output)
+        exit_code, output = self.run_main(
+            main,
+            "--naming-rule=metric=",
+            "--naming-rule=metric.sum=",
+            "--naming-rule=metric.average=",
+            "--naming-rule=dimension=",
+            "--naming-rule=additional_dimension=",
+        )
+        self.assertEqual(exit_code, 0)
+        self.assertNotIn("does not match", output)
+
+    def test_lightdash_check_opt_in(self):
+        self.assertNotIn("Metric name", self.run_main(lightdash_check_main)[1])
+        self.assertIn(
+            "Metric name 'TotalRevenue'",
+            self.run_main(lightdash_check_main, "--naming-conventions")[1],
+        )
+        output = self.run_main(lightdash_check_main, "--naming-rule", "metric=")[1]
+        self.assertNotIn(f"'TotalRevenue' does not match '{SNAKE_CASE}'", output)
+        self.assertIn("required for metrics of type 'sum'", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import yaml
+
+from lightdash_pre_commit import core
+from lightdash_pre_commit.check_duplicate_metric_dimension_names import (
+    DuplicateNamesCheck,
+)
+from lightdash_pre_commit.core import Check
+from lightdash_pre_commit.core import compile_dispatch
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.find_missing_model_group_labels import (
+    MissingModelGroupLabelsCheck,
+)
+from lightdash_pre_commit.nodes import AdditionalDimension
+from lightdash_pre_commit.nodes import Column
+from lightdash_pre_commit.nodes import Dimension
+from lightdash_pre_commit.nodes import Metric
+from lightdash_pre_commit.nodes import Model
+from lightdash_pre_commit.nodes import Schema
+
+
+class RecordingCheck(Check):
+    name = "recording"
+
+    def start(self) -> None:
+        super().start()
+        self.visited = []
+
+    def visit_model(self, model: Model) -> None:
+        self.visited.append(("model", model.name))
+
+    def visit_model_metric(self, model: Model, metric: Metric) -> None:
+        self.visited.append(("model_metric", metric.name))
+
+    def visit_dimension(
+        self, model: Model, column: Column, dimension: Dimension
+    ) -> None:
+        self.visited.append(("dimension", column.name))
+
+    def visit_additional_dimension(
+        self, model: Model, column: Column, dimension: AdditionalDimension
+    ) -> None:
+        self.visited.append(("additional_dimension", dimension.name))
+
+    def visit_column_metric(self, model: Model, column: Column, metric: Metric) -> None:
+        self.visited.append(("column_metric", metric.name))
+
+
+class TestCore(unittest.TestCase):
+    def test_walk_visits_every_node_once_in_order(self):
+        yaml_data = """
+models:
+  - name: orders
+    meta:
+      metrics:
+        order_count:
+          type: count
+    columns:
+      - name: ordered_at
+        meta:
+          dimension:
+            type: date
+          additional_dimensions:
+            ordered_week:
+              type: string
+          metrics:
+            first_order:
+              type: min
+      - name: no_meta
+        """
+        check = RecordingCheck()
+        Core([check]).check_data(yaml.safe_load(yaml_data))
+        self.assertEqual(
+            check.visited,
+            [
+                ("model", "orders"),
+                ("model_metric", "order_count"),
+                ("dimension", "ordered_at"),
+                ("additional_dimension", "ordered_week"),
+                ("column_metric", "first_order"),
+            ],
+        )
+
+    def test_dispatch_only_includes_overridden_visitors(self):
+        class ModelOnlyCheck(Check):
+            def visit_model(self, model: Model) -> None:
+                pass
+
+        dispatch = compile_dispatch([ModelOnlyCheck()])
+        self.assertEqual(len(dispatch["model"]), 1)
+        self.assertEqual(dispatch["column_metric"], [])
+
+    def test_skipped_check_reports_nothing(self):
+        class NeverApplies(Check):
+            def applies_to(self, schema: Schema) -> bool:
+                return False
+
+            def visit_model(self, model: Model) -> None:
+                self.errors.append("should not run")
+
+        errors = Core([NeverApplies()]).check_data({"models": [{"name": "m"}]})
+        self.assertEqual(errors, [])
+
+
+class ProjectTestCase(unittest.TestCase):
+    # Files with errors, files that fail to parse and clean files
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filenames = []
+        for i in range(40):
+            file_path = os.path.join(self.tmp_dir.name, f"schema_{i}.yml")
+            with open(file_path, "w") as file:
+                if i % 3 == 0:
+                    file.write("models: [")
+                elif i % 2 == 0:
+                    file.write(
+                        f"models:\n  - name: m{i}\n    meta:\n      metrics:\n"
+                        f"        dup_{i}: {{}}\n    columns:\n      - name: dup_{i}\n"
+                        f"        meta:\n          dimension: {{}}\n"
+                    )
+                else:
+                    file.write("models: []\n")
+            self.filenames.append(file_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_core(self, jobs, filenames=None, **kwargs):
+        core_ = Core([DuplicateNamesCheck()], jobs=jobs, **kwargs)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            exit_code = core_.run(filenames or self.filenames)
+        return exit_code, output.getvalue()
+
+
+class TestParallelRun(ProjectTestCase):
+    def test_parallel_output_matches_serial(self):
+        serial = self.run_core(jobs=1)
+        with mock.patch.object(core, "MIN_FILES_PER_JOB", 1):
+            parallel = self.run_core(jobs=4)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial[0], 1)
+        self.assertIn("Duplicate name 'dup_2'", serial[1])
+        self.assertIn("Failed to process", serial[1])
+
+    def test_small_inputs_stay_in_process(self):
+        with mock.patch("concurrent.futures.ProcessPoolExecutor") as executor:
+            self.run_core(jobs=4, filenames=self.filenames[:8])
+            executor.assert_not_called()
+
+
+class TestReadAhead(ProjectTestCase):
+    def test_output_matches_serial(self):
+        filenames = [*self.filenames, os.path.join(self.tmp_dir.name, "missing.yml")]
+        for streaming in (False, True):
+            with self.subTest(streaming=streaming):
+                serial = self.run_core(1, filenames, streaming=streaming)
+                pipelined = self.run_core(
+                    1, filenames, streaming=streaming, read_ahead=4
+                )
+                self.assertEqual(serial, pipelined)
+                self.assertIn("Failed to process '", serial[1])
+                self.assertIn("missing.yml", serial[1])
+
+    def test_bounds_buffers_in_flight(self):
+        reads, checks = [], []
+        read_file = core.read_file
+        check_file = Core.check_file
+
+        def recording_read(file_path):
+            reads.append(file_path)
+            return read_file(file_path)
+
+        def recording_check(self_, file_path, content=None):
+            self.assertIsNotNone(content)
+            checks.append(file_path)
+            # Files read but not yet checked, the current one included
+            self.assertLessEqual(len(reads) - len(checks), 3)
+            return check_file(self_, file_path, content)
+
+        with mock.patch.object(core, "read_file", recording_read), mock.patch.object(
+            Core, "check_file", recording_check
+        ):
+            self.run_core(1, read_ahead=2)
+        self.assertEqual(checks, self.filenames)
+
+
+class TestErrorLimit(ProjectTestCase):
+    def run_recording(self, **kwargs):
+        checked = []
+        check_file = Core.check_file
+
+        def recording_check(self_, file_path, content=None):
+            checked.append(file_path)
+            return check_file(self_, file_path, content)
+
+        with mock.patch.object(Core, "check_file", recording_check):
+            result = self.run_core(**kwargs)
+        return result, checked
+
+    def test_stops_at_first_error(self):
+        with mock.patch.object(core, "MIN_FILES_PER_JOB", 1), mock.patch(
+            "concurrent.futures.ProcessPoolExecutor"
+        ) as executor:
+            (exit_code, output), checked = self.run_recording(jobs=4, max_errors=1)
+            executor.assert_not_called()
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(checked, self.filenames[:1])
+        self.assertEqual(output.count("Failed to process"), 1)
+
+    def test_counts_errors_and_failures(self):
+        # A failure, a clean file, a duplicate and a failure
+        (exit_code, output), checked = self.run_recording(jobs=1, max_errors=3)
+        self.assertEqual(checked, self.filenames[:4])
+        self.assertIn("Duplicate name 'dup_2'", output)
+        self.assertEqual(output.count("Failed to process"), 2)
+
+        self.assertEqual(
+            self.run_core(jobs=1, read_ahead=2, max_errors=3), (exit_code, output)
+        )
+
+    def test_cheap_checks_run_first(self):
+        data = {
+            "models": [
+                {
+                    "name": "orders",
+                    "meta": {"metrics": {"id": {}}},
+                    "columns": [{"name": "id", "meta": {"dimension": {}}}],
+                }
+            ]
+        }
+        checks = [DuplicateNamesCheck(), MissingModelGroupLabelsCheck()]
+        errors = Core(checks).check_data(data)
+        self.assertEqual(len(errors), 2)
+        self.assertIn("Duplicate name", errors[0])
+
+        duplicates = DuplicateNamesCheck()
+        with mock.patch.object(duplicates, "start") as start:
+            errors = Core(
+                [duplicates, MissingModelGroupLabelsCheck()], max_errors=1
+            ).check_data(data)
+            start.assert_not_called()
+        self.assertEqual(errors, ["Missing 'group_label' in model 'orders' meta."])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import contextlib
+import importlib
+import io
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from lightdash_pre_commit import daemon
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.parsers import PyYAMLParser
+
+YAML_DATA = """
+models:
+  - name: orders
+    meta: {}
+"""
+
+MODULE = "lightdash_pre_commit.find_missing_model_group_labels"
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        with open("schema.yml", "w") as file:
+            file.write(YAML_DATA)
+        runtime_dir = os.path.join(self.tmp_dir.name, "run")
+        os.mkdir(runtime_dir, 0o700)
+        environ = mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": runtime_dir})
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.mkdir(daemon.socket_directory(), 0o700)
+        self.server = None
+
+    def tearDown(self):
+        if self.server is not None:
+            self.server.stopped = True
+            # Wake the server up if it is waiting for a connection
+            self.server.socket.shutdown(socket.SHUT_RDWR)
+            self.thread.join()
+            self.server.server_close()
+        Core.parse_cache = None
+        os.chdir(self.old_cwd)
+        self.tmp_dir.cleanup()
+
+    def start_server(self):
+        self.server = daemon.DaemonServer(daemon.socket_path(), idle_timeout=10)
+        self.thread = threading.Thread(target=self.server.serve)
+        self.thread.start()
+
+    def forward(self, *argv):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(
+            io.StringIO()
+        ):
+            exit_code = daemon.forward(MODULE, [*argv, "--no-cache"])
+        return exit_code, output.getvalue()
+
+    def request(self, **fields):
+        return {
+            "fingerprint": daemon.code_fingerprint(),
+            "cwd": os.path.realpath(os.getcwd()),
+            "module": MODULE,
+            "argv": ["schema.yml", "--no-cache"],
+            "env": {},
+            **fields,
+        }
+
+    def exchange(self, request):
+        return daemon._exchange(daemon.socket_path(), request)
+
+    def test_without_daemon_runs_in_process(self):
+        self.assertEqual(self.forward("schema.yml"), (None, ""))
+
+    def test_runs_hook_in_daemon(self):
+        self.start_server()
+        exit_code, output = self.forward("schema.yml")
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(
+            output,
+            "Errors found in 'schema.yml':\n"
+            "schema.yml:3:5: Missing 'group_label' in model 'orders' meta.\n",
+        )
+
+    def test_parsed_files_are_reused_across_hooks(self):
+        self.start_server()
+        self.forward("schema.yml")
+        with mock.patch.object(PyYAMLParser, "load") as load:
+            self.assertEqual(self.forward("schema.yml")[0], 1)
+            load.assert_not_called()
+
+    def test_argument_errors_are_returned(self):
+        self.start_server()
+        self.assertEqual(self.forward("--unknown")[0], 2)
+
+    def test_stale_daemon_stops(self):
+        self.start_server()
+        with mock.patch.object(daemon, "code_fingerprint", return_value="old"):
+            self.assertEqual(self.forward("schema.yml"), (None, ""))
+        self.thread.join()
+        self.assertTrue(self.server.stopped)
+
+    def test_disabled_by_environment(self):
+        self.start_server()
+        with mock.patch.dict(os.environ, {daemon.DISABLE_ENV_VAR: "1"}):
+            self.assertEqual(self.forward("schema.yml"), (None, ""))
+
+    def test_socket_of_another_user_is_ignored(self):
+        self.start_server()
+        with mock.patch.object(os, "getuid", return_value=os.getuid() + 1):
+            self.assertEqual(self.forward("schema.yml"), (None, ""))
+
+    def test_concurrent_requests_are_kept_alive(self):
+        self.start_server()
+        hook = importlib.import_module(MODULE)
+        hook_main = hook.main
+        running = []
+        overlapped = []
+
+        def slow_main(argv):
+            overlapped.append(bool(running))
+            running.append(argv)
+            time.sleep(0.3)
+            running.pop()
+            return hook_main(argv)
+
+        request = self.request()
+        responses = []
+        # The last client waits for two hooks, longer than the reply timeout
+        with mock.patch.object(hook, "main", slow_main), mock.patch.multiple(
+            daemon, REPLY_TIMEOUT=0.5, KEEPALIVE_INTERVAL=0.05
+        ):
+            clients = [
+                threading.Thread(
+                    target=lambda: responses.append(self.exchange(request))
+                )
+                for _ in range(3)
+            ]
+            for client in clients:
+                client.start()
+            for client in clients:
+                client.join()
+        self.assertEqual([response["exit_code"] for response in responses], [1] * 3)
+        self.assertEqual(overlapped, [False] * 3)
+
+    def test_git_environment_is_forwarded(self):
+        hook = importlib.import_module(MODULE)
+        seen = []
+
+        def main(argv):
+            seen.append((os.environ.get("GIT_INDEX_FILE"), os.environ.get("GIT_DIR")))
+            return 0
+
+        with mock.patch.dict(
+            os.environ, {"GIT_INDEX_FILE": "client/index", "GIT_DIR": "client/.git"}
+        ):
+            env = daemon.forwarded_env()
+        self.assertEqual(env["GIT_INDEX_FILE"], "client/index")
+        del env["GIT_DIR"]
+
+        # The client's git variables replace the daemon's, which come back after
+        with mock.patch.dict(os.environ, {"GIT_DIR": "daemon/.git"}):
+            self.start_server()
+            with mock.patch.object(hook, "main", main):
+                response = self.exchange(self.request(env=env))
+            self.assertEqual(response["exit_code"], 0)
+            self.assertEqual(seen, [("client/index", None)])
+            self.assertEqual(os.environ["GIT_DIR"], "daemon/.git")
+            self.assertNotIn("GIT_INDEX_FILE", os.environ)
+
+    def test_wedged_daemon_times_out(self):
+        # Accepts connections into the backlog but never answers
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(daemon.socket_path())
+            server.listen()
+            with mock.patch.object(daemon, "REPLY_TIMEOUT", 0.1):
+                self.assertEqual(self.forward("schema.yml"), (None, ""))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import subprocess
+import tempfile
+import unittest
+
+from helpers import run_main
+
+from lightdash_pre_commit.diff_scope import parse_diff
+from lightdash_pre_commit.lightdash_check import main
+
+YAML_DATA = """models:
+  - name: orders
+    meta:
+      group_label: Orders
+    columns:
+      - name: revenue
+        meta:
+          metrics:
+            total:
+              type: sum
+      - name: cost
+        meta:
+          metrics:
+            total:
+              type: sum
+  - name: customers
+    columns:
+      - name: customer_id
+        meta:
+          dimension:
+            type: string
+"""
+
+DIFF = """diff --git models/schema.yml models/schema.yml
+index 1111111..2222222 100644
+--- models/schema.yml
++++ models/schema.yml
+@@ -3,0 +4,2 @@ models:
++      group_label: Orders
++      label: Orders
+@@ -10 +12 @@ models:
+-              type: count
++              type: sum
+@@ -20,2 +22,0 @@ models:
+diff --git models/old.yml models/old.yml
+deleted file mode 100644
+--- models/old.yml
++++ /dev/null
+@@ -1,3 +0,0 @@
+"""
+
+
+class TestParseDiff(unittest.TestCase):
+    def test_changed_line_ranges(self):
+        self.assertEqual(
+            parse_diff(DIFF),
+            {os.path.join("models", "schema.yml"): [(4, 5), (12, 12), (22, 23)]},
+        )
+
+
+class TestDiffScope(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        os.mkdir("models")
+        self.path = os.path.join("models", "schema.yml")
+        self.git("init", "-q")
+        self.stage(YAML_DATA)
+        self.git("commit", "-q", "-m", "Add schema")
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        self.tmp_dir.cleanup()
+
+    def git(self, *args):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            check=True,
+        )
+
+    def stage(self, content):
+        with open(self.path, "w") as file:
+            file.write(content)
+        self.git("add", self.path)
+
+    def run_main(self, *args):
+        return run_main(
+            main,
+            [
+                self.path,
+                "--no-cache",
+                "--skip",
+                "find_incorrect_indentation_of_dims_and_metrics",
+                *args,
+            ],
+        )
+
+    def test_unchanged_file_is_not_checked(self):
+        self.assertEqual(self.run_main("--diff-scope"), (0, ""))
+        self.assertEqual(self.run_main()[0], 1)
+
+    def test_only_changed_columns_are_checked(self):
+        self.stage(
+            YAML_DATA.replace(
+                "type: string", "type: string\n            label: Customer"
+            )
+        )
+        result, output = self.run_main("--diff-scope")
+        self.assertEqual(result, 1)
+        self.assertEqual(
+            output,
+            "Errors found in 'models/schema.yml':\n"
+            "models/schema.yml:20:11: Missing 'group_label' or 'groups' in dimension "
+            "of column 'customer_id'.\n"
+            "models/schema.yml:16:5: Missing 'group_label' in model 'customers' meta.\n",
+        )
+
+    def test_duplicates_within_changed_model(self):
+        # Only the first column changes, but its metric clashes with the second
+        self.stage(
+            YAML_DATA.replace(
+                "      - name: revenue\n",
+                "      - name: revenue\n        description: Revenue\n",
+            )
+        )
+        result, output = self.run_main("--diff-scope")
+        self.assertEqual(result, 1)
+        self.assertIn("Duplicate name 'total' used 2 times", output)
+        self.assertNotIn("customers", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
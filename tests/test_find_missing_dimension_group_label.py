@@ -255,6 +255,40 @@ models:
             errors,
         )
 
+    def test_invalid_group_labels(self):
+        yaml_data = """
+models:
+  - name: orders
+    columns:
+      - name: ordered_at
+        meta:
+          dimension:
+            type: date
+            group_label: "dates"
+          additional_dimensions:
+            ordered_week:
+              type: string
+              group_label: "Weeks"
+      - name: secret
+        meta:
+          dimension:
+            hidden: true
+            group_label: "Anything"
+        """
+        errors = find_missing_group_labels(
+            yaml.safe_load(yaml_data), allowed_labels=["Dates"]
+        )
+        self.assertEqual(
+            errors,
+            [
+                "Invalid 'group_label' 'dates' in dimension of column 'ordered_at'. "
+                "Did you mean 'Dates'?",
+                "Invalid 'group_label' 'Weeks' in additional dimension "
+                "'ordered_week' in column 'ordered_at'. Allowed labels are: "
+                "['Dates'].",
+            ],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
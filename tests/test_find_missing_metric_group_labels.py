@@ -5,6 +5,10 @@ import yaml
 from lightdash_pre_commit.find_missing_metric_group_labels import (
     find_missing_group_labels,
 )
+from lightdash_pre_commit.find_missing_metric_group_labels import (
+    MissingMetricGroupLabelsCheck,
+)
+from lightdash_pre_commit.nodes import normalize
 
 
 class TestDBTYAMLGroupLabelChecks(unittest.TestCase):
@@ -311,6 +315,64 @@ models:
         ]
         self.assertEqual(errors, expected_errors)
 
+    def test_invalid_group_labels(self):
+        yaml_data = """
+models:
+  - name: orders
+    meta:
+      metrics:
+        order_count:
+          type: count
+          group_label: "Revenue"
+    columns:
+      - name: revenue
+        meta:
+          metrics:
+            total_revenue:
+              type: sum
+              group_label: "Revenu"
+            unlabelled:
+              type: sum
+              groups: ["Revenue"]
+        """
+        errors = find_missing_group_labels(
+            yaml.safe_load(yaml_data), allowed_labels=["Revenue", "Orders"]
+        )
+        self.assertEqual(
+            errors,
+            [
+                "Invalid 'group_label' 'Revenu' in column metric 'total_revenue'. "
+                "Did you mean 'Revenue'?"
+            ],
+        )
+
+
+class TestHookSkipsFiles(unittest.TestCase):
+    def test_skips_files_without_dimensions(self):
+        # Column metrics alone, as in files that only define duplicate keys
+        yaml_data = """
+models:
+  - name: orders
+    columns:
+      - name: revenue
+        meta:
+          metrics:
+            total_revenue:
+              type: sum
+        """
+        check = MissingMetricGroupLabelsCheck(skip_without_dimensions_and_metrics=True)
+        schema = normalize(yaml.safe_load(yaml_data))
+        self.assertFalse(check.applies_to(schema))
+        self.assertFalse(check.may_report(frozenset(["metrics"])))
+        # Used without the hook's file filter, the check still applies
+        self.assertTrue(MissingMetricGroupLabelsCheck().applies_to(schema))
+
+        data = yaml.safe_load(yaml_data)
+        data["models"][0]["columns"][0]["meta"]["additional_dimensions"] = {
+            "revenue_band": {"type": "string"}
+        }
+        self.assertTrue(check.applies_to(normalize(data)))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -135,6 +135,30 @@ models:
         )
         self.assertEqual(errors, [])
 
+    def test_invalid_group_label_suggests_the_closest(self):
+        yaml_data = """
+models:
+  - name: orders
+    meta:
+      group_label: "finace"
+  - name: customers
+    meta:
+      group_label: "Unknown"
+        """
+        allowed_labels = [f"Team {i}" for i in range(20)] + ["Finance", "Finances"]
+        errors = find_missing_model_group_labels(
+            yaml.safe_load(yaml_data), allowed_labels=allowed_labels
+        )
+        self.assertEqual(
+            errors,
+            [
+                "Invalid 'group_label' 'finace' in model 'orders'. Did you mean "
+                "'Finance' or 'Finances'?",
+                "Invalid 'group_label' 'Unknown' in model 'customers'. It is not one "
+                "of the 22 allowed labels.",
+            ],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
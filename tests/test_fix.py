@@ -0,0 +1,228 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from helpers import run_main
+import yaml
+
+from lightdash_pre_commit import core
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.fix import apply_edits
+from lightdash_pre_commit.fix import FIXES
+from lightdash_pre_commit.fix import Fixer
+from lightdash_pre_commit.lightdash_check import build_checks
+from lightdash_pre_commit.lightdash_check import main
+
+YAML_DATA = """\
+version: 2
+models:
+  - name: orders  # the orders
+    meta:
+      metrics:
+        order_count:
+          type: count
+    columns:
+      - name: id
+        meta:
+          dimension:
+            type: string
+            metrics:
+              # counts ids
+              count_id:
+                type: count
+            label: Id
+          additional_dimensions:
+            id_prefix:
+              type: string
+      - name: secret
+        meta:
+          dimension:
+            hidden: true
+      - name: amount
+        meta:
+          dimension:
+            groups: [finance]
+          metrics:
+            total:
+              type: sum
+              skip_group_label: true
+"""
+
+FIXED_DATA = """\
+version: 2
+models:
+  - name: orders  # the orders
+    meta:
+      metrics:
+        order_count:
+          type: count
+          group_label: "Sales"
+      group_label: "Sales"
+    columns:
+      - name: id
+        meta:
+          dimension:
+            type: string
+            label: Id
+            group_label: "Sales"
+          metrics:
+            # counts ids
+            count_id:
+              type: count
+              group_label: "Sales"
+          additional_dimensions:
+            id_prefix:
+              type: string
+              group_label: "Sales"
+      - name: secret
+        meta:
+          dimension:
+            hidden: true
+      - name: amount
+        meta:
+          dimension:
+            groups: [finance]
+          metrics:
+            total:
+              type: sum
+              skip_group_label: true
+"""
+
+
+def fix(content, group_label="Sales", kinds=frozenset(FIXES.values())):
+    return Fixer(kinds, group_label).fix(content.encode())
+
+
+class TestFixer(unittest.TestCase):
+    def test_fixes_every_issue_and_keeps_the_rest(self):
+        fixed, count = fix(YAML_DATA)
+        self.assertEqual(fixed.decode(), FIXED_DATA)
+        self.assertEqual(count, 6)
+        self.assertEqual(Core(build_checks(())).check_data(yaml.safe_load(fixed)), [])
+
+    def test_indentation_only_without_a_label(self):
+        fixed, count = fix(YAML_DATA, group_label=None)
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            yaml.safe_load(fixed)["models"][0]["columns"][0]["meta"]["metrics"],
+            {"count_id": {"type": "count"}},
+        )
+        self.assertNotIn(b" group_label", fixed)
+
+    def test_only_fixes_enabled_checks(self):
+        fixed, count = fix(YAML_DATA, kinds=frozenset(["models"]))
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            yaml.safe_load(fixed)["models"][0]["meta"]["group_label"], "Sales"
+        )
+
+    def test_moves_metrics_under_additional_dimensions(self):
+        fixed, count = fix(
+            "models:\n"
+            "  - name: orders\n"
+            "    columns:\n"
+            "      - name: id\n"
+            "        meta:\n"
+            "          additional_dimensions:\n"
+            "            metrics:\n"
+            "              n:\n"
+            "                type: count\n"
+            "            id_prefix:\n"
+            "              type: string\n",
+            group_label=None,
+        )
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            yaml.safe_load(fixed)["models"][0]["columns"][0]["meta"],
+            {
+                "additional_dimensions": {"id_prefix": {"type": "string"}},
+                "metrics": {"n": {"type": "count"}},
+            },
+        )
+
+    def test_keeps_line_breaks_and_missing_final_newline(self):
+        fixed, _ = fix("models:\r\n  - name: a\r\n    meta:\r\n      x: 1\r\n")
+        self.assertEqual(
+            fixed,
+            b'models:\r\n  - name: a\r\n    meta:\r\n      x: 1\r\n      group_label: "Sales"\r\n',
+        )
+        fixed, _ = fix("models:\n  - name: a\n    meta:\n      x: 1")
+        self.assertEqual(
+            yaml.safe_load(fixed)["models"][0]["meta"]["group_label"], "Sales"
+        )
+
+    def test_leaves_what_it_cannot_edit_safely(self):
+        for name, content in {
+            "flow": "models: [{name: a, meta: {x: 1}}]\n",
+            "alias": "meta: &meta\n  x: 1\nmodels:\n  - name: a\n    meta: *meta\n",
+            "merge": "models:\n  - name: a\n    meta:\n      <<: {x: 1}\n",
+            "invalid": "models: [\n",
+            "several_documents": "models: []\n---\nmodels: []\n",
+        }.items():
+            with self.subTest(file=name):
+                self.assertEqual(fix(content), (content.encode(), 0))
+
+    def test_apply_edits(self):
+        self.assertEqual(
+            apply_edits(b"abcdef", [(4, 6, b"X"), (1, 1, b"-"), (1, 3, b"")]),
+            b"a-dX",
+        )
+        with self.assertRaises(ValueError):
+            apply_edits(b"abcdef", [(1, 3, b""), (2, 4, b"")])
+
+
+class TestFixOption(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.filenames = []
+        for i in range(4):
+            file_path = os.path.join(self.tmp_dir.name, f"schema_{i}.yml")
+            with open(file_path, "w") as file:
+                file.write(YAML_DATA)
+            self.filenames.append(file_path)
+
+    def run_main(self, *args):
+        stderr = io.StringIO()
+        exit_code, _ = run_main(main, [*self.filenames, "--no-cache", *args], stderr)
+        return exit_code, stderr.getvalue()
+
+    def test_fixes_files_once(self):
+        exit_code, stderr = self.run_main("--fix", "--fix-group-label", "Sales")
+        self.assertEqual(exit_code, 1)
+        self.assertIn(f"Fixed 6 issue(s) in '{self.filenames[0]}'", stderr)
+        for file_path in self.filenames:
+            with open(file_path) as file:
+                self.assertEqual(file.read(), FIXED_DATA)
+        self.assertEqual(self.run_main("--fix", "--fix-group-label", "Sales")[0], 0)
+
+    def test_fixes_in_worker_processes(self):
+        with mock.patch.object(core, "MIN_FILES_PER_JOB", 1):
+            exit_code, stderr = self.run_main(
+                "--fix", "--fix-group-label", "Sales", "--jobs", "2"
+            )
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(stderr.count("Fixed 6 issue(s)"), 4)
+        with open(self.filenames[-1]) as file:
+            self.assertEqual(file.read(), FIXED_DATA)
+
+    def test_does_not_write_a_broken_fix(self):
+        fixer = Fixer(frozenset(["models"]), "Sales")
+        with mock.patch.object(fixer, "fix", return_value=(b"models: [", 1)):
+            errors = Core(build_checks(()), fixer=fixer).fix_file(self.filenames[0])
+        self.assertIn("Missing 'group_label' in model 'orders' meta.", errors)
+        with open(self.filenames[0]) as file:
+            self.assertEqual(file.read(), YAML_DATA)
+
+    def test_reports_without_fix(self):
+        exit_code, stderr = self.run_main("--jobs", "1")
+        self.assertEqual(exit_code, 1)
+        self.assertNotIn("Fixed", stderr)
+        with open(self.filenames[0]) as file:
+            self.assertEqual(file.read(), YAML_DATA)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import configparser
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time of each console script's module, in microseconds.
+# About twice what they take on a developer machine, so only a module that
+# starts importing a heavy dependency at the top goes over.
+BUDGET_FILE = os.path.join(os.path.dirname(__file__), "import_time_budget.json")
+
+# Loaded only once there are files to check.
+HEAVY_MODULES = (
+    "concurrent.futures",
+    "hashlib",
+    "lightdash_pre_commit.daemon",
+    "ruamel.yaml",
+    "socket",
+    "subprocess",
+    "tempfile",
+    "yaml",
+)
+
+RUNS = 3
+
+
+def console_script_modules() -> list:
+    config = configparser.ConfigParser()
+    config.read(os.path.join(ROOT, "setup.cfg"))
+    entry_points = config["options.entry_points"]["console_scripts"]
+    return sorted(
+        {
+            line.split("=")[1].split(":")[0].strip()
+            for line in entry_points.split("\n")
+            if line.strip()
+        }
+    )
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def cumulative_import_time(module: str) -> int:
+    # The fastest of a few runs, to keep noise from other processes out
+    times = []
+    for _ in range(RUNS):
+        stderr = run_python("-X", "importtime", "-c", f"import {module}").stderr
+        for line in stderr.splitlines():
+            parts = [part.strip() for part in line.split("|")]
+            if len(parts) == 3 and parts[2] == module:
+                times.append(int(parts[1]))
+    return min(times)
+
+
+class TestImportTime(unittest.TestCase):
+    def setUp(self):
+        with open(BUDGET_FILE) as file:
+            self.budget = json.load(file)
+
+    def test_every_console_script_has_a_budget(self):
+        self.assertEqual(sorted(self.budget), console_script_modules())
+
+    def test_import_time_is_within_budget(self):
+        for module in console_script_modules():
+            with self.subTest(module=module):
+                self.assertLessEqual(
+                    cumulative_import_time(module), self.budget[module]
+                )
+
+    def test_heavy_modules_are_not_imported_without_files(self):
+        for module in console_script_modules():
+            with self.subTest(module=module):
+                output = run_python(
+                    "-c",
+                    f"import sys; from {module} import main; exit_code = main([]); "
+                    f"print(exit_code, sorted(set(sys.modules) & set({HEAVY_MODULES!r})))",
+                ).stdout
+                self.assertEqual(output, "0 []\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
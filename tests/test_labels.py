@@ -0,0 +1,136 @@
+import argparse
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import yaml
+
+from lightdash_pre_commit import labels
+from lightdash_pre_commit.find_missing_dimension_group_labels import (
+    find_missing_group_labels as find_missing_dimension_group_labels,
+)
+from lightdash_pre_commit.find_missing_metric_group_labels import (
+    find_missing_group_labels as find_missing_metric_group_labels,
+)
+from lightdash_pre_commit.find_missing_model_group_labels import (
+    find_missing_model_group_labels,
+)
+from lightdash_pre_commit.labels import BKTree
+from lightdash_pre_commit.labels import edit_distance
+from lightdash_pre_commit.labels import LabelRegistry
+from lightdash_pre_commit.labels import normalize_label
+from lightdash_pre_commit.labels import read_labels_file
+from lightdash_pre_commit.labels import registry_from_args
+
+
+class TestLabels(unittest.TestCase):
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance("finance", "finance"), 0)
+        self.assertEqual(edit_distance("finace", "finance"), 1)
+        self.assertEqual(edit_distance("kitten", "sitting"), 3)
+        self.assertEqual(edit_distance("", "abc"), 3)
+
+    def test_normalize_label(self):
+        self.assertEqual(normalize_label("  Revenue_Metrics "), "revenue metrics")
+        self.assertEqual(normalize_label("revenue - metrics"), "revenue metrics")
+        self.assertEqual(normalize_label(2020), "2020")
+
+    def test_bk_tree_matches_a_scan(self):
+        words = ["finance", "finances", "marketing", "market", "sales", "support"]
+        tree = BKTree(words)
+        for query in ("financ", "markting", "sale", "zzz"):
+            for max_distance in (1, 2, 3):
+                with self.subTest(query=query, max_distance=max_distance):
+                    self.assertEqual(
+                        sorted(tree.search(query, max_distance)),
+                        sorted(
+                            (edit_distance(query, word), word)
+                            for word in words
+                            if edit_distance(query, word) <= max_distance
+                        ),
+                    )
+
+    def test_suggestions_are_ranked_and_remembered(self):
+        registry = LabelRegistry(["Finance", "Finance Ops", "Fiance", "Sales"])
+        self.assertIn("Finance", registry)
+        self.assertNotIn("finance", registry)
+        self.assertEqual(registry.suggest("finance"), ["Finance", "Fiance"])
+        with mock.patch.object(labels, "edit_distance") as distance:
+            registry.suggest("finance")
+            distance.assert_not_called()
+
+    def test_suggestions_do_not_scan_every_label(self):
+        teams = "Finance Marketing Sales Support Product Legal Security Growth"
+        kinds = "Metrics Revenue Costs Targets Forecasts Pipeline Churn Orders"
+        registry = LabelRegistry(
+            f"{team} {kind}" for team in teams.split() for kind in kinds.split()
+        )
+        with mock.patch.object(
+            labels, "edit_distance", wraps=labels.edit_distance
+        ) as distance:
+            self.assertEqual(registry.suggest("Finanse Revenu"), ["Finance Revenue"])
+        self.assertLess(distance.call_count, len(registry) / 4)
+
+    def test_labels_that_are_not_strings(self):
+        registry = LabelRegistry(["Finance", "Sales"])
+        self.assertNotIn(["Finance"], registry)
+        self.assertNotIn({"name": "Finance"}, registry)
+        self.assertIsInstance(registry.hint(["Sales"]), str)
+        yaml_data = """
+models:
+  - name: orders
+    meta:
+      group_label: [Finance]
+      metrics:
+        order_count:
+          type: count
+          group_label: {name: Finance}
+    columns:
+      - name: amount
+        meta:
+          dimension:
+            group_label: [Sales]
+        """
+        data = yaml.safe_load(yaml_data)
+        for find, label, what in (
+            (find_missing_model_group_labels, "['Finance']", "model 'orders'"),
+            (
+                find_missing_metric_group_labels,
+                "{'name': 'Finance'}",
+                "model-level metric 'order_count'",
+            ),
+            (
+                find_missing_dimension_group_labels,
+                "['Sales']",
+                "dimension of column 'amount'",
+            ),
+        ):
+            with self.subTest(what=what):
+                errors = find(data, allowed_labels=registry)
+                self.assertEqual(len(errors), 1)
+                self.assertTrue(
+                    errors[0].startswith(f"Invalid 'group_label' '{label}' in {what}")
+                )
+
+    def test_registry_from_args(self):
+        self.assertIsNone(registry_from_args(None, None))
+        registry = registry_from_args("Finance,Sales", ["Sales", "Support"])
+        self.assertEqual(registry.ordered, ["Finance", "Sales", "Support"])
+        self.assertEqual(
+            registry.signature(),
+            LabelRegistry(["Support", "Sales", "Finance"]).signature(),
+        )
+
+    def test_read_labels_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "labels.txt")
+            with open(path, "w") as file:
+                file.write("# Teams\nFinance\n\n  Revenue Metrics  \n")
+            self.assertEqual(read_labels_file(path), ["Finance", "Revenue Metrics"])
+            with self.assertRaises(argparse.ArgumentTypeError):
+                read_labels_file(os.path.join(directory, "missing.txt"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import io
+import os
+import tempfile
+import unittest
+
+from helpers import run_main
+
+from lightdash_pre_commit import check_duplicate_metric_dimension_names
+from lightdash_pre_commit import find_incorrect_indentation_of_dims_and_metrics
+from lightdash_pre_commit import find_missing_dimension_group_labels
+from lightdash_pre_commit import find_missing_metric_group_labels
+from lightdash_pre_commit import find_missing_model_group_labels
+from lightdash_pre_commit.lightdash_check import main
+
+YAML_DATA = """
+models:
+  - name: orders
+    meta:
+      group_label: "Sales"
+      metrics:
+        revenue:
+          type: sum
+    columns:
+      - name: revenue
+        meta:
+          dimension:
+            type: number
+            metrics:
+              nested_metric:
+                type: sum
+          metrics:
+            revenue:
+              type: sum
+              group_label: "Revenue"
+"""
+
+
+class TestLightdashCheck(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, "schema.yml")
+        with open(self.file_path, "w") as file:
+            file.write(YAML_DATA)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_reports_the_errors_of_every_hook(self):
+        expected_errors = []
+        for module in (
+            check_duplicate_metric_dimension_names,
+            find_missing_metric_group_labels,
+            find_missing_dimension_group_labels,
+            find_incorrect_indentation_of_dims_and_metrics,
+            find_missing_model_group_labels,
+        ):
+            _, output = run_main(module.main, [self.file_path, "--no-cache"])
+            expected_errors.extend(output.splitlines()[1:])
+
+        exit_code, output = run_main(main, [self.file_path, "--no-cache"])
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(output.splitlines()[1:], expected_errors)
+        self.assertEqual(len(expected_errors), 4)
+
+    def test_skip_check(self):
+        exit_code, output = run_main(
+            main,
+            [
+                self.file_path,
+                "--no-cache",
+                "--skip",
+                "check-duplicate-dims-and-metrics",
+                "--skip",
+                "find_missing_metric_group_labels",
+                "--skip",
+                "find_missing_dimension_group_labels",
+                "--skip",
+                "find_incorrect_indentation_of_dims_and_metrics",
+            ],
+        )
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(output, "")
+
+    def test_allowed_labels(self):
+        exit_code, output = run_main(
+            main,
+            [
+                self.file_path,
+                "--no-cache",
+                "--skip",
+                "check-duplicate-dims-and-metrics",
+                "--skip",
+                "find_missing_metric_group_labels",
+                "--skip",
+                "find_missing_dimension_group_labels",
+                "--skip",
+                "find_incorrect_indentation_of_dims_and_metrics",
+                "--allowed-labels",
+                "Finance",
+            ],
+        )
+        self.assertEqual(exit_code, 1)
+        self.assertIn("Invalid 'group_label' 'Sales' in model 'orders'.", output)
+
+    def test_allowed_labels_file(self):
+        labels_path = os.path.join(self.tmp_dir.name, "labels.txt")
+        with open(labels_path, "w") as file:
+            file.write("# Teams\nSale\nFinance\n")
+        exit_code, output = run_main(
+            main,
+            [
+                self.file_path,
+                "--no-cache",
+                "--allowed-labels-file",
+                labels_path,
+                "--allowed-field-labels",
+                "Revenue",
+            ],
+        )
+        self.assertEqual(exit_code, 1)
+        self.assertIn(
+            "Invalid 'group_label' 'Sales' in model 'orders'. Did you mean 'Sale'?",
+            output,
+        )
+        self.assertNotIn("Invalid 'group_label' 'Revenue'", output)
+
+    def test_stats(self):
+        stderr = io.StringIO()
+        run_main(main, [self.file_path, "--stats", "--jobs", "1"], stderr)
+        header, row, total = stderr.getvalue().splitlines()[-3:]
+        self.assertEqual(
+            header.split(),
+            "File Model Dimensions Additional dimensions Column metrics "
+            "Model metrics".split(),
+        )
+        self.assertEqual(row.split(), [self.file_path, "orders", "1", "0", "1", "1"])
+        self.assertEqual(
+            total.split(), ["Total", "(1", "files)", "1", "models", "1", "0", "1", "1"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from helpers import run_main
+
+from lightdash_pre_commit.lightdash_check import main
+from lightdash_pre_commit.manifest import load_manifest_models
+from lightdash_pre_commit.manifest import model_from_node
+from lightdash_pre_commit.manifest import schema_file_path
+
+MANIFEST = {
+    "metadata": {"dbt_schema_version": "v9"},
+    "nodes": {
+        "model.shop.orders": {
+            "resource_type": "model",
+            "name": "orders",
+            "original_file_path": "models/orders.sql",
+            "patch_path": "shop://models/schema.yml",
+            "meta": {"group_label": "Finance"},
+            "columns": {
+                "ordered_at": {
+                    "name": "ordered_at",
+                    "meta": {"dimension": {"type": "date", "group_label": "Dates"}},
+                },
+                "revenue": {
+                    "name": "revenue",
+                    "meta": {"metrics": {"revenue_sum": {"type": "sum"}}},
+                },
+            },
+        },
+        "model.shop.customers": {
+            "resource_type": "model",
+            "name": "customers",
+            "original_file_path": "models/customers.sql",
+            "patch_path": None,
+            "meta": {},
+            "config": {"meta": {"group_label": "Customers"}},
+            "columns": {},
+        },
+        "test.shop.not_null": {
+            "resource_type": "test",
+            "name": "not_null",
+            "original_file_path": "models/schema.yml",
+        },
+    },
+}
+
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        # A repository with the dbt project in a subdirectory
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        os.makedirs(os.path.join("dbt", "target"))
+        self.path = os.path.join("dbt", "target", "manifest.json")
+        with open(self.path, "w") as file:
+            json.dump(MANIFEST, file)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        self.tmp_dir.cleanup()
+
+    def test_schema_file_path_prefers_patch_path(self):
+        nodes = MANIFEST["nodes"]
+        self.assertEqual(
+            schema_file_path(nodes["model.shop.orders"]), "models/schema.yml"
+        )
+        self.assertEqual(
+            schema_file_path(nodes["model.shop.customers"]), "models/customers.sql"
+        )
+
+    def test_model_from_node(self):
+        model = model_from_node(MANIFEST["nodes"]["model.shop.customers"])
+        self.assertEqual(
+            model,
+            {"name": "customers", "meta": {"group_label": "Customers"}, "columns": []},
+        )
+
+    def test_models_are_grouped_by_file(self):
+        files = load_manifest_models(self.path)
+        self.assertEqual(list(files), ["models/customers.sql", "models/schema.yml"])
+        self.assertEqual(
+            [model["name"] for model in files["models/schema.yml"]["models"]],
+            ["orders"],
+        )
+
+    def run_main(self, *args):
+        self.stderr = io.StringIO()
+        return run_main(
+            main, ["--manifest", self.path, "--no-cache", *args], self.stderr
+        )
+
+    def test_errors_map_to_schema_files(self):
+        result, output = self.run_main()
+        self.assertEqual(result, 1)
+        self.assertEqual(
+            output,
+            "Errors found in 'dbt/models/schema.yml':\n"
+            "Missing 'group_label' or 'groups' in column metric 'revenue_sum'.\n",
+        )
+
+    def test_filenames_limit_the_checked_files(self):
+        result, output = self.run_main("dbt/models/customers.sql")
+        self.assertEqual(result, 0)
+        self.assertEqual(output, "")
+        self.assertNotIn("None of the given files", self.stderr.getvalue())
+
+        result, output = self.run_main("dbt/models/schema.yml")
+        self.assertEqual(result, 1)
+
+    def test_project_root_can_be_given(self):
+        result, output = self.run_main(
+            "--manifest-project-root", ".", "models/schema.yml"
+        )
+        self.assertEqual(result, 1)
+        self.assertTrue(output.startswith("Errors found in 'models/schema.yml':"))
+
+    def test_warns_when_no_given_file_matches(self):
+        result, output = self.run_main("models/schema.yml")
+        self.assertEqual(result, 0)
+        self.assertIn("None of the given files define models", self.stderr.getvalue())
+
+    def test_unreadable_manifest_fails(self):
+        os.remove(self.path)
+        result, output = self.run_main()
+        self.assertEqual(result, 1)
+        self.assertTrue(output.startswith(f"Failed to process '{self.path}':"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+
+from lightdash_pre_commit.nodes import Column
+from lightdash_pre_commit.nodes import Model
+from lightdash_pre_commit.nodes import normalize
+from lightdash_pre_commit.parsers import get_parser
+
+YAML_DATA = """
+models:
+  - name: orders
+    meta:
+      group_label: Finance
+      metrics:
+        order_count:
+          type: count
+    columns:
+      - name: ordered_at
+        meta:
+          dimension:
+            type: date
+            hidden: true
+            metrics:
+              nested: {}
+          additional_dimensions:
+            ordered_week:
+              groups: [dates]
+          metrics:
+            first_order:
+              skip_group_label: true
+            last_order:
+      - name: no_meta
+"""
+
+
+class TestNodes(unittest.TestCase):
+    def setUp(self):
+        self.schema = normalize(get_parser("python").load(YAML_DATA))
+
+    def test_normalize(self):
+        self.assertTrue(self.schema.has_models)
+
+        (model,) = self.schema.models
+        self.assertEqual((model.name, model.line, model.column), ("orders", 3, 5))
+        self.assertEqual(model.group_label, "Finance")
+        self.assertEqual((model.meta.line, model.meta.column), (4, 5))
+        self.assertEqual([metric.name for metric in model.metrics], ["order_count"])
+
+        column, no_meta = model.columns
+        self.assertEqual((column.name, column.line), ("ordered_at", 10))
+        self.assertEqual((no_meta.dimension, no_meta.metrics), (None, []))
+
+        dimension = column.dimension
+        self.assertEqual(dimension.name, "ordered_at")
+        self.assertTrue(dimension.hidden)
+        self.assertFalse(dimension.labelled)
+        self.assertIsNone(dimension.nested_additional_dimensions)
+        self.assertEqual(dimension.nested_metrics.line, 15)
+
+        (additional,) = column.additional_dimensions
+        self.assertEqual(additional.name, "ordered_week")
+        self.assertTrue(additional.labelled)
+        self.assertEqual(additional.groups, ["dates"])
+
+        first, last = column.metrics
+        self.assertTrue(first.skip_group_label)
+        # An empty metric is normalized like one without any keys
+        self.assertEqual(
+            (last.name, last.labelled, last.line), ("last_order", False, None)
+        )
+
+    def test_summary(self):
+        summary = self.schema.summary
+        (model,) = summary.models
+        self.assertEqual(
+            (
+                model.name,
+                model.dimensions,
+                model.additional_dimensions,
+                model.column_metrics,
+                model.model_metrics,
+            ),
+            ("orders", 1, 1, 2, 1),
+        )
+        self.assertEqual((summary.metrics, summary.fields), (3, 5))
+
+    def test_nodes_are_compact(self):
+        (model,) = self.schema.models
+        nodes = [model, model.meta, *model.metrics, *model.columns]
+        nodes += [model.columns[0].dimension, *model.columns[0].metrics]
+        for node in nodes:
+            with self.subTest(node=type(node).__name__):
+                self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_names_are_interned(self):
+        first = normalize(get_parser("python").load(YAML_DATA))
+        self.assertIs(first.models[0].name, self.schema.models[0].name)
+
+    def test_invalid_nodes(self):
+        for data in (None, [], {"models": {}}, {"models": ["orders"]}):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                normalize(data)
+        with self.assertRaises(ValueError):
+            Column.from_dict({"name": "c", "meta": {"metrics": ["m"]}})
+        with self.assertRaises(ValueError):
+            Model.from_dict({"name": "m", "columns": {"c": {}}})
+
+    def test_file_without_models(self):
+        schema = normalize({"sources": []})
+        self.assertFalse(schema.has_models)
+        self.assertEqual(schema.models, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import yaml
+
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.find_missing_model_group_labels import (
+    MissingModelGroupLabelsCheck,
+)
+from lightdash_pre_commit.parsers import get_parser
+from lightdash_pre_commit.parsers import Parser
+from lightdash_pre_commit.parsers import PARSERS
+from lightdash_pre_commit.parsers import register_parser
+
+YAML_DATA = """
+models:
+  - name: orders
+    meta:
+      group_label: "Sales"
+    columns:
+      - name: ordered_at
+        meta:
+          dimension:
+            hidden: true
+"""
+
+
+class TestGetParser(unittest.TestCase):
+    def test_parsers_load_the_same_data(self):
+        expected = yaml.safe_load(YAML_DATA)
+        for name in ("auto", "python"):
+            self.assertEqual(get_parser(name).load(YAML_DATA), expected)
+
+    @unittest.skipUnless(yaml.__with_libyaml__, "PyYAML built without libyaml")
+    def test_auto_prefers_libyaml(self):
+        parser = get_parser("auto")
+        self.assertEqual(parser.name, "c")
+        self.assertEqual(parser.load(YAML_DATA), yaml.safe_load(YAML_DATA))
+
+    def test_auto_falls_back_without_libyaml(self):
+        # Imported first, so the loaders do not see the patched module
+        import lightdash_pre_commit.loaders  # noqa: F401
+
+        with mock.patch.object(yaml, "CSafeLoader", None):
+            self.assertEqual(get_parser("auto").name, "python")
+            with self.assertRaises(ValueError):
+                get_parser("c")
+
+    def test_unknown_parser(self):
+        with self.assertRaises(ValueError):
+            get_parser("does-not-exist")
+
+    def test_register_parser(self):
+        class StaticParser(Parser):
+            name = "static"
+            description = "always returns no models"
+
+            def load(self, stream):
+                return {"models": []}
+
+        register_parser("static", StaticParser)
+        try:
+            self.assertEqual(get_parser("static").load(YAML_DATA), {"models": []})
+        finally:
+            del PARSERS["static"]
+
+
+class TestParseErrors(unittest.TestCase):
+    def test_parse_errors_name_the_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "bad.yml")
+            with open(file_path, "w") as file:
+                file.write("models:\n  - name: [orders\n")
+            with open(file_path, "rb") as file:
+                content = file.read()
+            for name in PARSERS:
+                try:
+                    parser = get_parser(name)
+                except ValueError:
+                    continue
+                for streaming in (False, True):
+                    core = Core(
+                        [MissingModelGroupLabelsCheck()],
+                        parser=parser,
+                        streaming=streaming,
+                    )
+                    # Read by the check itself, and handed over already read
+                    for given in (None, content):
+                        with self.subTest(parser=name, streaming=streaming):
+                            try:
+                                core.check_file(file_path, given)
+                            except ValueError as e:
+                                if streaming and "streaming" in str(e):
+                                    continue
+                                raise
+                            except Exception as e:
+                                self.assertIn(f'"{file_path}"', str(e))
+                            else:
+                                self.fail("the file was parsed")
+
+
+if __name__ == "__main__":
+    unittest.main()
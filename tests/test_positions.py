@@ -0,0 +1,91 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from lightdash_pre_commit.check_duplicate_metric_dimension_names import find_duplicates
+from lightdash_pre_commit.find_missing_metric_group_labels import (
+    find_missing_group_labels,
+)
+from lightdash_pre_commit.lightdash_check import main
+from lightdash_pre_commit.parsers import get_parser
+from lightdash_pre_commit.positions import position_of
+
+YAML_DATA = """models:
+  - name: orders
+    meta:
+      metrics:
+        revenue:
+          type: sum
+    columns:
+      - name: revenue
+        meta:
+          dimension:
+            type: number
+            group_label: "Revenue"
+          metrics:
+            revenue_total:
+              type: sum
+"""
+
+
+class TestPositions(unittest.TestCase):
+    def test_nested_mappings_point_at_their_key(self):
+        for name in ("c", "python"):
+            data = get_parser(name).load(YAML_DATA)
+            model = data["models"][0]
+            column = model["columns"][0]
+            self.assertEqual(position_of(model), (2, 5))
+            self.assertEqual(position_of(model["meta"]["metrics"]["revenue"]), (5, 9))
+            self.assertEqual(position_of(column), (8, 9))
+            self.assertEqual(position_of(column["meta"]["dimension"]), (10, 11))
+
+    def test_plain_values_have_no_position(self):
+        self.assertEqual(position_of({"a": 1}), (None, None))
+        self.assertEqual(position_of("revenue"), (None, None))
+
+    def test_diagnostics_carry_positions(self):
+        data = get_parser().load(YAML_DATA)
+        error = find_missing_group_labels(data)[0]
+        self.assertEqual(
+            error, "Missing 'group_label' or 'groups' in model-level metric 'revenue'."
+        )
+        self.assertEqual((error.line, error.column), (5, 9))
+
+    def test_duplicates_list_every_occurrence(self):
+        data = get_parser().load(YAML_DATA)
+        (error,) = find_duplicates(data)
+        self.assertEqual(error.occurrences, [(5, 9), (8, 9)])
+        self.assertEqual(
+            error.format("schema.yml"),
+            "schema.yml:5:9: Duplicate name 'revenue' used 2 times (as metrics or "
+            "dimensions). Defined at: schema.yml:5:9, schema.yml:8:9.",
+        )
+
+    def test_output_includes_location(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "schema.yml")
+            with open(file_path, "w") as file:
+                file.write(YAML_DATA)
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(
+                io.StringIO()
+            ):
+                main(
+                    [
+                        file_path,
+                        "--no-cache",
+                        "--skip",
+                        "check-duplicate-dims-and-metrics",
+                    ]
+                )
+        self.assertIn(
+            f"{file_path}:14:13: Missing 'group_label' or 'groups' in column metric "
+            f"'revenue_total'.",
+            output.getvalue(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from benchmarks.generate_schema import generate_file
+from lightdash_pre_commit import prefilter
+from lightdash_pre_commit.check_duplicate_metric_dimension_names import (
+    DuplicateNamesCheck,
+)
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.find_incorrect_indentation_of_dims_and_metrics import (
+    IndentationCheck,
+)
+from lightdash_pre_commit.find_missing_dimension_group_labels import (
+    MissingDimensionGroupLabelsCheck,
+)
+from lightdash_pre_commit.find_missing_metric_group_labels import (
+    MissingMetricGroupLabelsCheck,
+)
+from lightdash_pre_commit.find_missing_model_group_labels import (
+    MissingModelGroupLabelsCheck,
+)
+from lightdash_pre_commit.lightdash_check import build_checks
+from lightdash_pre_commit.prefilter import scan
+
+# Files that only some checks can report on, or none of them
+HANDCRAFTED = {
+    "tests_only": """
+version: 2
+models:
+  - name: orders
+    description: "Orders."
+    columns:
+      - name: id
+        tests:
+          - unique
+          - not_null
+""",
+    "empty_models": "models:\n",
+    "empty_file": "",
+    "sources_only": """
+version: 2
+sources:
+  - name: raw
+    tables:
+      - name: orders
+""",
+    "model_metrics_only": """
+models:
+  - name: orders
+    meta:
+      metrics:
+        order_count:
+          type: count
+""",
+    "dimensions_only": """
+models:
+  - name: orders
+    meta:
+      group_label: Finance
+    columns:
+      - name: id
+        meta:
+          dimension:
+            type: string
+          additional_dimensions:
+            id_prefix:
+              type: string
+""",
+    "nested_metrics": """
+models:
+  - name: orders
+    columns:
+      - name: id
+        meta:
+          dimension:
+            type: string
+            metrics:
+              count_id:
+                type: count
+""",
+    "quoted_keys": """
+"models":
+  - name: orders
+    columns:
+      - name: id
+        meta:
+          "dimension":
+            type: string
+          'metrics':
+            count_id:
+              type: count
+""",
+    "flow_style": """
+models: [{name: orders, columns: [{name: id, meta: {metrics: {n: {type: count}}}}]}]
+""",
+    "anchors_and_merge": """
+defaults: &meta
+  dimension:
+    type: string
+models:
+  - name: orders
+    columns:
+      - name: id
+        meta: *meta
+      - name: other
+        meta:
+          <<: *meta
+""",
+    "escaped_key": """
+models:
+  - name: orders
+    columns:
+      - name: id
+        meta:
+          "m\\x65trics":
+            count_id:
+              type: count
+""",
+    "comment_mentions": """
+# metrics and dimension are defined elsewhere
+models:
+  - name: orders
+    description: "Has no dimension or metrics."
+""",
+    "several_documents": """
+models:
+  - name: orders
+---
+models:
+  - name: customers
+""",
+    "no_models_key": """
+version: 2
+seeds:
+  - name: metrics
+""",
+    # Files that fail to load or normalize, which must still be reported
+    "syntax_error": "models: [",
+    "models_not_a_list": "models: 3\n",
+    "model_not_a_mapping": "models:\n  - orders\n",
+    "columns_not_a_list": "models:\n  - name: orders\n    columns: {id: {}}\n",
+    "meta_not_a_mapping": "models:\n  - name: orders\n    meta: [a]\n",
+    "undefined_alias": "models:\n  - name: *orders\n",
+    "unknown_tag": "models:\n  - name: !custom orders\n",
+    "invalid_timestamp": "models:\n  - name: orders\n    updated: 2020-13-45\n",
+    "unhashable_key": "models:\n  - ? [a, b]\n    : orders\n",
+    "merge_key": """
+defaults: &defaults
+  columns: 3
+models:
+  - name: orders
+    <<: *defaults
+""",
+}
+
+CHECK_SETS = {
+    "duplicates": lambda: [DuplicateNamesCheck()],
+    "metrics": lambda: [MissingMetricGroupLabelsCheck()],
+    "metrics_skip_without": lambda: [
+        MissingMetricGroupLabelsCheck(skip_without_dimensions_and_metrics=True)
+    ],
+    "dimensions": lambda: [MissingDimensionGroupLabelsCheck()],
+    "indentation": lambda: [IndentationCheck()],
+    "models": lambda: [MissingModelGroupLabelsCheck(["Finance"])],
+    "all": lambda: build_checks(()),
+}
+
+
+def corpus():
+    files = dict(HANDCRAFTED)
+    rng = random.Random(16)
+    for index, (columns, metrics, additional) in enumerate(
+        [(0, 0, 0), (2, 0, 0), (2, 2, 0), (2, 0, 2), (3, 2, 2)]
+    ):
+        files[f"generated_{index}"] = generate_file(
+            rng, index, 2, columns, metrics, additional, 0.3
+        )
+    return files
+
+
+class TestPrefilter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.files = {}
+        for name, content in corpus().items():
+            path = os.path.join(self.tmpdir.name, f"{name}.yml")
+            with open(path, "w") as file:
+                file.write(content)
+            self.files[name] = path
+
+    def check(self, checks, path, **kwargs):
+        try:
+            return Core(checks, **kwargs).check_file(path)
+        except Exception as error:
+            return type(error)
+
+    def test_matches_full_parse(self):
+        for checks_name, make_checks in CHECK_SETS.items():
+            for streaming in (False, True):
+                for name, path in self.files.items():
+                    with self.subTest(
+                        checks=checks_name, streaming=streaming, file=name
+                    ):
+                        self.assertEqual(
+                            self.check(
+                                make_checks(), path, streaming=streaming, prefilter=True
+                            ),
+                            self.check(
+                                make_checks(),
+                                path,
+                                streaming=streaming,
+                                prefilter=False,
+                            ),
+                        )
+
+    def test_skipped_files_are_not_parsed(self):
+        core = Core([MissingDimensionGroupLabelsCheck()])
+        with mock.patch.object(core.parser, "load", wraps=core.parser.load) as load:
+            self.assertEqual(core.check_file(self.files["tests_only"]), [])
+            self.assertEqual(core.check_file(self.files["model_metrics_only"]), [])
+            load.assert_not_called()
+            core.check_file(self.files["dimensions_only"])
+            load.assert_called_once()
+
+    def test_files_with_errors_are_parsed(self):
+        core = Core([MissingDimensionGroupLabelsCheck()])
+        for name in ("syntax_error", "models_not_a_list", "merge_key"):
+            with self.subTest(file=name):
+                self.assertFalse(core.skippable(self.files[name]))
+        self.assertTrue(core.skippable(self.files["tests_only"]))
+
+    def test_files_every_check_may_report_on_are_parsed(self):
+        core = Core([MissingModelGroupLabelsCheck(["Finance"])])
+        self.assertFalse(core.skippable(self.files["tests_only"]))
+
+    def test_scan(self):
+        self.assertEqual(scan(b"models:\n"), frozenset())
+        self.assertEqual(
+            scan(b"models:\n  - meta:\n      metrics: {}\n"), frozenset(["metrics"])
+        )
+        # Files that cannot be judged from their bytes
+        self.assertIsNone(scan(b"version: 2\n"))
+        self.assertIsNone(scan(b'models:\n  - name: "a\\x62"\n'))
+        self.assertIsNone(scan(b"models:\n---\nmodels:\n"))
+        self.assertIsNone(scan("models:\n".encode("utf-16")))
+        # A leading document marker is not a second document
+        self.assertEqual(scan(b"---\nmodels:\n"), frozenset())
+
+    def test_large_files_are_memory_mapped(self):
+        path = self.files["generated_4"]
+        with mock.patch.object(prefilter, "MMAP_THRESHOLD", 0), mock.patch(
+            "mmap.mmap", wraps=prefilter.mmap.mmap
+        ) as mmap:
+            self.assertEqual(
+                prefilter.scan_file(path), frozenset(["metrics", "dimension"])
+            )
+            mmap.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
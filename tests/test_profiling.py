@@ -0,0 +1,97 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from helpers import run_main
+
+from lightdash_pre_commit import core
+from lightdash_pre_commit.lightdash_check import main
+from lightdash_pre_commit.profiling import PROFILE_ENV_VAR
+
+YAML_DATA = """
+models:
+  - name: orders
+    meta:
+      group_label: "Sales"
+    columns:
+      - name: revenue
+        meta:
+          dimension:
+            group_label: "Sales"
+          metrics:
+            revenue_sum:
+              type: sum
+"""
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.trace_path = os.path.join(self.tmp_dir.name, "trace.json")
+        self.filenames = []
+        for i in range(4):
+            file_path = os.path.join(self.tmp_dir.name, f"schema_{i}.yml")
+            with open(file_path, "w") as file:
+                file.write(YAML_DATA)
+            self.filenames.append(file_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_main(self, *extra_args):
+        argv = [
+            *self.filenames,
+            "--no-cache",
+            "--profile-output",
+            self.trace_path,
+            *extra_args,
+        ]
+        stderr = io.StringIO()
+        run_main(main, argv, stderr)
+        return stderr.getvalue()
+
+    def load_events(self):
+        with open(self.trace_path) as file:
+            return json.load(file)["traceEvents"]
+
+    def test_writes_trace_with_file_and_phase_spans(self):
+        stderr = self.run_main("--profile", "--jobs", "1")
+        events = self.load_events()
+        files = [event["name"] for event in events if event["cat"] == "file"]
+        self.assertEqual(files, self.filenames)
+        phases = {event["name"] for event in events if event["cat"] == "phase"}
+        self.assertEqual(phases, {"read", "prefilter", "parse", "walk", "report"})
+        checks = {event["name"] for event in events if event["cat"] == "check"}
+        self.assertIn("check-duplicate-dims-and-metrics", checks)
+        self.assertTrue(all(event["ph"] == "X" for event in events))
+        self.assertIn("Profiled 4 files", stderr)
+        self.assertIn("files/s", stderr)
+
+    def test_environment_variable_enables_profiling(self):
+        with mock.patch.dict(os.environ, {PROFILE_ENV_VAR: "1"}):
+            self.run_main("--jobs", "1")
+        self.assertTrue(os.path.exists(self.trace_path))
+
+    def test_disabled_by_default(self):
+        with mock.patch.dict(os.environ, {PROFILE_ENV_VAR: ""}):
+            self.run_main("--jobs", "1")
+        self.assertFalse(os.path.exists(self.trace_path))
+
+    def test_worker_spans_are_collected(self):
+        with mock.patch.object(core, "MIN_FILES_PER_JOB", 1):
+            self.run_main("--profile", "--jobs", "2")
+        events = self.load_events()
+        files = [event["name"] for event in events if event["cat"] == "file"]
+        self.assertEqual(sorted(files), sorted(self.filenames))
+
+    def test_cprofile_dump(self):
+        cprofile_path = os.path.join(self.tmp_dir.name, "run.prof")
+        self.run_main("--profile", "--jobs", "1", "--profile-cprofile", cprofile_path)
+        self.assertTrue(os.path.exists(cprofile_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
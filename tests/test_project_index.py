@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from lightdash_pre_commit.parsers import get_parser
+from lightdash_pre_commit.parsers import PyYAMLParser
+from lightdash_pre_commit.project_index import ProjectIndex
+
+ORDERS_YAML = """
+models:
+  - name: orders
+    columns:
+      - name: revenue
+        meta:
+          metrics:
+            revenue_sum:
+              type: sum
+"""
+
+PAYMENTS_YAML = """
+models:
+  - name: payments
+    columns:
+      - name: amount
+        meta:
+          metrics:
+            revenue_sum:
+              type: sum
+"""
+
+CUSTOMERS_YAML = """
+models:
+  - name: customers
+    meta:
+      metrics:
+        customer_count:
+          type: count
+"""
+
+
+class TestProjectIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self.tmp_dir.name
+        self.cache_dir = os.path.join(self.root, ".cache")
+        os.makedirs(os.path.join(self.root, "models"))
+        self.write("models/orders.yml", ORDERS_YAML)
+        self.write("models/payments.yml", PAYMENTS_YAML)
+        self.write("models/customers.yml", CUSTOMERS_YAML)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, path, content):
+        with open(os.path.join(self.root, path), "w") as file:
+            file.write(content)
+
+    def check(self, *paths):
+        index = ProjectIndex(self.root, self.cache_dir)
+        filenames = [os.path.join(self.root, path) for path in paths]
+        with mock.patch(
+            "lightdash_pre_commit.project_index.discover_schema_files",
+            side_effect=lambda root: sorted(
+                f"models/{name}" for name in os.listdir(os.path.join(root, "models"))
+            ),
+        ):
+            return index, dict(index.check(get_parser(), filenames))
+
+    def test_reports_clash_against_files_not_passed(self):
+        _, results = self.check("models/orders.yml")
+        (error,) = next(iter(results.values()))
+        self.assertEqual(
+            error,
+            "Name 'revenue_sum' in model 'orders' is also defined in other models of "
+            "the project: 'payments' (models/payments.yml:8:13).",
+        )
+        self.assertEqual((error.line, error.column), (8, 13))
+
+    def test_no_clash(self):
+        _, results = self.check("models/customers.yml")
+        self.assertEqual(results, {})
+
+    def test_index_maps_names_and_files(self):
+        index, _ = self.check("models/customers.yml")
+        self.assertEqual(
+            sorted(path for path, _ in index.names["revenue_sum"]),
+            ["models/orders.yml", "models/payments.yml"],
+        )
+        self.assertEqual(
+            [d[0] for d in index.files["models/customers.yml"]["definitions"]],
+            ["customer_count"],
+        )
+
+    def test_only_changed_files_are_parsed_again(self):
+        self.check("models/orders.yml")
+        self.write("models/payments.yml", CUSTOMERS_YAML.replace("customers", "pay"))
+        with mock.patch.object(
+            PyYAMLParser, "load", autospec=True, side_effect=PyYAMLParser.load
+        ) as load:
+            index, results = self.check("models/orders.yml")
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(results, {})
+        self.assertEqual(
+            sorted(path for path, _ in index.names["customer_count"]),
+            ["models/customers.yml", "models/payments.yml"],
+        )
+
+    def test_deleted_files_are_dropped(self):
+        self.check("models/orders.yml")
+        os.remove(os.path.join(self.root, "models/payments.yml"))
+        index, results = self.check("models/orders.yml")
+        self.assertEqual(results, {})
+        self.assertNotIn("models/payments.yml", index.files)
+
+
+if __name__ == "__main__":
+    unittest.main()
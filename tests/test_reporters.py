@@ -0,0 +1,206 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from xml.etree import ElementTree
+
+from helpers import run_main
+
+from lightdash_pre_commit.diagnostics import Diagnostic
+from lightdash_pre_commit.lightdash_check import main
+from lightdash_pre_commit.reporters import BufferedOutput
+from lightdash_pre_commit.reporters import get_reporter
+
+YAML_DATA = """
+models:
+  - name: orders
+    meta:
+      group_label: "Sales"
+      metrics:
+        revenue:
+          type: sum
+    columns:
+      - name: revenue
+        meta:
+          dimension:
+            type: number
+"""
+
+ERRORS = [
+    Diagnostic(
+        "Missing 'group_label' or 'groups' in column metric 'revenue'.",
+        5,
+        9,
+        rule="find_missing_metric_group_labels",
+        model="orders",
+        node="revenue",
+    ),
+    Diagnostic(
+        "Duplicate name 'revenue' used 2 times (as metrics or dimensions).",
+        7,
+        9,
+        occurrences=[(7, 9), (10, 9)],
+        severity="warning",
+        rule="check-duplicate-dims-and-metrics",
+        node="revenue",
+    ),
+]
+
+
+def report(name, results):
+    stream = io.StringIO()
+    reporter = get_reporter(name, stream, ["find_missing_metric_group_labels"])
+    reporter.start()
+    for file_path, errors, failure in results:
+        reporter.file(file_path, errors, failure)
+    reporter.finish()
+    return stream.getvalue()
+
+
+class TestReporters(unittest.TestCase):
+    results = [
+        ("schema.yml", ERRORS, None),
+        ("clean.yml", [], None),
+        ("broken.yml", [], "could not parse"),
+    ]
+
+    def test_text(self):
+        self.assertEqual(
+            report("text", self.results),
+            "Errors found in 'schema.yml':\n"
+            "schema.yml:5:9: Missing 'group_label' or 'groups' in column metric "
+            "'revenue'.\n"
+            "schema.yml:7:9: warning: Duplicate name 'revenue' used 2 times (as "
+            "metrics or dimensions). Defined at: schema.yml:7:9, schema.yml:10:9.\n"
+            "Failed to process 'broken.yml': could not parse\n",
+        )
+
+    def test_json(self):
+        records = json.loads(report("json", self.results))
+        self.assertEqual(len(records), 3)
+        self.assertEqual(
+            records[0],
+            {
+                "rule": "find_missing_metric_group_labels",
+                "severity": "error",
+                "file": "schema.yml",
+                "line": 5,
+                "column": 9,
+                "model": "orders",
+                "node": "revenue",
+                "message": ERRORS[0].message,
+                "occurrences": [],
+            },
+        )
+        self.assertEqual(records[1]["occurrences"], [[7, 9], [10, 9]])
+        self.assertEqual(
+            (records[2]["rule"], records[2]["file"], records[2]["message"]),
+            ("failed-to-process", "broken.yml", "could not parse"),
+        )
+        self.assertEqual(json.loads(report("json", [])), [])
+
+    def test_sarif(self):
+        log = json.loads(report("sarif", self.results))
+        self.assertEqual(log["version"], "2.1.0")
+        (run,) = log["runs"]
+        self.assertEqual(
+            run["tool"]["driver"]["rules"], [{"id": "find_missing_metric_group_labels"}]
+        )
+        first, warning, failure = run["results"]
+        self.assertEqual(first["ruleId"], "find_missing_metric_group_labels")
+        (location,) = first["locations"]
+        self.assertEqual(
+            location["physicalLocation"],
+            {
+                "artifactLocation": {"uri": "schema.yml"},
+                "region": {"startLine": 5, "startColumn": 9},
+            },
+        )
+        self.assertEqual(
+            location["logicalLocations"][0]["fullyQualifiedName"], "orders.revenue"
+        )
+        self.assertEqual(warning["level"], "warning")
+        self.assertEqual(len(warning["relatedLocations"]), 2)
+        self.assertNotIn("region", failure["locations"][0]["physicalLocation"])
+
+    def test_junit(self):
+        root = ElementTree.fromstring(report("junit", self.results))
+        suites = root.findall("testsuite")
+        self.assertEqual(
+            [
+                (suite.get("name"), suite.get("tests"), suite.get("failures"))
+                for suite in suites
+            ],
+            [
+                ("schema.yml", "2", "1"),
+                ("clean.yml", "1", "0"),
+                ("broken.yml", "1", "1"),
+            ],
+        )
+        failure = suites[0].find("testcase/failure")
+        self.assertEqual(failure.get("type"), "find_missing_metric_group_labels")
+        self.assertEqual(failure.text, "schema.yml:5:9")
+        self.assertEqual(
+            suites[0].findall("testcase")[0].get("name"),
+            "find_missing_metric_group_labels: orders.revenue",
+        )
+        self.assertIn("warning", suites[0].find("testcase/system-out").text)
+
+
+class TestBufferedOutput(unittest.TestCase):
+    def test_writes_in_chunks(self):
+        writes = []
+
+        class Stream(io.StringIO):
+            def write(self, text):
+                writes.append(text)
+                return super().write(text)
+
+        stream = Stream()
+        output = BufferedOutput(stream, size=10)
+        for _ in range(7):
+            output.write("abc\n")
+        self.assertEqual(writes, ["abc\nabc\nabc\n", "abc\nabc\nabc\n"])
+        output.flush()
+        self.assertEqual(stream.getvalue(), "abc\n" * 7)
+
+
+class TestFormatOption(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, "schema.yml")
+        with open(self.file_path, "w") as file:
+            file.write(YAML_DATA)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_main(self, *args):
+        return run_main(main, [self.file_path, "--no-cache", "--jobs", "1", *args])
+
+    def test_json_names_rule_model_and_node(self):
+        exit_code, output = self.run_main("--format", "json")
+        self.assertEqual(exit_code, 1)
+        records = json.loads(output)
+        self.assertIn(
+            (
+                "find_missing_dimension_group_labels",
+                "orders",
+                "revenue",
+                self.file_path,
+                12,
+            ),
+            [(r["rule"], r["model"], r["node"], r["file"], r["line"]) for r in records],
+        )
+        self.assertIn(
+            ("find_missing_metric_group_labels", "orders", "revenue"),
+            [(r["rule"], r["model"], r["node"]) for r in records],
+        )
+
+    def test_text_is_the_default(self):
+        self.assertEqual(self.run_main(), self.run_main("--format", "text"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import io
+import os
+import tempfile
+import unittest
+
+from helpers import run_main
+
+from lightdash_pre_commit.find_missing_model_group_labels import (
+    MissingModelGroupLabelsCheck,
+)
+from lightdash_pre_commit.lightdash_check import build_checks
+from lightdash_pre_commit.lightdash_check import main
+from lightdash_pre_commit.rules import configure_checks
+from lightdash_pre_commit.rules import load_rule_config
+
+YAML_DATA = """
+models:
+  - name: orders
+    columns:
+      - name: revenue
+        meta:
+          dimension:
+            type: number
+            group_label: Revenue
+"""
+
+CONFIG = """
+rules:
+  find_missing_model_group_labels:
+    severity: warning
+  check-duplicate-dims-and-metrics:
+    enabled: false
+"""
+
+
+class TestRules(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        self.write("schema.yml", YAML_DATA)
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        self.tmp_dir.cleanup()
+
+    def write(self, path, content):
+        with open(path, "w") as file:
+            file.write(content)
+
+    def run_main(self, *args):
+        self.stderr = io.StringIO()
+        try:
+            return run_main(main, ["schema.yml", "--no-cache", *args], self.stderr)
+        except SystemExit as e:
+            return e.code, ""
+
+    def test_default_config_is_optional(self):
+        self.assertEqual(load_rule_config(), {})
+
+    def test_load_rule_config(self):
+        self.write(".lightdash-precommit.yml", CONFIG)
+        self.assertEqual(
+            load_rule_config(),
+            {
+                "find_missing_model_group_labels": {
+                    "enabled": True,
+                    "severity": "warning",
+                },
+                "check-duplicate-dims-and-metrics": {
+                    "enabled": False,
+                    "severity": "error",
+                },
+            },
+        )
+
+    def test_invalid_configs(self):
+        for content in (
+            "- rules\n",
+            "rules: [a]\n",
+            "rules:\n  a: {severity: fatal}\n",
+            "rules:\n  a: {enabled: 'no'}\n",
+            "rules:\n  a: {level: error}\n",
+            "rules: [\n",
+        ):
+            with self.subTest(content=content):
+                self.write("config.yml", content)
+                with self.assertRaises(ValueError):
+                    load_rule_config("config.yml")
+
+    def test_configure_checks(self):
+        self.write("config.yml", CONFIG)
+        checks = configure_checks(build_checks(), load_rule_config("config.yml"))
+        self.assertEqual(
+            [(check.name, check.severity) for check in checks],
+            [
+                ("find_missing_metric_group_labels", "error"),
+                ("find_missing_dimension_group_labels", "error"),
+                ("find_incorrect_indentation_of_dims_and_metrics", "error"),
+                ("find_missing_model_group_labels", "warning"),
+            ],
+        )
+        self.assertIsInstance(checks[-1], MissingModelGroupLabelsCheck)
+
+    def test_warnings_do_not_fail_the_hook(self):
+        self.assertEqual(self.run_main()[0], 1)
+
+        self.write(".lightdash-precommit.yml", CONFIG)
+        result, output = self.run_main()
+        self.assertEqual(result, 0)
+        self.assertEqual(
+            output,
+            "Warnings found in 'schema.yml':\n"
+            "schema.yml:3:5: warning: Missing 'group_label' in model 'orders' meta.\n",
+        )
+
+    def test_invalid_config_is_an_argument_error(self):
+        self.write("config.yml", "rules:\n  a: {severity: fatal}\n")
+        result, output = self.run_main("--config", "config.yml")
+        self.assertEqual(result, 2)
+        self.assertIn("Invalid rule config", self.stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
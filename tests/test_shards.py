@@ -0,0 +1,199 @@
+import argparse
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from helpers import run_main
+
+from lightdash_pre_commit import core
+from lightdash_pre_commit.lightdash_check import main
+from lightdash_pre_commit.shards import parse_shard
+from lightdash_pre_commit.shards import select_shard
+from lightdash_pre_commit.shards import shard_of
+
+SCHEMA_YAML = """
+models:
+  - name: model_{index}
+    meta:
+      group_label: "Sales"
+      metrics:
+        total_{index}:
+          type: sum
+          group_label: "Sales"
+    columns:
+      - name: {column}
+        meta:
+          dimension:
+            type: number
+"""
+
+FILES = 12
+SHARDS = 3
+
+
+class TestSharding(unittest.TestCase):
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for value in ("0/4", "5/4", "1", "a/b", "1/0"):
+            with self.subTest(value=value):
+                with self.assertRaises(argparse.ArgumentTypeError):
+                    parse_shard(value)
+
+    def test_shards_are_stable_and_split_every_file(self):
+        paths = [f"models/schema_{i}.yml" for i in range(100)]
+        shards = [select_shard(paths, (number, 4)) for number in range(1, 5)]
+        self.assertEqual(
+            sorted(path for shard in shards for path in shard), sorted(paths)
+        )
+        self.assertTrue(all(shards))
+        # The same file lands in the same shard however its path is spelled
+        self.assertEqual(shard_of("./models/schema_1.yml", 4), shard_of(paths[1], 4))
+        self.assertEqual(shard_of(os.path.abspath(paths[1]), 4), shard_of(paths[1], 4))
+        self.assertEqual(shard_of(paths[1], 4), 1)
+
+
+class TestShardsAndMerge(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        old_cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        self.addCleanup(os.chdir, old_cwd)
+        os.makedirs("models")
+        self.filenames = []
+        for index in range(FILES):
+            # Every third file defines a name another file defines too
+            column = "shared" if index % 3 == 0 else f"column_{index}"
+            file_path = f"models/schema_{index}.yml"
+            with open(file_path, "w") as file:
+                file.write(SCHEMA_YAML.format(index=index, column=column))
+            self.filenames.append(file_path)
+
+    def run_main(self, *args):
+        return run_main(main, args)
+
+    def run_shards(self, *args, prefix="partial"):
+        paths = []
+        for number in range(1, SHARDS + 1):
+            path = f"{prefix}_{number}.json"
+            exit_code, output = self.run_main(
+                *self.filenames,
+                "--shard",
+                f"{number}/{SHARDS}",
+                "--shard-output",
+                path,
+                *args,
+            )
+            self.assertEqual((exit_code, output), (0, ""))
+            paths.append(path)
+        return paths
+
+    def test_merge_matches_a_run_without_shards(self):
+        args = ["--no-cache", "--jobs", "1", "--project-duplicates"]
+        expected = self.run_main(*self.filenames, *args)
+        self.assertEqual(expected[0], 1)
+        self.assertIn("also defined in other models", expected[1])
+        paths = self.run_shards(*args)
+        self.assertEqual(self.run_main("merge", *paths), expected)
+        self.assertEqual(
+            self.run_main("merge", *reversed(paths), "--format", "json"),
+            self.run_main(*self.filenames, *args, "--format", "json"),
+        )
+
+    def test_merge_looks_at_files_not_given_to_the_shards(self):
+        # Only the project index of each shard knows this file
+        with open("models/other.yml", "w") as file:
+            file.write(SCHEMA_YAML.format(index="other", column="column_1"))
+        args = ["--no-cache", "--jobs", "1", "--project-duplicates"]
+        expected = self.run_main(*self.filenames, *args)
+        self.assertIn("'model_other' (models/other.yml:11:9)", expected[1])
+        paths = self.run_shards(*args)
+        project_files = set()
+        for path in paths:
+            with open(path) as file:
+                project_files.update(json.load(file)["project_files"])
+        self.assertEqual(project_files, {"models/other.yml"})
+        self.assertEqual(self.run_main("merge", *paths), expected)
+
+    def test_shards_without_files_write_partial_results(self):
+        paths = []
+        for number in range(1, SHARDS + 1):
+            path = f"empty_{number}.json"
+            self.assertEqual(
+                self.run_main("--shard", f"{number}/{SHARDS}", "--shard-output", path),
+                (0, ""),
+            )
+            with open(path) as file:
+                self.assertEqual(json.load(file)["files"], [])
+            paths.append(path)
+        self.assertEqual(self.run_main("merge", *paths), (0, ""))
+        # A shard that wrote nothing is still missing
+        self.assertEqual(self.run_main("merge", *paths[1:])[0], 2)
+
+    def test_partial_results_hold_definition_counts(self):
+        paths = self.run_shards("--jobs", "1")
+        counts = {}
+        files = 0
+        for path in paths:
+            with open(path) as file:
+                partial = json.load(file)
+            self.assertFalse(partial["project_duplicates"])
+            files += len(partial["files"])
+            for name, definitions in partial["definitions"].items():
+                counts[name] = counts.get(name, 0) + len(definitions)
+        self.assertEqual(files, FILES)
+        self.assertEqual(counts["shared"], FILES // 3)
+        self.assertEqual(counts["total_0"], 1)
+        # Clashes are only looked for when the shards were asked to
+        exit_code, output = self.run_main("merge", *paths)
+        self.assertEqual(exit_code, 1)
+        self.assertNotIn("also defined", output)
+
+    def test_definitions_come_back_from_worker_processes(self):
+        args = ["--no-cache", "--project-duplicates"]
+        with mock.patch.object(core, "MIN_FILES_PER_JOB", 1):
+            paths = self.run_shards(*args, "--jobs", "2")
+        self.assertEqual(
+            self.run_main("merge", *paths),
+            self.run_main(*self.filenames, *args, "--jobs", "1"),
+        )
+
+    def test_refuses_partial_results_it_cannot_merge(self):
+        paths = self.run_shards("--jobs", "1")
+        other = self.run_shards(
+            "--jobs", "1", "--skip", "find_missing_model_group_labels", prefix="other"
+        )
+        with open("not_partial.json", "w") as file:
+            file.write("[]")
+        for args in (
+            paths[:2],
+            [*paths, paths[0]],
+            [paths[0], other[1], paths[2]],
+            [*paths[:2], "not_partial.json"],
+            [*paths[:2], "missing.json"],
+        ):
+            with self.subTest(args=args):
+                self.assertEqual(self.run_main("merge", *args)[0], 2)
+
+    def test_shard_alone_checks_part_of_the_files(self):
+        exit_code, output = self.run_main(
+            *self.filenames, "--no-cache", "--jobs", "1", "--shard", "1/3"
+        )
+        self.assertEqual(exit_code, 1)
+        checked = {path for path in self.filenames if f"'{path}'" in output}
+        self.assertEqual(checked, set(select_shard(self.filenames, (1, 3))))
+
+    def test_rejects_options_partial_results_cannot_hold(self):
+        for args in (["--fix"], ["--fail-fast"], ["--diff-scope"]):
+            with self.subTest(args=args):
+                with self.assertRaises(SystemExit) as raised:
+                    self.run_main(
+                        *self.filenames, "--shard-output", "partial.json", *args
+                    )
+                self.assertEqual(raised.exception.code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+import os
+import unittest
+
+import yaml
+
+from lightdash_pre_commit.lightdash_check import build_checks
+from lightdash_pre_commit.core import compile_dispatch
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.nodes import normalize
+from lightdash_pre_commit.parsers import get_parser
+from lightdash_pre_commit.streaming import EventWalker
+
+TARGET_FILE = os.path.join(os.path.dirname(__file__), "test_target.yml")
+
+YAML_DATA = """
+version: 2
+
+defaults: &hidden_dimension
+  dimension:
+    hidden: true
+
+models:
+  - name: orders
+    meta:
+      metrics:
+        order_count:
+          type: count
+        revenue:
+          type: sum
+    columns:
+      - name: revenue
+        meta:
+          dimension:
+            type: number
+            metrics:
+              nested:
+                type: sum
+          additional_dimensions:
+            revenue_band:
+              type: string
+            metrics:
+              type: string
+          metrics:
+            revenue_sum:
+              type: sum
+              group_label: "Revenue"
+      - name: order_id
+        meta: *hidden_dimension
+      - name: customer_id
+        meta:
+          <<: *hidden_dimension
+          metrics:
+            customer_count:
+              type: count_distinct
+  - name: customers
+    meta:
+      group_label: "Customers"
+    columns:
+      - name: customer_id
+        meta:
+          dimension:
+            type: string
+"""
+
+
+def vars_of(node):
+    return {name: getattr(node, name) for name in node.__slots__}
+
+
+def check_both_ways(yaml_data):
+    core = Core(build_checks(allowed_labels=["Finance"]))
+    parser = get_parser()
+    return core.check_data(parser.load(yaml_data)), core.check_events(
+        parser.parse(yaml_data)
+    )
+
+
+class TestEventWalker(unittest.TestCase):
+    def test_same_errors_as_full_load(self):
+        expected, actual = check_both_ways(YAML_DATA)
+        self.assertEqual(actual, expected)
+        self.assertGreater(len(expected), 5)
+
+    def test_same_positions_as_full_load(self):
+        expected, actual = check_both_ways(YAML_DATA)
+        self.assertEqual(
+            [(error.line, error.column, error.occurrences) for error in actual],
+            [(error.line, error.column, error.occurrences) for error in expected],
+        )
+
+    def test_same_errors_on_target_file(self):
+        with open(TARGET_FILE) as file:
+            yaml_data = file.read()
+        expected, actual = check_both_ways(yaml_data)
+        self.assertEqual(actual, expected)
+
+    def test_meta_after_columns(self):
+        yaml_data = """
+models:
+  - columns:
+      - name: revenue
+        meta:
+          metrics:
+            revenue_sum:
+              type: sum
+    meta:
+      metrics:
+        revenue_sum:
+          type: sum
+    name: orders
+        """
+        expected, actual = check_both_ways(yaml_data)
+        self.assertEqual(sorted(actual), sorted(expected))
+        self.assertIn("Missing 'group_label' in model 'orders' meta.", actual)
+
+    def test_same_summary_as_full_load(self):
+        parser = get_parser()
+        walker = EventWalker(compile_dispatch([]))
+        walker.walk(parser.parse(YAML_DATA))
+        expected = normalize(parser.load(YAML_DATA)).summary
+        actual = walker.presence().summary
+        self.assertEqual(
+            [vars_of(model) for model in actual.models],
+            [vars_of(model) for model in expected.models],
+        )
+        self.assertEqual(actual.fields, expected.fields)
+
+    def test_summary_gates_metric_check(self):
+        # No metrics, so the metric hook skips the file
+        yaml_data = """
+models:
+  - name: orders
+    meta:
+      group_label: "Finance"
+    columns:
+      - name: revenue
+        meta:
+          dimension:
+            group_label: "Finance"
+        """
+        expected, actual = check_both_ways(yaml_data)
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual, [])
+
+    def test_metrics_without_dimensions_are_skipped(self):
+        yaml_data = """
+models:
+  - name: orders
+    meta:
+      group_label: "Finance"
+      metrics:
+        order_count:
+          type: count
+    columns:
+      - name: revenue
+{dimension}
+        """
+        # The metric hook only checks files that also define dimensions
+        expected, actual = check_both_ways(yaml_data.format(dimension=""))
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual, [])
+        dimension = """        meta:
+          dimension:
+            group_label: "Finance"
+"""
+        expected, actual = check_both_ways(yaml_data.format(dimension=dimension))
+        self.assertEqual(actual, expected)
+        self.assertEqual(
+            actual,
+            ["Missing 'group_label' or 'groups' in model-level metric 'order_count'."],
+        )
+
+    def test_file_without_models(self):
+        with self.assertRaises(ValueError):
+            check_both_ways("sources: []\n")
+
+    def test_documents_without_a_plain_mapping_root(self):
+        # Malformed files fail the same way in both modes
+        for yaml_data in ("", "---\n", "foo\n", "- a\n"):
+            with self.subTest(yaml_data=yaml_data):
+                parser = get_parser()
+                core = Core(build_checks())
+                with self.assertRaises(Exception) as expected:
+                    core.check_data(parser.load(yaml_data))
+                with self.assertRaises(Exception) as actual:
+                    core.check_events(parser.parse(yaml_data))
+                self.assertEqual(str(actual.exception), str(expected.exception))
+
+    def test_anchored_root(self):
+        expected, actual = check_both_ways("&root\n" + YAML_DATA.lstrip())
+        self.assertEqual(actual, expected)
+        self.assertGreater(len(expected), 5)
+
+    def test_duplicates_with_meta_after_columns(self):
+        yaml_data = """
+models:
+  - columns:
+      - name: revenue
+        meta:
+          metrics:
+            revenue_sum:
+              type: sum
+              group_label: "Revenue"
+    name: orders
+    meta:
+      group_label: "Finance"
+      metrics:
+        revenue_sum:
+          type: sum
+          group_label: "Revenue"
+        """
+        expected, actual = check_both_ways(yaml_data)
+        self.assertEqual(actual, expected)
+        self.assertEqual(list(actual[0].occurrences), [(7, 13), (14, 9)])
+
+    def test_multiple_documents(self):
+        walker = EventWalker(Core([]).dispatch)
+        with self.assertRaises(ValueError):
+            walker.walk(yaml.parse("models: []\n---\nmodels: []\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
 import unittest
+from unittest import mock
 
 import yaml
 
+from lightdash_pre_commit import utils
+from lightdash_pre_commit.nodes import normalize
 from lightdash_pre_commit.utils import has_dimensions
 from lightdash_pre_commit.utils import has_metrics
 
@@ -65,6 +68,18 @@ class TestHasMetrics(unittest.TestCase):
         data = yaml.safe_load(yaml_data)
         self.assertFalse(has_metrics(data))
 
+    def test_has_model_level_metrics(self):
+        yaml_data = """
+        models:
+          - name: model_with_metrics
+            meta:
+              metrics:
+                row_count:
+                  type: count
+        """
+        data = yaml.safe_load(yaml_data)
+        self.assertTrue(has_metrics(data))
+
     def test_unsupported_resource_type(self):
         yaml_data = """
         exposures:
@@ -73,3 +88,31 @@ class TestHasMetrics(unittest.TestCase):
         data = yaml.safe_load(yaml_data)
         with self.assertRaises(ValueError):
             has_metrics(data)
+
+
+class TestSummarize(unittest.TestCase):
+    def test_schema_is_counted_once(self):
+        yaml_data = """
+        models:
+          - name: model_with_metrics
+            columns:
+              - name: column_with_metric
+                meta:
+                  dimension:
+                    type: number
+                  metrics:
+                    test_sum:
+                      type: sum
+        """
+        schema = normalize(yaml.safe_load(yaml_data))
+        with mock.patch.object(utils, "normalize") as normalize_again:
+            self.assertTrue(has_dimensions(schema))
+            self.assertTrue(has_metrics(schema))
+            self.assertTrue(utils.has_metrics_in_model(schema))
+            self.assertIs(utils.summarize(schema), schema.summary)
+        normalize_again.assert_not_called()
+
+    def test_unsupported_schema(self):
+        schema = normalize(yaml.safe_load("exposures: []"))
+        with self.assertRaises(ValueError):
+            has_metrics(schema)
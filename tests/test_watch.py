@@ -0,0 +1,201 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from helpers import run_main
+
+from lightdash_pre_commit.core import Core
+from lightdash_pre_commit.lightdash_check import build_checks
+from lightdash_pre_commit.lightdash_check import main
+from lightdash_pre_commit.watch import InotifyWatcher
+from lightdash_pre_commit.watch import PollingWatcher
+from lightdash_pre_commit.watch import schema_files
+from lightdash_pre_commit.watch import Watch
+
+CLEAN = """
+models:
+  - name: {model}
+    meta:
+      group_label: "Sales"
+    columns:
+      - name: {name}
+        meta:
+          dimension:
+            type: number
+            group_label: "Sales"
+"""
+
+MISSING_LABEL = """
+models:
+  - name: orders
+    meta:
+      group_label: "Sales"
+    columns:
+      - name: amount
+        meta:
+          dimension:
+            type: number
+"""
+
+
+class WatchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = self.tmp_dir.name
+        self.models = os.path.join(self.root, "models")
+        os.makedirs(os.path.join(self.models, "marts"))
+
+    def write(self, name, content):
+        path = os.path.join(self.models, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+
+class TestSchemaFiles(WatchTestCase):
+    def test_lists_schema_files(self):
+        first = self.write("a.yml", "")
+        second = self.write("marts/b.yaml", "")
+        self.write("notes.txt", "")
+        os.makedirs(os.path.join(self.models, ".hidden"))
+        self.write(".hidden/c.yml", "")
+        with open(os.path.join(self.root, "dbt_project.yml"), "w"):
+            pass
+        self.assertEqual(schema_files(self.root), [first, second])
+
+
+class TestWatchers(WatchTestCase):
+    def assert_sees_changes(self, watcher):
+        self.addCleanup(watcher.close)
+        path = self.write("a.yml", "models: []\n")
+        self.assertEqual(watcher.wait(2), {path})
+        self.assertEqual(watcher.wait(0), set())
+        self.write("a.yml", "models:\n  - name: a\n")
+        self.assertEqual(watcher.wait(2), {path})
+        os.remove(path)
+        self.assertEqual(watcher.wait(2), {path})
+
+    def test_polling(self):
+        self.assert_sees_changes(PollingWatcher(self.root, interval=0.01))
+
+    def test_inotify(self):
+        try:
+            watcher = InotifyWatcher(self.root)
+        except OSError as e:
+            self.skipTest(str(e))
+        self.assert_sees_changes(watcher)
+
+    def test_inotify_watches_new_directories(self):
+        try:
+            watcher = InotifyWatcher(self.root)
+        except OSError as e:
+            self.skipTest(str(e))
+        self.addCleanup(watcher.close)
+        os.makedirs(os.path.join(self.models, "staging"))
+        self.assertEqual(watcher.wait(2), set())
+        path = self.write("staging/a.yml", "models: []\n")
+        self.assertEqual(watcher.wait(2), {path})
+
+
+class TestWatch(WatchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.orders = self.write("orders.yml", MISSING_LABEL)
+        self.customers = self.write(
+            "marts/customers.yml", CLEAN.format(model="customers", name="id")
+        )
+
+    def tearDown(self):
+        Core.parse_cache = None
+
+    def watch(self, project_duplicates=False):
+        return Watch(Core(build_checks(())), self.root, project_duplicates)
+
+    def report(self, watch, paths):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            watch.report(paths, 0)
+        return output.getvalue()
+
+    def test_checks_only_changed_files(self):
+        watch = self.watch()
+        paths = watch.check(schema_files(self.root))
+        self.assertEqual(paths, [self.customers, self.orders])
+        self.assertIn(
+            "of column 'amount'", self.report(watch, paths).replace("\n", " ")
+        )
+        self.assertEqual(watch.failing, {self.orders})
+
+        self.write("orders.yml", CLEAN.format(model="orders", name="amount"))
+        with mock.patch.object(
+            watch.core, "process_file", wraps=watch.core.process_file
+        ) as process_file:
+            paths = watch.check([self.orders])
+        self.assertEqual(paths, [self.orders])
+        self.assertEqual(process_file.call_count, 1)
+        self.assertIn("0 of 2 file(s) have errors", self.report(watch, paths))
+
+        os.remove(self.customers)
+        self.assertEqual(watch.check([self.customers]), [])
+        self.assertEqual(list(watch.results), [self.orders])
+
+    def test_updates_project_duplicates_of_affected_files(self):
+        watch = self.watch(project_duplicates=True)
+        self.report(watch, watch.check(schema_files(self.root)))
+        self.assertEqual(watch.failing, {self.orders})
+
+        # A name clashing with the customers file reports both files again
+        self.write("orders.yml", CLEAN.format(model="orders", name="id"))
+        paths = watch.check([self.orders])
+        self.assertEqual(paths, [self.customers, self.orders])
+        output = self.report(watch, paths)
+        self.assertIn("Name 'id' in model 'customers' is also defined", output)
+        self.assertEqual(watch.failing, {self.customers, self.orders})
+
+        # And so does removing it
+        self.write("orders.yml", CLEAN.format(model="orders", name="amount"))
+        paths = watch.check([self.orders])
+        self.assertEqual(paths, [self.customers, self.orders])
+        self.assertNotIn("also defined", self.report(watch, paths))
+        self.assertEqual(watch.failing, set())
+
+    def test_run_until_interrupted(self):
+        watcher = mock.Mock(name="watcher")
+        watcher.name = "test"
+        watcher.wait.side_effect = [set(), {self.orders}, KeyboardInterrupt]
+        watch = self.watch()
+        with mock.patch("gc.freeze"):
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                self.assertEqual(watch.run(watcher), 1)
+        self.assertEqual(output.getvalue().count("Checked 2 file(s)"), 1)
+        self.assertEqual(output.getvalue().count("Checked 1 file(s)"), 1)
+        watcher.close.assert_called_once()
+
+
+class TestWatchOption(unittest.TestCase):
+    def run_main(self, *args):
+        stderr = io.StringIO()
+        exit_code, _ = run_main(main, args, stderr)
+        return exit_code, stderr.getvalue()
+
+    def test_rejects_filenames_and_other_modes(self):
+        with tempfile.TemporaryDirectory() as root:
+            for args in (
+                ["schema.yml"],
+                ["--manifest", "target/manifest.json"],
+                ["--fix"],
+            ):
+                with self.subTest(args=args):
+                    self.assertEqual(self.run_main("--watch", root, *args)[0], 2)
+            exit_code, output = self.run_main("--watch", os.path.join(root, "no"))
+        self.assertEqual(exit_code, 2)
+        self.assertIn("not a directory", output)
+
+
+if __name__ == "__main__":
+    unittest.main()